@@ -0,0 +1,228 @@
+"""
+The steps shared by the evolutionary algorithms, eaSimple, eaSteadyState and eaNSGA, ie. evaluating individuals,
+through the toolbox or an evaluator, assigning their fitnesses, screening offspring with a surrogate and saving
+checkpoints.
+"""
+
+
+def evaluate_individuals(
+    individuals,
+    toolbox,
+    test_name,
+    gen,
+    logger,
+    save_individuals,
+    multithreaded,
+    fitness_cache=None,
+    constraints=None,
+    evaluator=None,
+):
+    """
+    Evaluates the given individuals, returning their raw fitnesses in the same order.
+
+    Individuals that do not satisfy the constraints, if provided, are assigned the constraints' penalty fitness
+    without being evaluated.
+
+    If a fitness cache is provided then individuals whose block architecture has previously been evaluated are
+    assigned the cached fitness instead of being retrained, architectures that appear multiple times in the list are
+    only evaluated once.
+
+    If an evaluator, eg. an EvaluationPool, is provided then the individuals are evaluated by it instead of through
+    the toolbox. Evaluators may set an individual's fidelity, only full fidelity fitnesses are cached.
+    """
+    if not save_individuals:
+        test_name, gen = None, None
+
+    fitnesses = [None] * len(individuals)
+    pending = {}
+    cached = 0
+
+    for i, ind in enumerate(individuals):
+        if constraints and not constraints.apply(ind, toolbox, logger):
+            fitnesses[i] = constraints.PENALTY_FITNESS
+            continue
+
+        if fitness_cache is None:
+            pending[i] = [i]
+            continue
+
+        key = ind.block_architecture.get_hash()
+        entry = fitness_cache.get(key)
+        if entry:
+            fitnesses[i] = tuple(entry["fitness"])
+            ind.fidelity = 1.0
+            cached += 1
+            if save_individuals and entry["model"]:
+                from TensorNAS.Core.Util import copy_model
+
+                copy_model(
+                    test_name,
+                    "Models/{}".format(entry["model"]),
+                    "Models/{}/{}".format(gen, ind.index),
+                )
+        elif key in pending:
+            pending[key].append(i)
+        else:
+            pending[key] = [i]
+
+    if logger and fitness_cache is not None:
+        logger.log("{} individuals retrieved from fitness cache".format(cached))
+
+    to_evaluate = [individuals[indices[0]] for indices in pending.values()]
+
+    if evaluator:
+        results = evaluator.map(to_evaluate, test_name, gen)
+    elif multithreaded:
+        from multiprocessing import set_start_method
+
+        set_start_method("spawn", force=True)
+
+        results = toolbox.map(
+            toolbox.evaluate,
+            [(ind, test_name, gen, logger) for ind in to_evaluate],
+        )
+    else:
+        results = [toolbox.evaluate(ind, test_name, gen, logger) for ind in to_evaluate]
+
+    for (key, indices), ind, fit in zip(pending.items(), to_evaluate, results):
+        fidelity = getattr(ind, "fidelity", 1.0)
+        for i in indices:
+            fitnesses[i] = fit
+            individuals[i].fidelity = fidelity
+            if save_individuals and individuals[i] is not ind:
+                from TensorNAS.Core.Util import copy_model
+
+                copy_model(
+                    test_name,
+                    "Models/{}/{}".format(gen, ind.index),
+                    "Models/{}/{}".format(gen, individuals[i].index),
+                )
+        # Low fidelity fitnesses, see SuccessiveHalvingEvaluator, are not representative of the architecture
+        if fitness_cache is not None and fidelity == 1.0:
+            fitness_cache.add(
+                key,
+                fit,
+                "{}/{}".format(gen, ind.index) if save_individuals else None,
+            )
+
+    return fitnesses
+
+
+def filter_fitnesses(fitnesses, filter_function=None, filter_function_args=None):
+    """
+    Applies the filter function to all of the raw fitnesses at once if it provides a batched equivalent, eg.
+    MinMaxArray.
+
+    @return The list of filtered fitnesses, None if the filter function is not batched
+    """
+    batched = getattr(filter_function, "batched", None)
+
+    if batched is None or not fitnesses:
+        return None
+
+    if filter_function_args:
+        return batched(fitnesses, filter_function_args)
+    return batched(fitnesses)
+
+
+def assign_fitness(
+    ind,
+    fit,
+    filter_function=None,
+    filter_function_args=None,
+    objectives=None,
+    values=None,
+):
+    """
+    Stores the raw fitness of an individual in its block architecture and sets the individual's DEAP fitness, using
+    the filter function if one is provided. The filtered fitness can instead be given as values, see
+    filter_fitnesses.
+
+    The values of the objectives, if provided, are computed from the block architecture and appended to the
+    individual's fitness after it has been filtered. Individuals that failed evaluation, or were rejected, are
+    assigned the worst value for each of them.
+    """
+    ind.block_architecture.param_count = fit[0]
+    ind.block_architecture.accuracy = fit[1]
+
+    if values is None:
+        if filter_function:
+            if filter_function_args:
+                values = filter_function(fit, filter_function_args)
+            else:
+                values = filter_function(fit)
+        else:
+            values = fit
+
+    if objectives:
+        if fit[0] == float("inf"):
+            extra = (float("inf"),) * len(objectives)
+        else:
+            extra = ind.block_architecture.get_objectives(objectives)
+        values = tuple(values) + tuple(extra)
+
+    ind.fitness.values = values
+
+    # The fidelity records the fraction of the full training budget that produced the fitness
+    update = (
+        ind.block_architecture.param_count,
+        ind.block_architecture.accuracy,
+        getattr(ind, "fidelity", 1.0),
+    )
+
+    if hasattr(ind, "updates"):
+        ind.updates.append(update)
+    else:
+        ind.updates = [update]
+
+
+def screen_offspring(offspring, population, toolbox, cxpb, mutpb, surrogate):
+    """
+    Replaces the new, ie. not yet evaluated, individuals of the offspring with those the surrogate predicts to be
+    best out of a pool of candidates, the pool being made up of the new individuals and those of further
+    applications of selection and variation to the population.
+    """
+    from deap.algorithms import varAnd
+
+    new = [i for i, ind in enumerate(offspring) if not ind.fitness.valid]
+    if not new:
+        return offspring
+
+    candidates = [offspring[i] for i in new]
+    for _ in range(surrogate.pool_factor - 1):
+        candidates += [
+            ind
+            for ind in varAnd(
+                toolbox.select(population, len(population)), toolbox, cxpb, mutpb
+            )
+            if not ind.fitness.valid
+        ]
+
+    for i, ind in zip(new, surrogate.screen(candidates, len(new))):
+        offspring[i] = ind
+
+    return offspring
+
+
+def save_generation_checkpoint(
+    test_name,
+    gen,
+    population,
+    logbook,
+    halloffame,
+    individualrecord,
+    surrogate,
+    **state
+):
+    from TensorNAS.Tools.Checkpoint import save_checkpoint
+
+    save_checkpoint(
+        test_name,
+        gen=gen,
+        population=population,
+        logbook=logbook,
+        halloffame=halloffame,
+        individualrecord=individualrecord,
+        surrogate=surrogate,
+        **state
+    )
@@ -1,5 +1,13 @@
 import time
 
+from TensorNAS.Algorithms.Common import (
+    assign_fitness,
+    evaluate_individuals,
+    filter_fitnesses,
+    save_generation_checkpoint,
+    screen_offspring,
+)
+
 
 def TestEASimple(
     cxpb,
@@ -22,6 +30,12 @@ def TestEASimple(
     log=None,
     existing_generation=None,
     start_gen=0,
+    fitness_cache=False,
+    constraints=None,
+    evaluator=None,
+    objectives=None,
+    surrogate=None,
+    checkpoint=False,
 ):
     if log:
         from TensorNAS.Tools.Logging import Logger
@@ -46,6 +60,28 @@ def TestEASimple(
 
     test.set_select(toolbox=toolbox, func=tools.selTournamentDCD)
 
+    if fitness_cache:
+        from TensorNAS.Tools.FitnessCache import FitnessCache
+
+        fitness_cache = FitnessCache(test_name)
+    else:
+        fitness_cache = None
+
+    resume = None
+    if checkpoint:
+        from TensorNAS.Tools.Checkpoint import load_checkpoint
+
+        resume = load_checkpoint(test_name)
+        if resume:
+            test.pop = resume["population"]
+            test.hof = resume["halloffame"]
+            test.ir = resume["individualrecord"]
+            if resume["surrogate"] is not None:
+                surrogate = resume["surrogate"]
+
+    if surrogate is not None:
+        surrogate.logger = logger
+
     pop, logbook = eaSimple(
         population=test.pop,
         toolbox=toolbox,
@@ -64,6 +100,13 @@ def TestEASimple(
         generation_save_interval=generation_save,
         multithreaded=multithreaded,
         start_gen=start_gen,
+        fitness_cache=fitness_cache,
+        constraints=constraints,
+        evaluator=evaluator,
+        objectives=objectives,
+        surrogate=surrogate,
+        checkpoint=checkpoint,
+        resume=resume,
     )
 
     test.ir.save(
@@ -126,7 +169,14 @@ def eaSimple(
     logger=None,
     generation_save_interval=1,
     multithreaded=False,
-    start_gen=0
+    start_gen=0,
+    fitness_cache=None,
+    constraints=None,
+    evaluator=None,
+    objectives=None,
+    surrogate=None,
+    checkpoint=False,
+    resume=None,
 ):
     """This algorithm reproduce the simplest evolutionary algorithm as
     presented in chapter 7 of [Back2000]_.
@@ -141,6 +191,31 @@ def eaSimple(
     :param halloffame: A :class:`~deap.Tools.HallOfFame` object that will
                        contain the best individuals, optional.
     :param verbose: Whether or not to log the statistics.
+    :param fitness_cache: A :class:`~TensorNAS.Tools.FitnessCache.FitnessCache`
+                          used to skip the evaluation of previously evaluated
+                          architectures, optional.
+    :param constraints: A
+                        :class:`~TensorNAS.Core.Constraints.ArchitectureConstraints`
+                        gate that is applied to individuals before they are
+                        evaluated, optional.
+    :param evaluator: A :class:`~TensorNAS.Evaluation.Executor.Evaluator`,
+                      eg. an EvaluationPool or a BrokerEvaluator,
+                      used to evaluate individuals in place of
+                      :meth:`toolbox.evaluate`, optional.
+    :param objectives: Names of the architecture objectives, see
+                       :attr:`~TensorNAS.Core.BlockArchitecture.BlockArchitecture.OBJECTIVES`,
+                       that are appended to each individual's fitness,
+                       optional.
+    :param surrogate: A
+                      :class:`~TensorNAS.Evaluation.Surrogate.SurrogateModel`
+                      that learns from every trained individual and, once it
+                      has enough samples, selects the new offspring of each
+                      generation from a larger pool of candidates, optional.
+    :param checkpoint: Whether the state of the test is checkpointed after
+                       each generation, see :mod:`TensorNAS.Tools.Checkpoint`.
+    :param resume: A checkpointed state from which the test is resumed, the
+                   population, hall of fame and individual record passed must
+                   be those of the checkpoint. No individuals are re-evaluated.
     :returns: The final population
     :returns: A class:`~deap.Tools.Logbook` with the statistics of the
               evolution
@@ -181,6 +256,8 @@ def eaSimple(
 
     from deap import tools
 
+    from TensorNAS.Algorithms.NSGA import assign_rank_crowding
+
     logbook = tools.Logbook()
     logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
 
@@ -193,87 +270,92 @@ def eaSimple(
         timing_log.log("Start time: {}".format(start_time))
         logger.log("Gen #0, population: {}".format(len(population)))
 
-    for i, ind in enumerate(population):
-        ind.index = i
+    if resume:
+        from TensorNAS.Tools.Checkpoint import restore_random_state
 
-    # Evaluate the individuals with an invalid fitness
-    invalid_ind = [ind for ind in population if not ind.fitness.valid]
-    if multithreaded:
-        from multiprocessing import set_start_method
+        # The population, hall of fame and individual record were restored by the caller
+        logbook = resume["logbook"]
+        start_gen = resume["gen"]
+        restore_random_state(resume)
 
-        set_start_method("spawn", force=True)
-
-        if save_individuals and generation_save_interval == 1:
-            fitnesses = toolbox.map(
-                toolbox.evaluate,
-                [(ind, test_name, start_gen, logger) for i, ind in enumerate(invalid_ind)],
-            )
-        else:
-            fitnesses = toolbox.map(
-                toolbox.evaluate,
-                [(ind, None, None, logger) for ind in invalid_ind],
-            )
+        if logger:
+            logger.log("Resuming from checkpoint of gen #{}".format(start_gen))
     else:
-        fitnesses = []
-        for i, ind in enumerate(invalid_ind):
-            if save_individuals and generation_save_interval == 1:
-                fitnesses.append(toolbox.evaluate(ind, test_name, start_gen, logger))
-            else:
-                fitnesses.append(toolbox.evaluate(ind, None, None, logger))
-
-    for count, (ind, fit) in enumerate(zip(invalid_ind, fitnesses)):
-        ind.block_architecture.param_count = fit[-2]
-        ind.block_architecture.accuracy = fit[-1]
-        # Assign individuals an index so they can be copied in output folder structure if taken to next gen
-        ind.index = count
-
-        if filter_function:
-            if filter_function_args:
-                ind.fitness.values = filter_function(fit, filter_function_args)
-            else:
-                ind.fitness.values = filter_function(fit)
-        else:
-            ind.fitness.values = fit
-
-        if hasattr(ind, "updates"):
-            ind.updates.append(
-                (ind.block_architecture.param_count, ind.block_architecture.accuracy)
+        for i, ind in enumerate(population):
+            ind.index = i
+
+        # Evaluate the individuals with an invalid fitness
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses = evaluate_individuals(
+            invalid_ind,
+            toolbox=toolbox,
+            test_name=test_name,
+            gen=start_gen,
+            logger=logger,
+            save_individuals=save_individuals and generation_save_interval == 1,
+            multithreaded=multithreaded,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+        )
+
+        filtered = filter_fitnesses(
+            fitnesses, filter_function, filter_function_args
+        ) or [None] * len(fitnesses)
+
+        for count, (ind, fit, values) in enumerate(
+            zip(invalid_ind, fitnesses, filtered)
+        ):
+            assign_fitness(
+                ind, fit, filter_function, filter_function_args, objectives, values
             )
-        else:
-            ind.updates = [
-                (ind.block_architecture.param_count, ind.block_architecture.accuracy)
-            ]
+            # Assign individuals an index so they can be copied in output folder structure if taken to next gen
+            ind.index = count
 
-    if logger:
-        for x, ind in enumerate(population):
-            logger.log(
-                "Ind #{}, params:{}, acc:{}%".format(
-                    x,
-                    ind.block_architecture.param_count,
-                    ind.block_architecture.accuracy,
+        if surrogate is not None:
+            surrogate.add_individuals(invalid_ind)
+
+        if logger:
+            for x, ind in enumerate(population):
+                logger.log(
+                    "Ind #{}, params:{}, acc:{}%".format(
+                        x,
+                        ind.block_architecture.param_count,
+                        ind.block_architecture.accuracy,
+                    )
                 )
-            )
-            logger.log(str(ind))
+                logger.log(str(ind))
 
-    from deap.tools.emo import assignCrowdingDist
+        assign_rank_crowding(population)
 
-    assignCrowdingDist(population)
+        if individualrecord:
+            individualrecord.add_gen(population)
 
-    if individualrecord:
-        individualrecord.add_gen(population)
+        if halloffame is not None:
+            halloffame.update(population)
 
-    if halloffame is not None:
-        halloffame.update(population)
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        if verbose:
+            print(logbook.stream)
 
-    record = stats.compile(population) if stats else {}
-    logbook.record(gen=0, nevals=len(invalid_ind), **record)
-    if verbose:
-        print(logbook.stream)
+        if logger:
+            cur_time = time.time()
+            timing_log.log(
+                "Gen #0 finished in: {}".format(cur_time - cur_gen_start_time)
+            )
+            cur_gen_start_time = cur_time
 
-    if logger:
-        cur_time = time.time()
-        timing_log.log("Gen #0 finished in: {}".format(cur_gen_start_time - cur_time))
-        cur_gen_start_time = cur_time
+        if checkpoint:
+            save_generation_checkpoint(
+                test_name,
+                start_gen,
+                population,
+                logbook,
+                halloffame,
+                individualrecord,
+                surrogate,
+            )
 
     # Begin the generational process
     for gen in range(start_gen + 1, ngen + 1):
@@ -289,6 +371,11 @@ def eaSimple(
 
         offspring = varAnd(offspring, toolbox, cxpb, mutpb)
 
+        if surrogate is not None and surrogate.is_ready():
+            offspring = screen_offspring(
+                offspring, population, toolbox, cxpb, mutpb, surrogate
+            )
+
         valid_ind = [ind for ind in offspring if ind.fitness.valid]
         invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
 
@@ -312,58 +399,36 @@ def eaSimple(
         if logger:
             logger.log("{} new individuals".format(len(invalid_ind)))
 
-        if multithreaded:
-            from multiprocessing import set_start_method
-
-            set_start_method("spawn", force=True)
+        for ind in invalid_ind:
+            ind.index = offspring.index(ind)
+
+        fitnesses = evaluate_individuals(
+            invalid_ind,
+            toolbox=toolbox,
+            test_name=test_name,
+            gen=gen,
+            logger=logger,
+            save_individuals=save_individuals
+            and ((gen + 1) % generation_save_interval) == 0,
+            multithreaded=multithreaded,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+        )
+
+        filtered = filter_fitnesses(
+            fitnesses, filter_function, filter_function_args
+        ) or [None] * len(fitnesses)
+
+        for ind, fit, values in zip(invalid_ind, fitnesses, filtered):
+            assign_fitness(
+                ind, fit, filter_function, filter_function_args, objectives, values
+            )
 
-            if save_individuals and ((gen + 1) % generation_save_interval) == 0:
-                for ind in invalid_ind:
-                    index = offspring.index(ind)
-                    ind.index = index
-                fitnesses = toolbox.map(
-                    toolbox.evaluate,
-                    [(ind, test_name, gen, logger) for ind in invalid_ind],
-                )
-            else:
-                fitnesses = toolbox.map(
-                    toolbox.evaluate,
-                    [(ind, None, None, logger) for ind in invalid_ind],
-                )
-        else:
-            fitnesses = []
-            for ind in invalid_ind:
-                if save_individuals and generation_save_interval == 1:
-                    fitnesses.append(toolbox.evaluate(ind, test_name, 0, logger))
-                else:
-                    fitnesses.append(toolbox.evaluate(ind, None, None, None, logger))
-
-        for count, (ind, fit) in enumerate(zip(invalid_ind, fitnesses)):
-            ind.block_architecture.param_count = fit[-2]
-            ind.block_architecture.accuracy = fit[-1]
-
-            if filter_function:
-                if filter_function_args:
-                    ind.fitness.values = filter_function(fit, filter_function_args)
-                else:
-                    ind.fitness.values = filter_function(fit)
-
-            if hasattr(ind, "updates"):
-                ind.updates.append(
-                    (
-                        ind.block_architecture.param_count,
-                        ind.block_architecture.accuracy,
-                    )
-                )
-            else:
-                ind.updates = [
-                    (
-                        ind.block_architecture.param_count,
-                        ind.block_architecture.accuracy,
-                    )
-                ]
+        if surrogate is not None:
+            surrogate.add_individuals(invalid_ind)
 
-        assignCrowdingDist(offspring)
+        assign_rank_crowding(offspring)
 
         # Update the hall of fame with the generated individuals
         if halloffame is not None:
@@ -395,10 +460,21 @@ def eaSimple(
         if logger:
             cur_time = time.time()
             timing_log.log(
-                "Gen #{} finished in: {}".format(gen, cur_gen_start_time - cur_time)
+                "Gen #{} finished in: {}".format(gen, cur_time - cur_gen_start_time)
             )
             cur_gen_start_time = cur_time
 
+        if checkpoint:
+            save_generation_checkpoint(
+                test_name,
+                gen,
+                population,
+                logbook,
+                halloffame,
+                individualrecord,
+                surrogate,
+            )
+
     if logger:
         timing_log.log("Total time: {}".format(time.time() - start_time))
         timing_log.log("STOP")
@@ -0,0 +1,606 @@
+import random
+import time
+
+from TensorNAS.Algorithms.Common import (
+    assign_fitness,
+    evaluate_individuals,
+    filter_fitnesses,
+    save_generation_checkpoint,
+    screen_offspring,
+)
+
+
+def TestNSGA(
+    cxpb,
+    mutpb,
+    pop_size,
+    gen_count,
+    evaluate_individual,
+    crossover_individual,
+    mutate_individual,
+    toolbox,
+    test_name,
+    verbose=False,
+    filter_function=None,
+    filter_function_args=None,
+    save_individuals=True,
+    generation_gap=1,
+    generation_save=1,
+    comment=None,
+    multithreaded=True,
+    log=None,
+    existing_generation=None,
+    fitness_cache=False,
+    constraints=None,
+    evaluator=None,
+    objectives=None,
+    surrogate=None,
+    checkpoint=False,
+    variant="NSGA2",
+    offspring_size=0,
+    ref_point_divisions=4,
+):
+    logger = None
+    if log:
+        from TensorNAS.Tools.Logging import Logger
+
+        logger = Logger(test_name)
+        logger.log("Starting test {}".format(test_name))
+
+    from TensorNAS.Tools.DEAPtest import DEAPTest
+
+    test = DEAPTest(
+        pop_size=pop_size,
+        gen_count=gen_count,
+        toolbox=toolbox,
+        existing_generation=existing_generation,
+    )
+
+    test.set_evaluate(toolbox=toolbox, func=evaluate_individual)
+    test.set_mate(toolbox=toolbox, func=crossover_individual)
+    test.set_mutate(toolbox=toolbox, func=mutate_individual)
+
+    if variant == "NSGA3":
+        from deap import tools
+
+        # The objective count is that of the individuals' fitness, ie. including any extra objectives
+        ref_points = tools.uniform_reference_points(
+            nobj=len(test.pop[0].fitness.weights), p=ref_point_divisions
+        )
+        survival = NSGA3Survival(ref_points)
+        # NSGA-III selects parents at random, the diversity being maintained through survival
+        test.set_select(toolbox=toolbox, func=tools.selRandom)
+    else:
+        survival = sel_nsga2
+        test.set_select(toolbox=toolbox, func=sel_tournament_rank_crowding)
+
+    if fitness_cache:
+        from TensorNAS.Tools.FitnessCache import FitnessCache
+
+        fitness_cache = FitnessCache(test_name)
+    else:
+        fitness_cache = None
+
+    resume = None
+    if checkpoint:
+        from TensorNAS.Tools.Checkpoint import load_checkpoint
+
+        resume = load_checkpoint(test_name)
+        if resume:
+            test.pop = resume["population"]
+            test.hof = resume["halloffame"]
+            test.ir = resume["individualrecord"]
+            if resume["surrogate"] is not None:
+                surrogate = resume["surrogate"]
+            if resume.get("survival") is not None:
+                survival = resume["survival"]
+
+    if surrogate is not None:
+        surrogate.logger = logger
+
+    pop, logbook = eaNSGA(
+        population=test.pop,
+        toolbox=toolbox,
+        mu=pop_size,
+        lambda_=offspring_size or pop_size,
+        cxpb=cxpb,
+        mutpb=mutpb,
+        ngen=gen_count,
+        survival=survival,
+        test_name=test_name,
+        stats=test.stats,
+        halloffame=test.hof,
+        verbose=verbose,
+        individualrecord=test.ir,
+        save_individuals=save_individuals,
+        filter_function=filter_function,
+        filter_function_args=filter_function_args,
+        logger=logger,
+        generation_save_interval=generation_save,
+        multithreaded=multithreaded,
+        fitness_cache=fitness_cache,
+        constraints=constraints,
+        evaluator=evaluator,
+        objectives=objectives,
+        surrogate=surrogate,
+        checkpoint=checkpoint,
+        resume=resume,
+    )
+
+    test.ir.save(
+        generation_gap,
+        test_name=test_name,
+        title=filter_function.__name__ if filter_function else "no filter func",
+        comment=comment,
+    )
+
+    pareto_inds = test.ir.pareto(test_name=test_name)
+
+    pareto_models = []
+    for ind in pareto_inds:
+        models = [
+            i
+            for i in pop
+            if (
+                (i.block_architecture.param_count == ind[0])
+                and (i.block_architecture.accuracy == ind[1])
+            )
+        ]
+        if len(models):
+            pareto_models.append(models[0])
+
+    from TensorNAS.Core.Util import copy_pareto_model
+
+    for i, pmodel in enumerate(pareto_models):
+        copy_pareto_model(test_name, gen_count, pmodel.index, i)
+        if logger:
+            logger.log("Pareto Ind #{}".format(i))
+            logger.log(
+                "Acc: {}, Param Count: {}".format(
+                    pmodel.block_architecture.accuracy,
+                    pmodel.block_architecture.param_count,
+                )
+            )
+            logger.log(str(pmodel))
+
+    if logger:
+        logger.log("Done")
+        logger.log("STOP")
+
+    return pop, logbook, test
+
+
+def _get_fronts(individuals, k=None):
+    """
+    Sorts the individuals into non-dominated fronts, see TensorNAS.Tools.Pareto.non_dominated_sort, storing each
+    individual's front index as its fitness' rank.
+
+    @param k If given, only the fronts required to hold k individuals are returned
+    @return A list of fronts, each a list of individuals
+    """
+    from TensorNAS.Tools.Pareto import non_dominated_sort
+
+    if not individuals:
+        return []
+
+    ranks = non_dominated_sort(
+        [ind.fitness.values for ind in individuals],
+        weights=individuals[0].fitness.weights,
+    )
+
+    fronts = [[] for _ in range(ranks.max() + 1)]
+    for ind, rank in zip(individuals, ranks.tolist()):
+        ind.fitness.rank = rank
+        fronts[rank].append(ind)
+
+    if k is not None:
+        count = 0
+        for i, front in enumerate(fronts):
+            count += len(front)
+            if count >= k:
+                return fronts[: i + 1]
+
+    return fronts
+
+
+def assign_rank_crowding(individuals):
+    """
+    Assigns each individual its non-dominated front as its fitness' rank and its crowding distance within its front,
+    as used by NSGA-II's tournaments, eg. DEAP's selTournamentDCD.
+    """
+    from deap.tools.emo import assignCrowdingDist
+
+    for front in _get_fronts(individuals):
+        assignCrowdingDist(front)
+
+
+def sel_nsga2(individuals, k):
+    """
+    NSGA-II's survival, the k individuals are selected front by front, the last front that fits only partially being
+    truncated by crowding distance.
+    """
+    from deap.tools.emo import assignCrowdingDist
+
+    chosen = []
+
+    for front in _get_fronts(individuals, k):
+        assignCrowdingDist(front)
+        if len(chosen) + len(front) <= k:
+            chosen.extend(front)
+        else:
+            front.sort(key=lambda ind: ind.fitness.crowding_dist, reverse=True)
+            chosen.extend(front[: k - len(chosen)])
+
+    return chosen
+
+
+def sel_tournament_rank_crowding(individuals, k):
+    """
+    Selects k parents through binary tournaments, the individual of the lower front winning, then that of the larger
+    crowding distance, see assign_rank_crowding.
+    """
+
+    def tourn(ind1, ind2):
+        if ind1.fitness.rank != ind2.fitness.rank:
+            return ind1 if ind1.fitness.rank < ind2.fitness.rank else ind2
+
+        if ind1.fitness.crowding_dist != ind2.fitness.crowding_dist:
+            return (
+                ind1
+                if ind1.fitness.crowding_dist > ind2.fitness.crowding_dist
+                else ind2
+            )
+
+        return random.choice((ind1, ind2))
+
+    return [tourn(*random.sample(individuals, 2)) for _ in range(k)]
+
+
+class NSGA3Survival:
+    """
+    NSGA-III's survival, the individuals are selected front by front, the last front that fits only partially being
+    selected through niching around the reference points, see "An Evolutionary Many-Objective Optimization Algorithm
+    Using Reference-Point-Based Nondominated Sorting Approach" (Deb and Jain).
+
+    The ideal, worst and extreme points used to normalize the objectives are kept between generations, as done by
+    DEAP's selNSGA3WithMemory, the fronts are found by TensorNAS.Tools.Pareto.
+    """
+
+    def __init__(self, ref_points):
+        self.ref_points = ref_points
+        self.best_point = None
+        self.worst_point = None
+        self.extreme_points = None
+
+    def __call__(self, individuals, k):
+        from itertools import chain
+
+        import numpy as np
+        from deap.tools.emo import (
+            associate_to_niche,
+            find_extreme_points,
+            find_intercepts,
+            niching,
+        )
+
+        fronts = _get_fronts(individuals, k)
+        chosen = list(chain(*fronts[:-1]))
+
+        if len(chosen) + len(fronts[-1]) <= k:
+            return chosen + fronts[-1]
+
+        # Objectives are normalized as minimized, failed individuals, eg. of infinite param count, are placed at the
+        # worst finite value such that they do not distort the normalization
+        fitnesses = -np.array(
+            [ind.fitness.wvalues for front in fronts for ind in front], dtype=float
+        )
+        finite = np.where(np.isfinite(fitnesses), fitnesses, np.nan)
+        fitnesses = np.where(
+            np.isfinite(fitnesses),
+            fitnesses,
+            np.nan_to_num(np.nanmax(finite, axis=0))[None, :],
+        )
+
+        if self.best_point is not None:
+            self.best_point = np.min(
+                np.concatenate((fitnesses, self.best_point[None, :])), axis=0
+            )
+            self.worst_point = np.max(
+                np.concatenate((fitnesses, self.worst_point[None, :])), axis=0
+            )
+        else:
+            self.best_point = np.min(fitnesses, axis=0)
+            self.worst_point = np.max(fitnesses, axis=0)
+
+        self.extreme_points = find_extreme_points(
+            fitnesses, self.best_point, self.extreme_points
+        )
+        front_worst = np.max(fitnesses[: len(chosen) + len(fronts[-1])], axis=0)
+        intercepts = find_intercepts(
+            self.extreme_points, self.best_point, self.worst_point, front_worst
+        )
+        niches, dist = associate_to_niche(
+            fitnesses, self.ref_points, self.best_point, intercepts
+        )
+
+        niche_counts = np.zeros(len(self.ref_points), dtype=np.int64)
+        index, counts = np.unique(niches[: len(chosen)], return_counts=True)
+        niche_counts[index] = counts
+
+        chosen.extend(
+            niching(
+                fronts[-1],
+                k - len(chosen),
+                niches[len(chosen) :],
+                dist[len(chosen) :],
+                niche_counts,
+            )
+        )
+
+        return chosen
+
+
+def eaNSGA(
+    population,
+    toolbox,
+    mu,
+    lambda_,
+    cxpb,
+    mutpb,
+    ngen,
+    survival,
+    test_name,
+    stats=None,
+    halloffame=None,
+    verbose=__debug__,
+    individualrecord=None,
+    save_individuals=False,
+    filter_function=None,
+    filter_function_args=None,
+    logger=None,
+    generation_save_interval=1,
+    multithreaded=False,
+    fitness_cache=None,
+    constraints=None,
+    evaluator=None,
+    objectives=None,
+    surrogate=None,
+    checkpoint=False,
+    resume=None,
+):
+    """
+    A (mu + lambda) evolutionary algorithm with NSGA-II or NSGA-III survival. Each generation lambda offspring are
+    bred from parents chosen by :meth:`toolbox.select` using :func:`varAnd`, the next population then being the mu
+    individuals chosen by the survival from the parents and offspring combined.
+
+    :param mu: The number of individuals that survive each generation.
+    :param lambda_: The number of offspring bred each generation.
+    :param survival: The survival selection, eg. :func:`sel_nsga2` or a
+                     :class:`NSGA3Survival`, called with the combined parents
+                     and offspring and mu.
+
+    The evaluation, filtering, objectives, surrogate, checkpoint and logging
+    arguments are those of
+    :func:`~TensorNAS.Algorithms.EASimple.eaSimple`.
+
+    Offspring that are left unchanged by variation are copies of their parents and are not added to the combined
+    population. The models of each generation's surviving individuals are stored under the generation and their index
+    in the population, as done by eaSimple, offspring being evaluated with indices following those of the population.
+    """
+    from deap import tools
+    from deap.algorithms import varAnd
+
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
+
+    if logger:
+        from TensorNAS.Tools.Logging import Logger
+
+        timing_log = Logger(test_name, subdir="Timing")
+        start_time = time.time()
+        cur_gen_start_time = start_time
+        timing_log.log("Start time: {}".format(start_time))
+        logger.log("Gen #0, population: {}".format(len(population)))
+
+    start_gen = 0
+
+    if resume:
+        from TensorNAS.Tools.Checkpoint import restore_random_state
+
+        # The population, hall of fame, individual record and survival were restored by the caller
+        logbook = resume["logbook"]
+        start_gen = resume["gen"]
+        restore_random_state(resume)
+
+        if logger:
+            logger.log("Resuming from checkpoint of gen #{}".format(start_gen))
+    else:
+        for i, ind in enumerate(population):
+            ind.index = i
+
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses = evaluate_individuals(
+            invalid_ind,
+            toolbox=toolbox,
+            test_name=test_name,
+            gen=0,
+            logger=logger,
+            save_individuals=save_individuals and generation_save_interval == 1,
+            multithreaded=multithreaded,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+        )
+
+        filtered = filter_fitnesses(
+            fitnesses, filter_function, filter_function_args
+        ) or [None] * len(fitnesses)
+
+        for ind, fit, values in zip(invalid_ind, fitnesses, filtered):
+            assign_fitness(
+                ind, fit, filter_function, filter_function_args, objectives, values
+            )
+
+        if surrogate is not None:
+            surrogate.add_individuals(invalid_ind)
+
+        if logger:
+            for x, ind in enumerate(population):
+                logger.log(
+                    "Ind #{}, params:{}, acc:{}%".format(
+                        x,
+                        ind.block_architecture.param_count,
+                        ind.block_architecture.accuracy,
+                    )
+                )
+                logger.log(str(ind))
+
+        assign_rank_crowding(population)
+
+        if individualrecord:
+            individualrecord.add_gen(population)
+
+        if halloffame is not None:
+            halloffame.update(population)
+
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        if verbose:
+            print(logbook.stream)
+
+        if logger:
+            cur_time = time.time()
+            timing_log.log(
+                "Gen #0 finished in: {}".format(cur_time - cur_gen_start_time)
+            )
+            cur_gen_start_time = cur_time
+
+        if checkpoint:
+            save_generation_checkpoint(
+                test_name,
+                0,
+                population,
+                logbook,
+                halloffame,
+                individualrecord,
+                surrogate,
+                survival=survival,
+            )
+
+    for gen in range(start_gen + 1, ngen + 1):
+
+        if logger:
+            logger.log("Gen #{}, population: {}".format(gen, len(population)))
+
+        offspring = varAnd(toolbox.select(population, lambda_), toolbox, cxpb, mutpb)
+
+        if surrogate is not None and surrogate.is_ready():
+            offspring = screen_offspring(
+                offspring, population, toolbox, cxpb, mutpb, surrogate
+            )
+
+        invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+
+        if logger:
+            logger.log("{} new individuals".format(len(invalid_ind)))
+
+        for i, ind in enumerate(invalid_ind):
+            ind.index = len(population) + i
+
+        save_generation = (
+            save_individuals and ((gen + 1) % generation_save_interval) == 0
+        )
+
+        fitnesses = evaluate_individuals(
+            invalid_ind,
+            toolbox=toolbox,
+            test_name=test_name,
+            gen=gen,
+            logger=logger,
+            save_individuals=save_generation,
+            multithreaded=multithreaded,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+        )
+
+        filtered = filter_fitnesses(
+            fitnesses, filter_function, filter_function_args
+        ) or [None] * len(fitnesses)
+
+        for ind, fit, values in zip(invalid_ind, fitnesses, filtered):
+            assign_fitness(
+                ind, fit, filter_function, filter_function_args, objectives, values
+            )
+
+        if surrogate is not None:
+            surrogate.add_individuals(invalid_ind)
+
+        # Update the hall of fame with the generated individuals
+        if halloffame is not None:
+            halloffame.update(invalid_ind)
+
+        offspring_ids = set(id(ind) for ind in invalid_ind)
+        survivors = survival(population + invalid_ind, mu)
+
+        # Copy the survivors' models such that the generation's models are indexed by their position in the population,
+        # only for the generations whose models are saved
+        from TensorNAS.Core.Util import copy_model
+
+        for index, ind in enumerate(survivors):
+            if save_generation:
+                from_gen = gen if id(ind) in offspring_ids else gen - 1
+                copy_model(
+                    test_name,
+                    "Models/{}/{}".format(from_gen, ind.index),
+                    "Models/{}/{}".format(gen, index),
+                )
+            ind.index = index
+
+        assign_rank_crowding(survivors)
+
+        population[:] = survivors
+
+        if individualrecord:
+            individualrecord.add_gen(population)
+
+        if logger:
+            for x, ind in enumerate(population):
+                logger.log(
+                    "Ind #{}, params:{}, acc:{}%".format(
+                        x,
+                        ind.block_architecture.param_count,
+                        ind.block_architecture.accuracy,
+                    )
+                )
+                logger.log(str(ind))
+
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+        if verbose:
+            print(logbook.stream)
+
+        if logger:
+            cur_time = time.time()
+            timing_log.log(
+                "Gen #{} finished in: {}".format(gen, cur_time - cur_gen_start_time)
+            )
+            cur_gen_start_time = cur_time
+
+        if checkpoint:
+            save_generation_checkpoint(
+                test_name,
+                gen,
+                population,
+                logbook,
+                halloffame,
+                individualrecord,
+                surrogate,
+                survival=survival,
+            )
+
+    if logger:
+        timing_log.log("Total time: {}".format(time.time() - start_time))
+        timing_log.log("STOP")
+
+    return population, logbook
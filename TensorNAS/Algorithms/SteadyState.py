@@ -0,0 +1,391 @@
+import random
+import time
+
+from TensorNAS.Algorithms.Common import assign_fitness
+
+
+def TestSteadyState(
+    cxpb,
+    mutpb,
+    pop_size,
+    gen_count,
+    evaluate_individual,
+    crossover_individual,
+    mutate_individual,
+    toolbox,
+    test_name,
+    verbose=False,
+    filter_function=None,
+    filter_function_args=None,
+    save_individuals=True,
+    generation_gap=1,
+    comment=None,
+    log=None,
+    existing_generation=None,
+    fitness_cache=False,
+    constraints=None,
+    evaluator=None,
+    in_flight=0,
+    objectives=None,
+    surrogate=None,
+):
+    logger = None
+    if log:
+        from TensorNAS.Tools.Logging import Logger
+
+        logger = Logger(test_name)
+        logger.log("Starting test {}".format(test_name))
+
+    from TensorNAS.Tools.DEAPtest import DEAPTest
+
+    test = DEAPTest(
+        pop_size=pop_size,
+        gen_count=gen_count,
+        toolbox=toolbox,
+        existing_generation=existing_generation,
+    )
+
+    test.set_evaluate(toolbox=toolbox, func=evaluate_individual)
+    test.set_mate(toolbox=toolbox, func=crossover_individual)
+    test.set_mutate(toolbox=toolbox, func=mutate_individual)
+    test.set_select(toolbox=toolbox, func=sel_tournament_dcd_pair)
+
+    if fitness_cache:
+        from TensorNAS.Tools.FitnessCache import FitnessCache
+
+        fitness_cache = FitnessCache(test_name)
+    else:
+        fitness_cache = None
+
+    if surrogate is not None:
+        surrogate.logger = logger
+
+    pop, logbook = eaSteadyState(
+        population=test.pop,
+        toolbox=toolbox,
+        cxpb=cxpb,
+        mutpb=mutpb,
+        max_evaluations=pop_size * (gen_count + 1),
+        test_name=test_name,
+        stats=test.stats,
+        halloffame=test.hof,
+        verbose=verbose,
+        individualrecord=test.ir,
+        save_individuals=save_individuals,
+        filter_function=filter_function,
+        filter_function_args=filter_function_args,
+        logger=logger,
+        fitness_cache=fitness_cache,
+        constraints=constraints,
+        evaluator=evaluator,
+        in_flight=in_flight,
+        objectives=objectives,
+        surrogate=surrogate,
+    )
+
+    test.ir.save(
+        generation_gap,
+        test_name=test_name,
+        title=filter_function.__name__ if filter_function else "no filter func",
+        comment=comment,
+    )
+
+    pareto_inds = test.ir.pareto(test_name=test_name)
+
+    from TensorNAS.Core.Util import copy_model
+
+    for i, ind in enumerate(pareto_inds):
+        models = [
+            p
+            for p in pop
+            if (
+                (p.block_architecture.param_count == ind[0])
+                and (p.block_architecture.accuracy == ind[1])
+            )
+        ]
+        if not len(models):
+            continue
+        pmodel = models[0]
+        copy_model(
+            test_name,
+            "Models/{}".format(pmodel.model_name),
+            "Models/pareto/{}".format(i),
+        )
+        if logger:
+            logger.log("Pareto Ind #{}".format(i))
+            logger.log(
+                "Acc: {}, Param Count: {}".format(
+                    pmodel.block_architecture.accuracy,
+                    pmodel.block_architecture.param_count,
+                )
+            )
+            logger.log(str(pmodel))
+
+    if logger:
+        logger.log("Done")
+        logger.log("STOP")
+
+    return pop, logbook, test
+
+
+def sel_tournament_dcd_pair(population):
+    """
+    Selects two parents using binary tournaments based on dominance and then crowding distance, as done by DEAP's
+    selTournamentDCD. selTournamentDCD is not used directly as it selects a multiple of four individuals and requires
+    the population size to be a multiple of four.
+    """
+    from deap.tools.emo import isDominated
+
+    def tourn(ind1, ind2):
+        if isDominated(ind2.fitness.wvalues, ind1.fitness.wvalues):
+            return ind1
+        elif isDominated(ind1.fitness.wvalues, ind2.fitness.wvalues):
+            return ind2
+
+        if ind1.fitness.crowding_dist < ind2.fitness.crowding_dist:
+            return ind2
+        elif ind1.fitness.crowding_dist > ind2.fitness.crowding_dist:
+            return ind1
+
+        return random.choice((ind1, ind2))
+
+    return [tourn(*random.sample(population, 2)) for _ in range(2)]
+
+
+def eaSteadyState(
+    population,
+    toolbox,
+    cxpb,
+    mutpb,
+    max_evaluations,
+    test_name,
+    stats=None,
+    halloffame=None,
+    verbose=__debug__,
+    individualrecord=None,
+    save_individuals=False,
+    filter_function=None,
+    filter_function_args=None,
+    logger=None,
+    fitness_cache=None,
+    constraints=None,
+    evaluator=None,
+    in_flight=0,
+    objectives=None,
+    surrogate=None,
+):
+    """An asynchronous steady-state evolutionary algorithm.
+
+    Rather than waiting for a whole generation to be evaluated before selection takes place, as eaSimple does,
+    *in_flight* evaluations are kept running at all times. As soon as any evaluation completes its individual is
+    inserted into the population, which is then truncated back to its original size using NSGA-II selection, and a
+    new offspring is bred from the current population and submitted in its place. Workers are therefore never idle
+    waiting on the slowest architecture of a generation.
+
+    :param population: A list of individuals, that are evaluated before
+                       offspring are bred from them.
+    :param toolbox: A :class:`~deap.base.Toolbox` that contains the evolution
+                    operators, select is expected to return two parents.
+    :param cxpb: The probability of mating the two parents.
+    :param mutpb: The probability of mutating an offspring.
+    :param max_evaluations: The number of evaluations after which the search
+                            stops, including those of the initial population.
+    :param evaluator: A :class:`~TensorNAS.Evaluation.Executor.Evaluator`,
+                      eg. an EvaluationPool or a BrokerEvaluator,
+                      used to evaluate the individuals asynchronously. If not
+                      given individuals are evaluated one at a time using
+                      :meth:`toolbox.evaluate`.
+    :param in_flight: The number of evaluations kept in flight, by default the
+                      number of the evaluator's workers.
+    :param objectives: Names of the architecture objectives appended to each
+                       individual's fitness, see :func:`eaSimple`.
+    :param surrogate: A
+                      :class:`~TensorNAS.Evaluation.Surrogate.SurrogateModel`,
+                      once it has enough samples each offspring is the one it
+                      predicts to be best out of a pool of bred candidates.
+    :returns: The final population
+    :returns: A class:`~deap.Tools.Logbook` with the statistics of the
+              evolution, a record is made each time as many evaluations as the
+              population size have completed
+
+    Models are saved under "<generation>/<index>", where the index is the order in which the individual was submitted
+    for evaluation and the generation is the index divided by the population size. The name is stored as the
+    individual's model_name.
+    """
+    from deap import tools
+
+    pop_size = len(population)
+
+    if not in_flight:
+        in_flight = len(evaluator) if evaluator else 1
+
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
+
+    if logger:
+        from TensorNAS.Tools.Logging import Logger
+
+        timing_log = Logger(test_name, subdir="Timing")
+        start_time = time.time()
+        cur_gen_start_time = start_time
+        timing_log.log("Start time: {}".format(start_time))
+        logger.log(
+            "Steady state, population: {}, evaluations in flight: {}".format(
+                pop_size, in_flight
+            )
+        )
+
+    pending = list(population)
+    population = []
+    running = {}
+    completed = []
+    submitted = 0
+    evaluated = 0
+
+    def _submit(ind):
+        nonlocal submitted
+
+        gen = submitted // pop_size
+        ind.index = submitted
+        ind.model_name = "{}/{}".format(gen, ind.index)
+        submitted += 1
+
+        if constraints and not constraints.apply(ind, toolbox, logger):
+            completed.append((ind, constraints.PENALTY_FITNESS))
+            return
+
+        if fitness_cache is not None:
+            ind.hash = ind.block_architecture.get_hash()
+            entry = fitness_cache.get(ind.hash)
+            if entry:
+                if save_individuals and entry["model"]:
+                    from TensorNAS.Core.Util import copy_model
+
+                    copy_model(
+                        test_name,
+                        "Models/{}".format(entry["model"]),
+                        "Models/{}".format(ind.model_name),
+                    )
+                completed.append((ind, tuple(entry["fitness"])))
+                return
+
+        save_name = test_name if save_individuals else None
+
+        if evaluator:
+            task_id = evaluator.submit(
+                ind.block_architecture,
+                test_name=save_name,
+                model_name=ind.model_name if save_name else None,
+            )
+            running[task_id] = ind
+        else:
+            completed.append(
+                (
+                    ind,
+                    toolbox.evaluate(ind, save_name, gen, logger),
+                )
+            )
+
+    def _breed():
+        if len(population) < 2:
+            # Offspring can not be bred until the initial population has started to complete
+            return None
+
+        if surrogate is not None and surrogate.is_ready():
+            candidates = [_breed_one() for _ in range(surrogate.pool_factor)]
+            return surrogate.screen(candidates, 1)[0]
+
+        return _breed_one()
+
+    def _breed_one():
+        offspring = [toolbox.clone(ind) for ind in toolbox.select(population)]
+
+        if random.random() < cxpb:
+            offspring[0], offspring[1] = toolbox.mate(offspring[0], offspring[1])
+
+        child = random.choice(offspring)
+
+        if random.random() < mutpb:
+            (child,) = toolbox.mutate(child)
+
+        del child.fitness.values
+
+        return child
+
+    while evaluated < max_evaluations:
+
+        while len(running) + len(completed) < in_flight and submitted < max_evaluations:
+            if pending:
+                _submit(pending.pop(0))
+            else:
+                child = _breed()
+                if child is None:
+                    break
+                _submit(child)
+
+        if completed:
+            ind, fit = completed.pop(0)
+        elif not running:
+            break
+        else:
+            task_id, fit = evaluator.get_result()
+            ind = running.pop(task_id)
+
+        evaluated += 1
+
+        if fitness_cache is not None and hasattr(ind, "hash"):
+            fitness_cache.add(
+                ind.hash, fit, ind.model_name if save_individuals else None
+            )
+
+        assign_fitness(ind, fit, filter_function, filter_function_args, objectives)
+
+        if surrogate is not None:
+            surrogate.add_individuals([ind])
+
+        if logger:
+            logger.log(
+                "Ind #{}, params:{}, acc:{}%".format(
+                    ind.index,
+                    ind.block_architecture.param_count,
+                    ind.block_architecture.accuracy,
+                )
+            )
+            logger.log(str(ind))
+
+        population.append(ind)
+        if len(population) > pop_size:
+            from TensorNAS.Algorithms.NSGA import sel_nsga2
+
+            population[:] = sel_nsga2(population, pop_size)
+        else:
+            from TensorNAS.Algorithms.NSGA import assign_rank_crowding
+
+            assign_rank_crowding(population)
+
+        if halloffame is not None:
+            halloffame.update([ind])
+
+        if evaluated % pop_size == 0:
+            gen = evaluated // pop_size - 1
+
+            if individualrecord:
+                individualrecord.add_gen(population)
+
+            record = stats.compile(population) if stats else {}
+            logbook.record(gen=gen, nevals=pop_size, **record)
+            if verbose:
+                print(logbook.stream)
+
+            if logger:
+                cur_time = time.time()
+                timing_log.log(
+                    "Gen #{} finished in: {}".format(gen, cur_time - cur_gen_start_time)
+                )
+                cur_gen_start_time = cur_time
+
+    if logger:
+        timing_log.log("Total time: {}".format(time.time() - start_time))
+        timing_log.log("STOP")
+
+    return population, logbook
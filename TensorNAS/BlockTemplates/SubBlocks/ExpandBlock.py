@@ -1,5 +1,4 @@
 from enum import Enum, auto
-from tensorflow import keras
 
 from TensorNAS.Core.Block import Block
 from TensorNAS.Core.LayerBlock import Block as LayerBlock
@@ -19,6 +18,7 @@ class Block(Block):
     MAX_SUB_BLOCKS = 5
     MIN_SUB_BLOCK = 2
     SUB_BLOCK_TYPES = SubBlockTypes
+    PARALLEL_SUB_BLOCKS = True
 
     def generate_random_sub_block(self, input_shape, layer_type):
         """
@@ -45,6 +45,8 @@ class Block(Block):
         """
         layers = [sb.get_keras_layers(input_tensor) for sb in self.middle_blocks]
         if len(layers) > 1:
-            return keras.layers.Concatenate()(layers)
+            import tensorflow as tf
+
+            return tf.keras.layers.Concatenate()(layers)
         else:
             return layers[0]
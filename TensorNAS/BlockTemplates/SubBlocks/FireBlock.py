@@ -46,6 +46,10 @@ class Block(Block):
         The expand block must be fed the squeeze layer in such that the functional API can correctly construct the
         parallelized Layers. Thus the get_keras_layers function must be overwritten to handle this passing.
         """
-        squeeze_layer = self.middle_blocks[0].get_keras_layers(input_tensor)
-        expand_layer = self.middle_blocks[1].get_keras_layers(squeeze_layer)
-        return expand_layer
+        tmp = input_tensor
+        for squeeze_block, expand_block in zip(
+            self.middle_blocks[::2], self.middle_blocks[1::2]
+        ):
+            squeeze_layer = squeeze_block.get_keras_layers(tmp)
+            tmp = expand_block.get_keras_layers(squeeze_layer)
+        return tmp
@@ -2,7 +2,6 @@
 # fixed Layers and output fixed Layers for the Expansion Block
 
 from enum import Enum, auto
-import tensorflow as tf
 
 from TensorNAS.Core.Block import Block
 from TensorNAS.BlockTemplates.SubBlocks.FilterBankBlock import Block as FilterBankBlock
@@ -29,6 +28,7 @@ class Block(Block):
     MAX_SUB_BLOCKS = 4
     MIN_SUB_BLOCK = 2
     SUB_BLOCK_TYPES = SubBlockTypes
+    PARALLEL_SUB_BLOCKS = True
 
     def generate_random_sub_block(self, input_shape, layer_type):
         if layer_type == self.SUB_BLOCK_TYPES.FILTER_BANK:
@@ -41,6 +41,8 @@ class Block(Block):
     def get_keras_layers(self, input_tensor):
         filter_banks = [sb.get_keras_layers(input_tensor) for sb in self.middle_blocks]
         if len(filter_banks) > 1:
+            import tensorflow as tf
+
             return tf.keras.layers.Concatenate()(filter_banks)
         else:
             return filter_banks[0]
@@ -1,5 +1,4 @@
 from enum import Enum, auto
-from tensorflow import keras
 
 from TensorNAS.Core.ModelUtil import shortcut
 from TensorNAS.Core.Block import Block
@@ -15,6 +14,7 @@ class SubBlockTypes(Enum):
 class Block(Block):
     MAX_SUB_BLOCKS = 1
     SUB_BLOCK_TYPES = SubBlockTypes
+    SHORTCUT = True
 
     def generate_random_sub_block(self, input_shape, layer_type):
         if layer_type == self.SUB_BLOCK_TYPES.SAME_CONV2D:
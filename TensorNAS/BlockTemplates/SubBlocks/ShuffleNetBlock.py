@@ -7,7 +7,7 @@ from TensorNAS.BlockTemplates.SubBlocks.TwoDClassificationBlock import (
 from TensorNAS.Core.LayerArgs import ArgActivations, ArgPadding
 from TensorNAS.Core.ModelUtil import shortcut
 from TensorNAS.Core.Block import Block
-from TensorNAS.Core.LayerBlock import LayerBlock
+from TensorNAS.Core.LayerBlock import Block as LayerBlock
 from TensorNAS.Layers import SupportedLayers
 from TensorNAS.Layers.Conv2D import Args as conv_args
 
@@ -32,6 +32,7 @@ class Block(Block):
 
     MAX_SUB_BLOCKS = 0
     SUB_BLOCK_TYPES = SubBlockTypes
+    SHORTCUT = True
 
     def generate_constrained_input_sub_blocks(self, input_shape):
         return [
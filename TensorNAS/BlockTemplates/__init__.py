@@ -1,55 +1,64 @@
-from setuptools import find_packages
-from pkgutil import iter_modules
-import os
 from enum import Enum
 
+# The registry of the block architecture and sub-block modules, as tuples of their package and module names, listed
+# rather than found by scanning the packages such that importing TensorNAS is fast and does not touch the filesystem,
+# see TensorNAS.Core.Util.scan_modules to check them against the modules present. Blocks are encoded in genomes by the
+# index of their module in the registry, see TensorNAS.Core.Genome, as such new blocks must be appended
+BLOCK_MODULES = (
+    ("BlockArchitectures", "ClassificationBlockArchitecture"),
+    ("BlockArchitectures", "EffNetBlockArchitecture"),
+    ("BlockArchitectures", "GhostNetBlockArchitecture"),
+    ("BlockArchitectures", "InceptionNetArchitecture"),
+    ("BlockArchitectures", "MobileNetBlockArchitecture"),
+    ("BlockArchitectures", "ResNetBlockArchitecture"),
+    ("BlockArchitectures", "ShuffleNetBlockArchitecture"),
+    ("BlockArchitectures", "SqueezeNetBlockArchitecture"),
+    ("SubBlocks", "EffNetBlock"),
+    ("SubBlocks", "ExpandBlock"),
+    ("SubBlocks", "FeatureExtractionBlock"),
+    ("SubBlocks", "FilterBankBlock"),
+    ("SubBlocks", "FireBlock"),
+    ("SubBlocks", "GhostBlock"),
+    ("SubBlocks", "InceptionBlock"),
+    ("SubBlocks", "MobilNetBlock"),
+    ("SubBlocks", "ResidualBlock"),
+    ("SubBlocks", "ShuffleNetBlock"),
+    ("SubBlocks", "SqueezeExpansionBLock"),
+    ("SubBlocks", "TwoDClassificationBlock"),
+)
+BLOCK_ARCHITECTURE_MODULES = tuple(
+    m for p, m in BLOCK_MODULES if p == "BlockArchitectures"
+)
+SUB_BLOCK_MODULES = tuple(m for p, m in BLOCK_MODULES if p == "SubBlocks")
 
-def find_block_architectures():
-    from TensorNAS.BlockTemplates import BlockArchitectures as BT
-
-    modules = []
-    BT_dir = os.path.dirname(BT.__file__)
-    for mod in iter_modules([BT_dir]):
-        if not mod.ispkg:
-            mod_name = mod.name
-            modules.append(mod_name)
-
-    for pkg in find_packages(BT_dir):
-        pkg_path = BT_dir + "/" + pkg.replace(".", "/")
-        for mod in iter_modules([pkg_path]):
-            if not mod.ispkg:
-                mod_name = mod.name
-                modules.append(mod_name)
 
-    return modules
+def find_block_architectures():
+    return list(BLOCK_ARCHITECTURE_MODULES)
 
 
 def find_blocks():
-    from TensorNAS.BlockTemplates import SubBlocks as BT
+    return list(SUB_BLOCK_MODULES)
 
-    modules = []
-    BT_dir = os.path.dirname(BT.__file__)
-    for mod in iter_modules([BT_dir]):
-        if not mod.ispkg:
-            mod_name = mod.name
-            modules.append(mod_name)
 
-    for pkg in find_packages(BT_dir):
-        pkg_path = BT_dir + "/" + pkg.replace(".", "/")
-        for mod in iter_modules([pkg_path]):
-            if not mod.ispkg:
-                mod_name = mod.name
-                modules.append(mod_name)
+def get_block_module_name(name):
+    """
+    @param name The name of a block's module, as stored in exported JSON, eg. ClassificationBlockArchitecture
+    @return The full name of the module, None if no such block is registered
+    """
+    if name in BLOCK_ARCHITECTURE_MODULES:
+        return "TensorNAS.BlockTemplates.BlockArchitectures." + name
+    if name in SUB_BLOCK_MODULES:
+        return "TensorNAS.BlockTemplates.SubBlocks." + name
+    if name == "LayerBlock":
+        return "TensorNAS.Core.LayerBlock"
 
-    return modules
+    return None
 
 
 ArchitectureModules = find_block_architectures()
-ArchitectureModules = find_blocks()
+BlockModules = find_blocks()
 
-SupportedBlocks = Enum(
-    "SupportedBlocks", {str.upper(i): i for i in ArchitectureModules}
-)
+SupportedBlocks = Enum("SupportedBlocks", {str.upper(i): i for i in BlockModules})
 SupportedArchitectureBlocks = Enum(
     "SupportedArchitectureBlocks", {str.upper(i): i for i in ArchitectureModules}
 )
@@ -3,7 +3,14 @@ import random
 import re
 from abc import ABC, abstractmethod
 
-from TensorNAS.Core.Util import mutate_enum_i
+from TensorNAS.Core.Util import mutate_enum_i, concatenate_shapes
+
+
+def _shapes_equal(shape_1, shape_2):
+    try:
+        return tuple(shape_1) == tuple(shape_2)
+    except TypeError:
+        return False
 
 
 def get_block_from_JSON(json_dict, parent_block=None):
@@ -23,6 +30,8 @@ def get_block_from_JSON(json_dict, parent_block=None):
     ]
 
     blk = b_class(*class_args)
+    if "layer_id" in json_dict:
+        blk.layer_id = json_dict["layer_id"]
     blk.input_blocks = []
     blk.middle_blocks = []
     blk.output_blocks = []
@@ -54,6 +63,11 @@ class Block(ABC):
         - SUB_BLOCK_TYPES
         - MAX_SUB_BLOCKS
 
+    Optional properties:
+        - MIN_SUB_BLOCK
+        - PARALLEL_SUB_BLOCKS
+        - SHORTCUT
+
     Required (abstract) methods:
         - Generate random sub block
 
@@ -78,6 +92,17 @@ class Block(ABC):
     """
     MIN_SUB_BLOCK = 1
 
+    """
+    Set if the block's middle sub-blocks are parallel branches that all take the output of the input blocks, the
+    outputs of the branches being concatenated along the channel axis, eg. an inception block.
+    """
+    PARALLEL_SUB_BLOCKS = False
+
+    """
+    Set if the block's input is added to the output of its sub-blocks, see ModelUtil.shortcut.
+    """
+    SHORTCUT = False
+
     @property
     @classmethod
     @abstractmethod
@@ -193,6 +218,9 @@ class Block(ABC):
         """
         Recursive function that walks a block architecture, refreshing the input and output shapes of the architecture.
 
+        Sub-blocks whose input shape is unchanged and that are not marked as having changed, see mark_shapes_dirty, are
+        not walked as their shapes can not have changed, as such only the blocks following a change are refreshed.
+
         @return True is no blocks were invalid
         """
         sbs = self.input_blocks + self.middle_blocks + self.output_blocks
@@ -200,23 +228,62 @@ class Block(ABC):
             if not input_shape:
                 input_shape = self.get_input_shape()
             out_shape = input_shape
-            for sb in sbs:
-                sb.set_input_shape(out_shape)
-                if sb.get_sb_count():
-                    out_shape = sb.refresh_io_shapes(sb.input_shape)
-                else:
-                    out_shape = sb.get_output_shape()
-                sb.set_output_shape(out_shape)
+            for sb in self.input_blocks:
+                out_shape = self._refresh_sub_block_io_shapes(sb, out_shape)
+            if self.PARALLEL_SUB_BLOCKS and self.middle_blocks:
+                out_shape = concatenate_shapes(
+                    [
+                        self._refresh_sub_block_io_shapes(sb, out_shape)
+                        for sb in self.middle_blocks
+                    ]
+                )
+            else:
+                for sb in self.middle_blocks:
+                    out_shape = self._refresh_sub_block_io_shapes(sb, out_shape)
+            for sb in self.output_blocks:
+                out_shape = self._refresh_sub_block_io_shapes(sb, out_shape)
             self.set_output_shape(self.get_output_shape())
+            self.shapes_dirty = False
             return out_shape
+        self.shapes_dirty = False
         return self.get_output_shape()
 
+    @staticmethod
+    def _refresh_sub_block_io_shapes(sb, input_shape):
+        if not getattr(sb, "shapes_dirty", True) and _shapes_equal(
+            sb.input_shape, input_shape
+        ):
+            out_shape = sb.get_output_shape()
+            sb.set_output_shape(out_shape)
+            return out_shape
+        sb.set_input_shape(input_shape)
+        if sb.get_sb_count():
+            out_shape = sb.refresh_io_shapes(sb.input_shape)
+        else:
+            out_shape = sb.get_output_shape()
+            sb.shapes_dirty = False
+        sb.set_output_shape(out_shape)
+        return out_shape
+
+    def mark_shapes_dirty(self):
+        """
+        Marks the block, and the blocks on the path to the architecture's root, as changed such that they are walked by
+        the next refresh of the architecture's shapes.
+        """
+        block = self
+        while block is not None:
+            block.shapes_dirty = True
+            block = block.parent_block
+
     def reset_ba_input_shapes(self):
         """
-        The block architecture root is retrieved and the sub-block inputs and outputs are processed and repaired.
+        The block is marked as changed and the sub-block inputs and outputs of the block architecture are processed
+        and repaired. Only the changed block and the blocks whose input shape changes as a result are refreshed, the
+        propagation stopping at the first block whose input shape is unchanged.
 
         @return True if the change was successful, ie. no blocks became invalid
         """
+        self.mark_shapes_dirty()
         ba = self.get_block_architecture()
         ba.refresh_io_shapes(input_shape=ba.get_input_shape())
         return False
@@ -235,7 +302,10 @@ class Block(ABC):
         if self.MAX_SUB_BLOCKS:
             rng = random.choice(range(self.MIN_SUB_BLOCK, self.MAX_SUB_BLOCKS + 1))
             for i in range(rng):
-                out_shape = self._get_cur_output_shape()
+                if self.PARALLEL_SUB_BLOCKS:
+                    out_shape = self._get_middle_input_shape()
+                else:
+                    out_shape = self._get_cur_output_shape()
                 while True:
                     blocks = self.generate_random_sub_block(
                         out_shape,
@@ -250,6 +320,14 @@ class Block(ABC):
         Returns the output shape of the block
         """
         try:
+            if (
+                self.PARALLEL_SUB_BLOCKS
+                and self.middle_blocks
+                and not self.output_blocks
+            ):
+                return concatenate_shapes(
+                    [sb.get_output_shape() for sb in self.middle_blocks]
+                )
             return (self.input_blocks + self.middle_blocks + self.output_blocks)[
                 -1
             ].get_output_shape()
@@ -268,6 +346,161 @@ class Block(ABC):
     def set_input_shape(self, input_shape):
         self.input_shape = input_shape
 
+    def get_layer_blocks(self):
+        """
+        Returns a list of all layer blocks, ie. the leaves of the block hierarchy, in the order that they are visited
+        when the keras model is built.
+        """
+        ret = []
+        for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
+            ret.extend(sb.get_layer_blocks())
+        return ret
+
+    def get_param_count(self):
+        """
+        Returns the number of parameters of the keras model that the block generates. The count is computed
+        analytically from the sub-blocks, thus no keras model is required to be built.
+        """
+        count = sum(
+            sb.get_param_count()
+            for sb in self.input_blocks + self.middle_blocks + self.output_blocks
+        )
+        if self.SHORTCUT:
+            from TensorNAS.Core.ModelUtil import shortcut_param_count
+
+            count += shortcut_param_count(
+                self.get_input_shape(), self.get_output_shape()
+            )
+        return count
+
+    def get_macs(self):
+        """
+        Returns the number of multiply-accumulate operations of the forward pass of the keras model that the block
+        generates for a single input sample, computed analytically from the sub-blocks.
+        """
+        count = sum(
+            sb.get_macs()
+            for sb in self.input_blocks + self.middle_blocks + self.output_blocks
+        )
+        if self.SHORTCUT:
+            from TensorNAS.Core.ModelUtil import shortcut_macs
+
+            count += shortcut_macs(self.get_input_shape(), self.get_output_shape())
+        return count
+
+    def get_flops(self):
+        """
+        Returns the number of floating point operations of the forward pass of the keras model that the block
+        generates for a single input sample, computed analytically from the sub-blocks.
+        """
+        count = sum(
+            sb.get_flops()
+            for sb in self.input_blocks + self.middle_blocks + self.output_blocks
+        )
+        if self.SHORTCUT:
+            from math import prod
+            from TensorNAS.Core.ModelUtil import shortcut_macs
+
+            # The projection, if required, and the addition of the shortcut to the residual
+            count += 2 * shortcut_macs(
+                self.get_input_shape(), self.get_output_shape()
+            ) + prod(self.get_output_shape())
+        return count
+
+    def get_peak_activations(self, live=0, keep_input=False):
+        """
+        Returns the peak number of activation elements that are allocated at once while the keras model that the
+        block generates runs inference on a single sample.
+
+        Each layer requires its input and output to be allocated while it executes. The input of a block with a
+        shortcut remains allocated until it is added to the output of the sub-blocks, the input of parallel
+        sub-blocks remains allocated until the last of them has executed and their outputs until they are
+        concatenated. As a shortcut's projection may be executed before or after the sub-blocks, the larger of the
+        two is taken. Layers are assumed not to operate in place, thus the figure is an upper bound.
+
+        @param live The number of elements allocated outside of the block while it executes
+        @param keep_input Set if the block's input is required after the block has executed
+        """
+        from math import prod
+
+        input_size = prod(self.get_input_shape())
+
+        if not self.SHORTCUT:
+            return self._get_sub_blocks_peak_activations(
+                live, input_size if keep_input else 0
+            )
+
+        residual_size = prod(self.get_output_shape())
+
+        # The sub-blocks are executed while the input is held for the shortcut, followed by the addition
+        peak = max(
+            self._get_sub_blocks_peak_activations(live, input_size),
+            live + input_size + 2 * residual_size,
+        )
+
+        if self.get_input_shape()[-1] != self.get_output_shape()[-1]:
+            # The input is projected onto the residual's shape, either last, as above, followed by the addition or
+            # first, the projection being held while the sub-blocks are executed
+            peak = max(
+                peak,
+                live + 3 * residual_size,
+                self._get_sub_blocks_peak_activations(
+                    live + residual_size, input_size if keep_input else 0
+                ),
+            )
+
+        return peak
+
+    def _get_sub_blocks_peak_activations(self, live, held):
+        """
+        @param held The number of elements of the block's input that remain allocated after the block's sub-blocks
+        have consumed it, zero if it is freed
+        @return The peak number of activation elements allocated while the block's sub-blocks execute in order
+        """
+        from math import prod
+
+        peak = live + prod(self.get_input_shape())
+        at_input = True
+
+        def _sequential(blocks):
+            nonlocal peak, at_input
+            for sb in blocks:
+                # While the current tensor is the block's input it is counted by the sub-block
+                peak = max(
+                    peak,
+                    sb.get_peak_activations(
+                        live=live + (0 if at_input else held),
+                        keep_input=at_input and held > 0,
+                    ),
+                )
+                at_input = False
+
+        def _parallel(blocks):
+            nonlocal peak, at_input
+            outputs = 0
+            for i, sb in enumerate(blocks):
+                peak = max(
+                    peak,
+                    sb.get_peak_activations(
+                        live=live + outputs + (0 if at_input else held),
+                        keep_input=i < len(blocks) - 1 or (at_input and held > 0),
+                    ),
+                )
+                outputs += prod(sb.get_output_shape())
+            if len(blocks) > 1:
+                # The concatenation of the branches' outputs
+                peak = max(peak, live + held + 2 * outputs)
+            at_input = False
+
+        _sequential(self.input_blocks)
+        if self.PARALLEL_SUB_BLOCKS:
+            _parallel(self.middle_blocks)
+        else:
+            _sequential(self.middle_blocks)
+        _sequential(self.output_blocks)
+
+        return peak
+
     def _get_random_sub_block_type(self):
         """This method returns a random enum value of the block's possible sub-blocks"""
         if self.SUB_BLOCK_TYPES:
@@ -292,11 +525,21 @@ class Block(ABC):
 
         return tmp
 
+    def _get_middle_input_shape(self):
+        if len(self.input_blocks):
+            return self.input_blocks[-1].get_output_shape()
+        return self.get_input_shape()
+
     def _get_cur_output_shape(self):
         if len(self.output_blocks):
             ret = self.output_blocks[-1].get_output_shape()
         elif len(self.middle_blocks):
-            ret = self.middle_blocks[-1].get_output_shape()
+            if self.PARALLEL_SUB_BLOCKS:
+                ret = concatenate_shapes(
+                    [sb.get_output_shape() for sb in self.middle_blocks]
+                )
+            else:
+                ret = self.middle_blocks[-1].get_output_shape()
         elif len(self.input_blocks):
             ret = self.input_blocks[-1].get_output_shape()
         else:
@@ -433,14 +676,41 @@ class Block(ABC):
     def get_sb_count(self):
         return len(self.input_blocks + self.middle_blocks + self.output_blocks)
 
+    def get_fingerprint(self):
+        """
+        Returns a canonical, JSON serializable description of the block's structure. The block's type and the
+        fingerprints of all sub-blocks are included such that two blocks with equal fingerprints generate the same
+        keras model.
+        """
+        from TensorNAS.Core.Layer import canonical_value
+
+        return [
+            self.__module__.split(".")[-1],
+            canonical_value(self.input_shape),
+            [sb.get_fingerprint() for sb in self.input_blocks],
+            [sb.get_fingerprint() for sb in self.middle_blocks],
+            [sb.get_fingerprint() for sb in self.output_blocks],
+        ]
+
+    def get_hash(self):
+        """
+        Returns a structural hash of the block, identical architectures, eg. those re-created through crossover or
+        mutation, produce the same hash.
+        """
+        import hashlib
+        import json
+
+        fingerprint = json.dumps(self.get_fingerprint(), separators=(",", ":"))
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+
     def get_JSON_dict(self):
 
         json_dict = {
             "class_name": self.__module__.split(".")[-1],
             "input_shape": self.input_shape,
             "layer_type": self.layer_type.name
-            if self.layer_type is not None
-            else "None",
+            if hasattr(self.layer_type, "name")
+            else str(self.layer_type),
             "mutation_funcs": self.mutation_funcs,
         }
 
@@ -506,6 +776,9 @@ class Block(ABC):
         self.middle_blocks = []
         self.output_blocks = []
 
+        # Set while the block's shapes, or those of its sub-blocks, may be out of date, see refresh_io_shapes
+        self.shapes_dirty = True
+
         ib = self.generate_constrained_input_sub_blocks(input_shape)
         if ib:
             self.input_blocks.extend(ib)
@@ -9,6 +9,22 @@ class BlockArchitecture(Block):
     architecture to be created, namely what sort of sub-blocks the block architecture can generate.
     """
 
+    """
+    Objectives, other than param count and accuracy, that can be computed analytically from the architecture and
+    appended to its fitness, mapped to the method, and its arguments, that computes them
+    """
+    OBJECTIVES = {
+        "MACS": ("get_macs", {}),
+        "FLOPS": ("get_flops", {}),
+        "PEAK_MEMORY": ("get_peak_memory", {"dtype": "float32"}),
+        "PEAK_MEMORY_INT8": ("get_peak_memory", {"dtype": "int8"}),
+    }
+
+    """
+    Size in bytes of an activation element of the data types models are deployed with
+    """
+    DTYPE_BYTES = {"float32": 4, "int8": 1}
+
     def __init__(self, input_shape, parent_block, layer_type):
         self.param_count = 0
         self.accuracy = 0
@@ -17,15 +33,143 @@ class BlockArchitecture(Block):
             input_shape=input_shape, parent_block=parent_block, layer_type=layer_type
         )
 
-    def get_keras_model(self, optimizer, loss, metrics):
+    def get_objectives(self, objectives):
+        """
+        @param objectives Names of objectives in OBJECTIVES
+        @return A tuple of the architecture's value for each of the objectives
+        """
+        ret = []
+        for o in objectives:
+            method, kwargs = self.OBJECTIVES[o.upper()]
+            ret.append(getattr(self, method)(**kwargs))
+        return tuple(ret)
+
+    def get_peak_memory(self, dtype="float32"):
+        """
+        Returns the peak working-set, in bytes, of the activations of the architecture's model when running inference
+        on a single sample, see Block.get_peak_activations. This is the RAM required on the target device for the
+        model's tensor arena, excluding the weights.
+
+        @param dtype The data type of the activations, float32 or int8 for a fully quantized model
+        """
+        return self.get_peak_activations() * self.DTYPE_BYTES[dtype]
+
+    def build_keras_model(self):
         import tensorflow as tf
 
         inp = tf.keras.Input(shape=self.input_shape)
         out = self.get_keras_layers(inp)
-        model = tf.keras.Model(inp, out)
-        model.compile(optimizer=optimizer, loss=loss, metrics=metrics, run_eagerly=True)
+        return tf.keras.Model(inp, out)
+
+    @staticmethod
+    def compile_keras_model(
+        model, optimizer, loss, metrics, run_eagerly=True, jit_compile=False
+    ):
+        """
+        @param run_eagerly If not set the model's training and evaluation steps are compiled into a graph
+        @param jit_compile Compile the model's steps using XLA, requires run_eagerly to be unset
+        """
+        model.compile(
+            optimizer=optimizer,
+            loss=loss,
+            metrics=metrics,
+            run_eagerly=run_eagerly,
+            jit_compile=jit_compile and not run_eagerly,
+        )
         return model
 
+    def get_keras_model(
+        self, optimizer, loss, metrics, run_eagerly=True, jit_compile=False
+    ):
+        return self.compile_keras_model(
+            self.build_keras_model(),
+            optimizer=optimizer,
+            loss=loss,
+            metrics=metrics,
+            run_eagerly=run_eagerly,
+            jit_compile=jit_compile,
+        )
+
+    def get_zero_cost_scores(
+        self, data, labels, loss, batch_size=64, proxies=None, model=None, logger=None
+    ):
+        """
+        Computes training-free proxies of the architecture's trainability from a single mini-batch, see
+        TensorNAS.Tools.TensorFlow.ZeroCost. Scoring takes seconds, compared to the minutes taken by training, and
+        can be used to filter architectures before they are trained.
+
+        @param proxies Names of the proxies to be computed, all if not given
+        @param model The architecture's untrained keras model, built if not given
+        @param logger The logger to which proxies that could not be computed are logged
+        @return A dict of the proxies' scores
+        """
+        from TensorNAS.Tools.TensorFlow.ZeroCost import get_zero_cost_scores
+
+        if model is None:
+            model = self.build_keras_model()
+
+        batch_size = min(batch_size if batch_size > 0 else 64, len(data))
+
+        return get_zero_cost_scores(
+            model,
+            data[:batch_size],
+            labels[:batch_size],
+            loss=loss,
+            proxies=proxies,
+            logger=logger,
+        )
+
+    def get_layer_weights(self):
+        """
+        @return A list of (layer ID, weights) of the architecture's layer blocks, in order, the weights being None
+        if the layer has none or they are not inheritable
+        """
+        return [
+            (lb.layer_id, lb.get_inheritable_weights())
+            for lb in self.get_layer_blocks()
+        ]
+
+    def set_layer_weights(self, layer_weights):
+        """
+        Stores weights, as returned by get_layer_weights of the same architecture, in the layer blocks.
+        """
+        for lb, (layer_id, weights) in zip(self.get_layer_blocks(), layer_weights):
+            if lb.layer_id == layer_id:
+                lb.set_weights(weights)
+
+    def _inherit_weights(self, model):
+        """
+        Sets the weights of the keras model's layers whose layer block carries inheritable weights.
+
+        @return The fraction of the model's parameters that were inherited
+        """
+        inherited = 0
+
+        for lb in self.get_layer_blocks():
+            weights = lb.get_inheritable_weights()
+            if weights and lb.keras_layer_name:
+                try:
+                    layer = model.get_layer(lb.keras_layer_name)
+                    layer.set_weights(weights)
+                    inherited += layer.count_params()
+                except Exception:
+                    # Weights that no longer fit the layer are trained from scratch
+                    pass
+
+        param_count = model.count_params()
+
+        return inherited / param_count if param_count else 0
+
+    def _store_weights(self, model):
+        for lb in self.get_layer_blocks():
+            weights = None
+            if lb.keras_layer_name:
+                try:
+                    weights = model.get_layer(lb.keras_layer_name).get_weights()
+                except ValueError:
+                    pass
+            lb.set_weights(weights)
+
     def evaluate(
         self,
         train_data,
@@ -42,9 +186,81 @@ class BlockArchitecture(Block):
         use_GPU=True,
         q_aware=False,
         logger=None,
+        train_fraction=1.0,
+        inherit_weights=False,
+        inherited_epoch_fraction=0.5,
+        use_tf_dataset=False,
+        jit_compile=False,
+        telemetry=None,
+        zero_cost_proxies=None,
     ):
+        """
+        Trains and tests the block architecture's keras model.
+
+        @param train_fraction Fraction of the training data the model is trained on, taken from the start of the
+        data, used for low fidelity evaluations
+        @param inherit_weights If set, layers that carry weights trained with an identical layer, eg. those of a
+        parent that were unaffected by mutation or crossover, are initialized with them and the model's trained
+        weights are stored in its layer blocks afterwards
+        @param inherited_epoch_fraction The fraction of the epochs a model whose parameters were all inherited is
+        fine-tuned for, models with a share of inherited parameters are trained for proportionally more
+        @param use_tf_dataset Train and test the model in graph mode using prefetched tf.data datasets that
+        are built once per process and reused for every model, see TensorNAS.Tools.TensorFlow.Dataset
+        @param jit_compile Compile the model using XLA, only used with use_tf_dataset
+        @param telemetry A TensorNAS.Tools.Telemetry.Telemetry to which the timings and resource usage of the
+        evaluation are recorded
+        @param zero_cost_proxies Names of the zero cost proxies, see get_zero_cost_scores, that are computed before
+        the model is trained and recorded to the telemetry, such that their correlation with the trained accuracy can
+        be validated. As the scores are only recorded to the telemetry they are not computed, and a warning is issued,
+        if no telemetry is given
+        """
+        import time
+
         import numpy as np
 
+        from TensorNAS.Tools.Telemetry import (
+            get_peak_rss_since_reset,
+            get_rss,
+            reset_peak_rss,
+        )
+
+        stats = {}
+        peak_rss_reset = False
+        if telemetry:
+            peak_rss_reset = reset_peak_rss()
+            stats = {
+                "rss_before": get_rss(),
+                "model": model_name,
+                "block_architecture": self.__module__.split(".")[-1],
+                "epochs": epochs,
+                "train_fraction": train_fraction,
+            }
+            # The analytic estimates of an invalid architecture can fail, which must not stop its evaluation
+            for name, get_stat in (
+                ("hash", self.get_hash),
+                (
+                    "layers",
+                    lambda: [lb.layer.get_name() for lb in self.get_layer_blocks()],
+                ),
+                ("macs", self.get_macs),
+                ("flops", self.get_flops),
+                ("peak_memory", self.get_peak_memory),
+                ("peak_memory_int8", lambda: self.get_peak_memory(dtype="int8")),
+            ):
+                try:
+                    stats[name] = get_stat()
+                except Exception:
+                    stats[name] = None
+
+        def _record(status):
+            if telemetry:
+                telemetry.record(
+                    status=status,
+                    rss_after=get_rss(),
+                    peak_rss=get_peak_rss_since_reset() if peak_rss_reset else None,
+                    **stats
+                )
+
         if use_GPU:
             from TensorNAS.Tools.TensorFlow import GPU as GPU
 
@@ -54,16 +270,65 @@ class BlockArchitecture(Block):
 
             os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 
+        if train_fraction < 1:
+            sample_count = max(1, int(len(train_data) * train_fraction))
+            train_data = train_data[:sample_count]
+            train_labels = train_labels[:sample_count]
+
         try:
-            model = self.get_keras_model(
+            start_time = time.perf_counter()
+            model = self.build_keras_model()
+            stats["build_time"] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            model = self.compile_keras_model(
+                model,
                 optimizer=optimizer,
                 loss=loss,
                 metrics=metrics,
+                run_eagerly=not use_tf_dataset,
+                jit_compile=jit_compile,
             )
+            stats["compile_time"] = time.perf_counter() - start_time
         except Exception as e:
             print("Error getting keras model: {}".format(e))
+            _record("build error: {}".format(e))
             return np.inf, 0
 
+        if zero_cost_proxies and not telemetry:
+            import warnings
+
+            warnings.warn(
+                "Zero cost proxies are only computed if telemetry is recorded, they are ignored"
+            )
+        elif zero_cost_proxies:
+            start_time = time.perf_counter()
+            stats["zero_cost"] = self.get_zero_cost_scores(
+                train_data,
+                train_labels,
+                loss=loss,
+                batch_size=batch_size,
+                proxies=zero_cost_proxies,
+                model=model,
+                logger=logger,
+            )
+            stats["zero_cost_time"] = time.perf_counter() - start_time
+
+        if inherit_weights:
+            inherited = self._inherit_weights(model)
+            if inherited:
+                epochs = max(
+                    1, round(epochs * (1 - inherited * (1 - inherited_epoch_fraction)))
+                )
+                if logger:
+                    logger.log(
+                        "Inherited {:.0%} of params, training for {} epochs".format(
+                            inherited, epochs
+                        )
+                    )
+            stats["inherited"] = inherited
+            stats["epochs"] = epochs
+
         if q_aware:
             try:
                 import tensorflow_model_optimization as tfmot
@@ -74,13 +339,47 @@ class BlockArchitecture(Block):
             except Exception as e:
                 print("Error getting QA model: {}".format(e))
 
+        if use_tf_dataset:
+            from TensorNAS.Tools.TensorFlow.Dataset import get_dataset
+
+            # Datasets require a batch size, keras' default is used if not set
+            ds_batch_size = batch_size if batch_size > 0 else 32
+            train_dataset = get_dataset(
+                train_data, train_labels, ds_batch_size, shuffle=True
+            )
+            test_dataset = get_dataset(test_data, test_labels, ds_batch_size)
+
+        callbacks = []
+        if telemetry:
+            from TensorNAS.Tools.TensorFlow.EpochTimer import EpochTimer
+
+            epoch_timer = EpochTimer()
+            callbacks.append(epoch_timer)
+            stats["epoch_times"] = epoch_timer.times
+
+        start_time = time.perf_counter()
+
         try:
-            if not batch_size > 0:
+            if use_tf_dataset:
+                import tensorflow as tf
+
+                early_stopper = tf.keras.callbacks.EarlyStopping(
+                    monitor="val_accuracy", patience=1, mode="max"
+                )
+                model.fit(
+                    train_dataset,
+                    validation_data=test_dataset,
+                    epochs=epochs,
+                    verbose=1,
+                    callbacks=[early_stopper] + callbacks,
+                )
+            elif not batch_size > 0:
                 model.fit(
                     x=train_data,
                     y=train_labels,
                     epochs=epochs,
                     verbose=1,
+                    callbacks=callbacks,
                 )
             else:
                 import tensorflow as tf
@@ -95,12 +394,19 @@ class BlockArchitecture(Block):
                     epochs=epochs,
                     batch_size=batch_size,
                     verbose=1,
-                    callbacks=[early_stopper],
+                    callbacks=[early_stopper] + callbacks,
                 )
         except Exception as e:
             print("Error fitting model, {}".format(e))
+            _record("fit error: {}".format(e))
             return np.inf, 0
 
+        stats["fit_time"] = time.perf_counter() - start_time
+
+        # The weights of a quantization aware model belong to layers of the wrapped model, thus are not inherited
+        if inherit_weights and not q_aware:
+            self._store_weights(model)
+
         try:
             if test_name and model_name:
                 from TensorNAS.Core.Util import save_model, save_block_architecture
@@ -119,10 +425,20 @@ class BlockArchitecture(Block):
         if params == 0:
             params = np.inf
 
+        start_time = time.perf_counter()
+
         try:
-            accuracy = model.evaluate(test_data, test_labels)[1] * 100
+            if use_tf_dataset:
+                accuracy = model.evaluate(test_dataset)[1] * 100
+            else:
+                accuracy = model.evaluate(test_data, test_labels)[1] * 100
         except Exception as e:
             accuracy = 0
             print("Error evaluating model: {}".format(e))
 
+        stats["evaluate_time"] = time.perf_counter() - start_time
+        stats["params"] = params
+        stats["accuracy"] = accuracy
+        _record("ok")
+
         return params, accuracy
@@ -0,0 +1,129 @@
+from enum import Enum, auto
+
+
+class ConstraintAction(Enum):
+    """
+    What is done with an individual whose architecture violates the constraints
+    """
+
+    # The individual is assigned the penalty fitness without being trained
+    PENALTY = auto()
+    # The individual is mutated until valid, falling back to the penalty fitness
+    REGENERATE = auto()
+
+
+class ArchitectureConstraints:
+    """
+    A validity and budget gate that is run on block architectures before they are dispatched for training, such that
+    architectures that would score badly regardless of their accuracy do not occupy a training slot.
+
+    Checks performed:
+        - Every layer's I/O shape must have only positive dimensions
+        - The analytical parameter count must not exceed the parameter budget, if set
+        - The analytical multiply-accumulate count must not exceed the MAC budget, if set
+        - The peak activation memory, for the given data type, must not exceed the memory budget, if set
+        - A keras model must be able to be constructed, if enabled. This requires TensorFlow and is the most costly check
+    """
+
+    """
+    Raw fitness, ie. (param_count, accuracy), assigned to rejected individuals, the same as that of a failed
+    evaluation.
+    """
+    PENALTY_FITNESS = (float("inf"), 0)
+
+    def __init__(
+        self,
+        max_params=None,
+        max_macs=None,
+        max_peak_memory=None,
+        peak_memory_dtype="float32",
+        validate_model=False,
+        action=ConstraintAction.PENALTY,
+        retries=5,
+    ):
+        self.max_params = max_params
+        self.max_macs = max_macs
+        self.max_peak_memory = max_peak_memory
+        self.peak_memory_dtype = peak_memory_dtype
+        self.validate_model = validate_model
+        self.action = action
+        self.retries = retries
+
+    @staticmethod
+    def _check_shapes(ba):
+        for lb in ba.get_layer_blocks():
+            for shape in (lb.get_input_shape(), lb.get_output_shape()):
+                if not shape or any(dim <= 0 for dim in shape):
+                    return "degenerate shape {} in layer {}".format(
+                        shape, lb.layer.get_name()
+                    )
+        return None
+
+    @staticmethod
+    def _check_model(ba):
+        import tensorflow as tf
+
+        try:
+            inp = tf.keras.Input(shape=ba.get_input_shape())
+            tf.keras.Model(inp, ba.get_keras_layers(inp))
+        except Exception as e:
+            return "keras model could not be constructed, {}".format(e)
+        return None
+
+    def check(self, ba):
+        """
+        @return None if the block architecture satisfies all constraints, otherwise a string describing the violation
+        """
+        try:
+            reason = self._check_shapes(ba)
+            if reason:
+                return reason
+
+            if self.max_params:
+                param_count = ba.get_param_count()
+                if param_count > self.max_params:
+                    return "param count {} exceeds budget of {}".format(
+                        param_count, self.max_params
+                    )
+
+            if self.max_macs:
+                macs = ba.get_macs()
+                if macs > self.max_macs:
+                    return "MAC count {} exceeds budget of {}".format(
+                        macs, self.max_macs
+                    )
+
+            if self.max_peak_memory:
+                peak_memory = ba.get_peak_memory(dtype=self.peak_memory_dtype)
+                if peak_memory > self.max_peak_memory:
+                    return "{} peak activation memory of {} bytes exceeds budget of {}".format(
+                        self.peak_memory_dtype, peak_memory, self.max_peak_memory
+                    )
+        except Exception as e:
+            return "invalid architecture, {}".format(e)
+
+        if self.validate_model:
+            return self._check_model(ba)
+
+        return None
+
+    def apply(self, ind, toolbox=None, logger=None):
+        """
+        Checks the individual's block architecture, regenerating it through the toolbox's mutate operator if the
+        action is REGENERATE.
+
+        @return True if the individual satisfies the constraints and should be evaluated
+        """
+        reason = self.check(ind.block_architecture)
+
+        if reason and self.action == ConstraintAction.REGENERATE and toolbox:
+            for _ in range(self.retries):
+                toolbox.mutate(ind)
+                reason = self.check(ind.block_architecture)
+                if not reason:
+                    break
+
+        if reason and logger:
+            logger.log("Rejected individual before training: {}".format(reason))
+
+        return reason is None
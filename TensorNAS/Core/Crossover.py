@@ -1,25 +1,71 @@
 # Note: please take note of arguments and return forms!
-def crossover_individuals_sp(ind1, ind2):
+def crossover_individuals_sp(ind1, ind2, max_retries=10):
     """
-    A pythonic approach to crossing over, as invalid architectures are created by some crossovers, crossing over is
-    repeated until a valid architecture is produced.
+    Single point crossover of the individuals' block architectures, see try_crossover_single_point. As some
+    shape-compatible crossovers still create invalid architectures, crossing over is retried up to max_retries times,
+    if no valid crossover is found the individuals are left unchanged.
+
+    The individuals are modified in place, as done by DEAP's crossover operators, they are expected to be clones, eg.
+    those created by DEAP's varAnd, such that the parents do not have to be copied again.
     """
-    from copy import deepcopy
-    from TensorNAS.Core.Crossover import crossover_single_point
+    for _ in range(max_retries):
+        if try_crossover_single_point(ind1.block_architecture, ind2.block_architecture):
+            break
+
+    ind1.index = None
+    ind2.index = None
+    return ind1, ind2
+
+
+def crossover_individuals_genome(ind1, ind2, max_retries=10):
+    """
+    Crosses over the individuals' genomes, see TensorNAS.Core.Genome, rather than their block trees, such that the
+    block architectures are never deep copied. Only shape-compatible sub-trees are swapped, see
+    TensorNAS.Core.Genome.crossover, as with crossover_individuals_sp offspring that still are invalid architectures,
+    see _is_valid_architecture, are rejected and crossing over is retried up to max_retries times. If no valid
+    offspring are found the individuals are left unchanged. The trained weights of the parents' layer blocks are
+    carried over to the offspring's layer blocks with the same layer IDs.
+
+    The individuals are modified in place, as done by DEAP's crossover operators, they are expected to be clones, eg.
+    those created by DEAP's varAnd.
+    """
+    import numpy as np
+
+    from TensorNAS.Core.Genome import crossover, decode, encode, get_layer_state
+
+    ba1 = ind1.block_architecture
+    ba2 = ind2.block_architecture
+
+    genome1 = encode(ba1)
+    genome2 = encode(ba2)
+
+    output_shape_1 = ba1.get_output_shape()
+    output_shape_2 = ba2.get_output_shape()
+
+    layer_state = get_layer_state(ba1)
+    layer_state.update(get_layer_state(ba2))
+
+    for _ in range(max_retries):
+        genome3, genome4 = crossover(genome1, genome2, (ba1, ba2))
+
+        if np.array_equal(genome3, genome1):
+            # The genomes have no differing compatible sub-trees to swap
+            break
 
-    while True:
         try:
-            ind3, ind4 = deepcopy(ind1), deepcopy(ind2)
-            ind3.block_architecture, ind4.block_architecture = crossover_single_point(
-                ind3.block_architecture, ind4.block_architecture
-            )
+            ba3 = decode(genome3, layer_state)
+            ba4 = decode(genome4, layer_state)
+            if _is_valid_architecture(ba3, output_shape_1) and _is_valid_architecture(
+                ba4, output_shape_2
+            ):
+                ind1.block_architecture, ind2.block_architecture = ba3, ba4
+                break
         except Exception:
             continue
-        break
 
-    ind3.index = None
-    ind4.index = None
-    return ind3, ind4
+    ind1.index = None
+    ind2.index = None
+    return ind1, ind2
 
 
 def crossover_single_point(b1, b2):
@@ -33,17 +79,7 @@ def crossover_single_point(b1, b2):
     random_node_1 = _select_random_node(b1)
     random_node_2 = _select_random_node(b2)
 
-    index_1 = random_node_1.get_index_in_parent()
-    index_2 = random_node_2.get_index_in_parent()
-
-    parent_1 = random_node_1.parent_block
-    parent_2 = random_node_2.parent_block
-
-    random_node_1.parent_block = parent_2
-    random_node_2.parent_block = parent_1
-
-    parent_1.set_block_at_index(index_1, random_node_2)
-    parent_2.set_block_at_index(index_2, random_node_1)
+    _swap_nodes(random_node_1, random_node_2)
 
     random_node_1.reset_ba_input_shapes()
     random_node_2.reset_ba_input_shapes()
@@ -51,6 +87,91 @@ def crossover_single_point(b1, b2):
     return b1, b2
 
 
+def try_crossover_single_point(b1, b2):
+    """
+    A single block between the two architectures is swapped, in place. The blocks are only selected from the pairs
+    whose swap is shape-compatible, see get_shape_index and _select_compatible_nodes. If either architecture still
+    becomes invalid, ie. a layer's shape becomes invalid or the architecture's output shape changes, eg. as a
+    block's spatial dimensions become too small, the swap is reverted.
+
+    @return True if the blocks were swapped, False if the architectures are unchanged
+    """
+    nodes = _select_compatible_nodes(b1, b2)
+
+    if nodes is None:
+        return False
+
+    node_1, node_2 = nodes
+
+    fingerprint_1 = node_1.get_fingerprint()
+    fingerprint_2 = node_2.get_fingerprint()
+
+    # Swapping identical blocks would leave both architectures unchanged
+    if fingerprint_1 == fingerprint_2:
+        return False
+
+    output_shape_1 = b1.get_output_shape()
+    output_shape_2 = b2.get_output_shape()
+
+    _swap_nodes(node_1, node_2)
+
+    try:
+        node_1.reset_ba_input_shapes()
+        node_2.reset_ba_input_shapes()
+        # Blocks that only differed in their input shapes can also leave both architectures unchanged
+        unchanged = (
+            node_1.get_fingerprint() == fingerprint_2
+            and node_2.get_fingerprint() == fingerprint_1
+        )
+        if (
+            not unchanged
+            and _is_valid_architecture(b1, output_shape_1)
+            and _is_valid_architecture(b2, output_shape_2)
+        ):
+            return True
+    except Exception:
+        pass
+
+    _swap_nodes(node_1, node_2)
+
+    node_1.reset_ba_input_shapes()
+    node_2.reset_ba_input_shapes()
+
+    return False
+
+
+def _swap_nodes(node_1, node_2):
+    """
+    Swaps the two blocks between their parent blocks, the shapes of the architectures are not refreshed.
+    """
+    index_1 = node_1.get_index_in_parent()
+    index_2 = node_2.get_index_in_parent()
+
+    parent_1 = node_1.parent_block
+    parent_2 = node_2.parent_block
+
+    node_1.parent_block = parent_2
+    node_2.parent_block = parent_1
+
+    parent_1.set_block_at_index(index_1, node_2)
+    parent_2.set_block_at_index(index_2, node_1)
+
+
+def _is_valid_shape(shape):
+    return shape is not None and all(dim is None or dim > 0 for dim in shape)
+
+
+def _is_valid_architecture(ba, output_shape):
+    """
+    @return True if the architecture's output shape is output_shape and the output shapes of all of its layers are
+    valid
+    """
+    if tuple(ba.get_output_shape()) != tuple(output_shape):
+        return False
+
+    return all(_is_valid_shape(lb.get_output_shape()) for lb in ba.get_layer_blocks())
+
+
 def _get_max_depth(ba):
     from TensorNAS.Core.LayerBlock import Block as LayerBlock
 
@@ -186,3 +307,72 @@ def _select_random_node(ba):
             count = 0
         else:
             return selected_block
+
+
+def get_shape_index(ba):
+    """
+    Indexes the blocks of a block architecture, excluding the root block, by their input shape, output shape and
+    hierarchical depth.
+
+    @param ba The block architecture
+    @return A dict of (input shape, output shape, depth) to the list of blocks with those shapes at that depth
+    """
+    index = {}
+
+    def _index(block, depth):
+        for sb in block.input_blocks + block.middle_blocks + block.output_blocks:
+            try:
+                key = (
+                    tuple(sb.get_input_shape()),
+                    tuple(sb.get_output_shape()),
+                    depth,
+                )
+            except TypeError:
+                # Blocks with invalid shapes are never crossed over
+                continue
+            index.setdefault(key, []).append(sb)
+            _index(sb, depth + 1)
+
+    _index(ba, 1)
+
+    return index
+
+
+def compatibility_key(key):
+    """
+    Blocks are swapped into each other's position, as such they must take inputs and produce outputs of the same
+    rank, eg. a convolutional block can never replace a dense block. The output channels must also match such that
+    the block following the swapped block is not changed, only the spatial dimensions of the outputs can differ.
+    """
+    input_shape, output_shape, _ = key
+
+    return len(input_shape), len(output_shape), output_shape[-1]
+
+
+def _select_compatible_nodes(b1, b2):
+    """
+    Selects a random pair of blocks, one from each architecture, whose swap is shape-compatible, see
+    compatibility_key. Each compatible pair is selected with equal probability.
+
+    @return A tuple of the two blocks, None if the architectures have no compatible blocks
+    """
+    import random
+
+    groups_1 = {}
+    for key, nodes in get_shape_index(b1).items():
+        groups_1.setdefault(compatibility_key(key), []).extend(nodes)
+
+    groups_2 = {}
+    for key, nodes in get_shape_index(b2).items():
+        groups_2.setdefault(compatibility_key(key), []).extend(nodes)
+
+    keys = [key for key in groups_1 if key in groups_2]
+
+    if not keys:
+        return None
+
+    key = random.choices(
+        keys, weights=[len(groups_1[k]) * len(groups_2[k]) for k in keys]
+    )[0]
+
+    return random.choice(groups_1[key]), random.choice(groups_2[key])
@@ -0,0 +1,582 @@
+"""
+A compact genome encoding of block architectures, a flat numpy int32 array, that can be converted to and from the
+block tree without loss.
+
+Layout:
+    [VERSION, structure length, input shape length, *input shape, *root node, *layer IDs]
+
+The structure, ie. everything but the layer IDs, is the root block's node, each node being followed by the nodes of
+its sub-blocks in the order input, middle then output blocks:
+    [block class ID, layer type tag, layer type owner, layer type value, extra arg count, *extra args,
+     input block count, middle block count, output block count, *layer args]
+
+The layer args are only present for layer blocks:
+    [arg count, *(arg ID, value tag, *value)]
+
+The IDs of the layer blocks, see LayerBlock.layer_id, follow the structure as four words each, in the order of
+Block.get_layer_blocks. They are kept apart from the structure such that the structure alone can be hashed.
+
+Only the root block's input shape is stored, the input shapes of sub-blocks are derived when the genome is decoded,
+as done by Block.refresh_io_shapes, thus sub-trees of genomes can be spliced without having to be repaired. Results of
+evaluation, ie. the param count, accuracy and the trained weights of layer blocks, are not part of the genome.
+"""
+
+import numpy as np
+
+# Incremented whenever the encoding changes, eg. the numbering of block classes, such that stored genomes of an older
+# encoding are rejected rather than decoded into the wrong blocks
+VERSION = 2
+
+# Layer type tags
+_LT_NONE = 0  # The root block
+_LT_SUB_BLOCK = 1  # A member of the parent block's SUB_BLOCK_TYPES
+_LT_LAYER = 2  # A member of TensorNAS.Layers.SupportedLayers
+_LT_INT = 3
+
+# Arg value tags
+_V_INT = 0
+_V_TUPLE = 1
+_V_LIST = 2
+_V_FLOAT = 3
+_V_ACTIVATION = 4
+_V_PADDING = 5
+_V_NONE = 6
+_V_BOOL = 7
+
+_STANDARD_ARGS = ("self", "input_shape", "parent_block", "layer_type", "args")
+
+_block_modules = None
+_block_classes = {}
+_extra_args = {}
+_mutation_funcs = {}
+
+
+def _get_block_modules():
+    """
+    The layer block is numbered 0 and the blocks of the block registry, see TensorNAS.BlockTemplates, follow in the
+    registry's append-only order, such that registering a new block does not change the IDs of the existing blocks.
+
+    @return The names of the modules of all block classes, the index of a module being its block class ID
+    """
+    global _block_modules
+
+    if _block_modules is None:
+        from TensorNAS.BlockTemplates import BLOCK_MODULES
+
+        _block_modules = ["TensorNAS.Core.LayerBlock"] + [
+            "TensorNAS.BlockTemplates.{}.{}".format(package, module)
+            for package, module in BLOCK_MODULES
+        ]
+
+    return _block_modules
+
+
+def _get_block_class(class_id):
+    cls = _block_classes.get(class_id)
+
+    if cls is None:
+        import importlib
+
+        cls = importlib.import_module(_get_block_modules()[class_id]).Block
+        _block_classes[class_id] = cls
+
+    return cls
+
+
+def _get_extra_args(cls):
+    """
+    @return The names of the block class's constructor args that are stored in the genome, eg. class_count
+    """
+    args = _extra_args.get(cls)
+
+    if args is None:
+        import inspect
+
+        args = [
+            a
+            for a in inspect.getfullargspec(cls.__init__).args
+            if a not in _STANDARD_ARGS
+        ]
+        _extra_args[cls] = args
+
+    return args
+
+
+def _get_mutation_funcs(cls, prefix):
+    """
+    @return The mutation functions of the class, as found by the Block and NetworkLayer constructors
+    """
+    funcs = _mutation_funcs.get(cls)
+
+    if funcs is None:
+        import re
+
+        funcs = [
+            func
+            for func in dir(cls)
+            if callable(getattr(cls, func)) and re.search(prefix, func)
+        ]
+        _mutation_funcs[cls] = funcs
+
+    return list(funcs)
+
+
+def _is_layer_block(block):
+    return block.__module__ == "TensorNAS.Core.LayerBlock"
+
+
+def _encode_layer_type(block, parent, class_ids):
+    """
+    Sub-block types are stored along with the block class owning their enum, rather than being relative to the parent
+    block, as crossover can move blocks into parents of other types.
+    """
+    from TensorNAS.Layers import SupportedLayers
+
+    layer_type = block.layer_type
+
+    if layer_type is None or layer_type == "None":
+        return [_LT_NONE, 0, 0]
+
+    name = getattr(layer_type, "name", layer_type)
+
+    if _is_layer_block(block):
+        return [_LT_LAYER, 0, list(SupportedLayers).index(SupportedLayers[name])]
+
+    owner = type(layer_type)
+    if owner.__module__ not in class_ids and parent is not None:
+        # Types imported from JSON are strings, they are relative to the parent block
+        owner = parent.SUB_BLOCK_TYPES
+
+    if owner is not None and owner.__module__ in class_ids:
+        if isinstance(name, str) and name in owner.__members__:
+            return [
+                _LT_SUB_BLOCK,
+                class_ids[owner.__module__],
+                list(owner).index(owner[name]),
+            ]
+
+    if isinstance(layer_type, int):
+        return [_LT_INT, 0, layer_type]
+
+    raise ValueError("Unable to encode layer type {}".format(layer_type))
+
+
+def _decode_layer_type(tag, owner, value):
+    if tag == _LT_NONE:
+        return None
+    if tag == _LT_SUB_BLOCK:
+        return list(_get_block_class(owner).SUB_BLOCK_TYPES)[value]
+    if tag == _LT_LAYER:
+        from TensorNAS.Layers import SupportedLayers
+
+        return list(SupportedLayers)[value]
+    return value
+
+
+def _encode_value(value):
+    from TensorNAS.Core.LayerArgs import ArgActivations, ArgPadding
+
+    if isinstance(value, ArgActivations):
+        return [_V_ACTIVATION, list(ArgActivations).index(value)]
+    if isinstance(value, ArgPadding):
+        return [_V_PADDING, list(ArgPadding).index(value)]
+    if value is None:
+        return [_V_NONE]
+    if isinstance(value, (bool, np.bool_)):
+        return [_V_BOOL, int(value)]
+    if isinstance(value, (int, np.integer)):
+        return [_V_INT, int(value)]
+    if isinstance(value, (float, np.floating)):
+        return [_V_FLOAT] + np.array([value], dtype=np.float64).view(np.int32).tolist()
+    if isinstance(value, (tuple, list)):
+        if not all(
+            isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_))
+            for v in value
+        ):
+            raise ValueError(
+                "Unable to encode arg value {}, only integer elements are supported".format(
+                    value
+                )
+            )
+        return [_V_TUPLE if isinstance(value, tuple) else _V_LIST, len(value)] + [
+            int(v) for v in value
+        ]
+    raise ValueError("Unable to encode arg value {}".format(value))
+
+
+def _decode_value(words, pos):
+    """
+    @return The decoded value and the position of the next word
+    """
+    from TensorNAS.Core.LayerArgs import ArgActivations, ArgPadding
+
+    tag = words[pos]
+
+    if tag == _V_INT:
+        return int(words[pos + 1]), pos + 2
+    if tag in (_V_TUPLE, _V_LIST):
+        length = words[pos + 1]
+        values = [int(v) for v in words[pos + 2 : pos + 2 + length]]
+        return tuple(values) if tag == _V_TUPLE else values, pos + 2 + length
+    if tag == _V_FLOAT:
+        value = np.array(words[pos + 1 : pos + 3], dtype=np.int32).view(np.float64)[0]
+        return float(value), pos + 3
+    if tag == _V_ACTIVATION:
+        return list(ArgActivations)[words[pos + 1]], pos + 2
+    if tag == _V_PADDING:
+        return list(ArgPadding)[words[pos + 1]], pos + 2
+    if tag == _V_NONE:
+        return None, pos + 1
+    if tag == _V_BOOL:
+        return bool(words[pos + 1]), pos + 2
+    raise ValueError("Unknown arg value tag {}".format(tag))
+
+
+def _encode_node(block, parent, class_ids, words, layer_ids):
+    cls = type(block)
+
+    words.append(class_ids[block.__module__])
+    words.extend(_encode_layer_type(block, parent, class_ids))
+
+    extra_args = _get_extra_args(cls)
+    words.append(len(extra_args))
+    words.extend(int(getattr(block, a)) for a in extra_args)
+
+    words.extend(
+        [len(block.input_blocks), len(block.middle_blocks), len(block.output_blocks)]
+    )
+
+    if _is_layer_block(block):
+        args_enum = list(block.layer.args_enum)
+        words.append(len(block.layer.args))
+        for key, value in block.layer.args.items():
+            words.append(args_enum.index(key))
+            words.extend(_encode_value(value))
+        layer_ids.extend(np.frombuffer(bytes.fromhex(block.layer_id), dtype=np.int32))
+
+    for sb in block.input_blocks + block.middle_blocks + block.output_blocks:
+        _encode_node(sb, block, class_ids, words, layer_ids)
+
+
+def encode(block_architecture):
+    """
+    @return The genome of the block architecture
+    """
+    class_ids = {name: i for i, name in enumerate(_get_block_modules())}
+
+    words = []
+    layer_ids = []
+    _encode_node(block_architecture, None, class_ids, words, layer_ids)
+
+    input_shape = list(block_architecture.get_input_shape())
+
+    return np.array(
+        [VERSION, len(words), len(input_shape)] + input_shape + words + layer_ids,
+        dtype=np.int32,
+    )
+
+
+def _decode_node(words, pos, input_shape, parent, layer_ids):
+    """
+    @return The decoded block and the position of the word following its node
+    """
+    from TensorNAS.Core.Util import concatenate_shapes
+
+    cls = _get_block_class(words[pos])
+    layer_type = _decode_layer_type(words[pos + 1], words[pos + 2], words[pos + 3])
+
+    extra_count = words[pos + 4]
+    extra_values = [int(v) for v in words[pos + 5 : pos + 5 + extra_count]]
+    pos += 5 + extra_count
+
+    input_count, middle_count, output_count = (int(v) for v in words[pos : pos + 3])
+    pos += 3
+
+    # Blocks are not constructed through their constructors as they would generate random sub-blocks
+    block = cls.__new__(cls)
+    block.input_shape = input_shape
+    block.parent_block = parent
+    block.layer_type = layer_type
+    block.mutation_funcs = _get_mutation_funcs(cls, r"^_mutate(?!_self)")
+    block.input_blocks = []
+    block.middle_blocks = []
+    block.output_blocks = []
+    block.shapes_dirty = True
+
+    for name, value in zip(_get_extra_args(cls), extra_values):
+        setattr(block, name, value)
+
+    from TensorNAS.Core.BlockArchitecture import BlockArchitecture
+
+    if isinstance(block, BlockArchitecture):
+        block.param_count = 0
+        block.accuracy = 0
+
+    if _is_layer_block(block):
+        from TensorNAS.Core.Layer import LayerShape
+        from TensorNAS.Layers import Layers
+
+        layer_cls = Layers[layer_type.name].value.Layer
+        args_enum = list(layer_cls._get_args_enum())
+
+        args = {}
+        arg_count = words[pos]
+        pos += 1
+        for _ in range(arg_count):
+            key = args_enum[words[pos]]
+            args[key], pos = _decode_value(words, pos + 1)
+
+        layer = layer_cls.__new__(layer_cls)
+        layer.args_enum = layer_cls._get_args_enum()
+        layer.args = args
+        layer.inputshape = LayerShape()
+        layer.outputshape = LayerShape()
+        layer.mutation_funcs = _get_mutation_funcs(layer_cls, r"^_mutate")
+        layer.inputshape.set(input_shape)
+        layer.outputshape.set(layer.get_output_shape())
+
+        block.layer = layer
+        block.layer_id = layer_ids.pop(0)
+        block.weights = None
+        block.weights_fingerprint = None
+        block.keras_layer_name = None
+
+    shape = input_shape
+    for _ in range(input_count):
+        sb, pos = _decode_node(words, pos, shape, block, layer_ids)
+        block.input_blocks.append(sb)
+        shape = sb.get_output_shape()
+
+    for _ in range(middle_count):
+        sb, pos = _decode_node(words, pos, shape, block, layer_ids)
+        block.middle_blocks.append(sb)
+        if not block.PARALLEL_SUB_BLOCKS:
+            shape = sb.get_output_shape()
+    if block.PARALLEL_SUB_BLOCKS and block.middle_blocks:
+        shape = concatenate_shapes(
+            [sb.get_output_shape() for sb in block.middle_blocks]
+        )
+
+    for _ in range(output_count):
+        sb, pos = _decode_node(words, pos, shape, block, layer_ids)
+        block.output_blocks.append(sb)
+        shape = sb.get_output_shape()
+
+    return block, pos
+
+
+def _split(genome):
+    """
+    @return The input shape, the structure and the layer ID words of the genome
+    """
+    if genome[0] != VERSION:
+        raise ValueError("Unsupported genome version {}".format(genome[0]))
+
+    structure_len = int(genome[1])
+    shape_len = int(genome[2])
+    start = 3 + shape_len
+
+    return (
+        tuple(int(v) for v in genome[3:start]),
+        genome[start : start + structure_len],
+        genome[start + structure_len :],
+    )
+
+
+def decode(genome, layer_state=None):
+    """
+    @param layer_state Optional dict of layer IDs to the (weights, weights fingerprint) of layer blocks, as returned
+    by get_layer_state, that are restored to the decoded layer blocks with the same ID
+    @return The block architecture of the genome
+    """
+    input_shape, structure, ids = _split(genome)
+
+    layer_ids = [ids[i : i + 4].tobytes().hex() for i in range(0, len(ids), 4)]
+
+    ba, _ = _decode_node(structure.tolist(), 0, input_shape, None, layer_ids)
+
+    if layer_state:
+        for lb in ba.get_layer_blocks():
+            if lb.layer_id in layer_state:
+                lb.weights, lb.weights_fingerprint = layer_state[lb.layer_id]
+
+    return ba
+
+
+def get_layer_state(block_architecture):
+    """
+    @return A dict of the layer IDs of the block architecture's layer blocks to their weights and weights fingerprint,
+    see decode
+    """
+    return {
+        lb.layer_id: (lb.weights, lb.weights_fingerprint)
+        for lb in block_architecture.get_layer_blocks()
+        if lb.weights is not None
+    }
+
+
+def get_hash(genome):
+    """
+    Returns a hash of the genome's structure, genomes of identical architectures produce the same hash regardless of
+    the IDs of their layer blocks.
+    """
+    import hashlib
+
+    input_shape, structure, _ = _split(genome)
+
+    return hashlib.sha256(
+        np.array(input_shape, dtype=np.int32).tobytes() + structure.tobytes()
+    ).hexdigest()
+
+
+def _get_spans(structure):
+    """
+    @return A (start, end, first layer, end layer) tuple of each node's sub-tree in pre-order, where start and end are
+    positions in the structure and the layers are indices of the genome's layer blocks
+    """
+    words = structure.tolist()
+    spans = []
+    layer_count = 0
+
+    def _walk(pos):
+        nonlocal layer_count
+
+        index = len(spans)
+        spans.append(None)
+        start = pos
+        first_layer = layer_count
+
+        cls = _get_block_class(words[pos])
+        pos += 5 + words[pos + 4]
+        child_count = sum(words[pos : pos + 3])
+        pos += 3
+
+        if _is_layer_block(cls):
+            arg_count = words[pos]
+            pos += 1
+            for _ in range(arg_count):
+                _, pos = _decode_value(words, pos + 1)
+            layer_count += 1
+
+        for _ in range(child_count):
+            pos = _walk(pos)
+
+        spans[index] = (start, pos, first_layer, layer_count)
+        return pos
+
+    _walk(0)
+
+    return spans
+
+
+def _get_node_keys(block_architecture):
+    """
+    @return The (input shape, output shape, depth) of each node of the block architecture, in the pre-order of
+    _get_spans, None for nodes whose shapes are invalid
+    """
+    keys = []
+
+    def _walk(block, depth):
+        try:
+            keys.append(
+                (tuple(block.get_input_shape()), tuple(block.get_output_shape()), depth)
+            )
+        except TypeError:
+            keys.append(None)
+
+        for sb in block.input_blocks + block.middle_blocks + block.output_blocks:
+            _walk(sb, depth + 1)
+
+    _walk(block_architecture, 0)
+
+    return keys
+
+
+def _group_spans(structure, block_architecture):
+    """
+    @return A dict of the compatibility keys, see TensorNAS.Core.Crossover.compatibility_key, of the nodes other than
+    the root to the spans of their sub-trees
+    """
+    from TensorNAS.Core.Crossover import compatibility_key
+
+    groups = {}
+
+    for span, key in zip(
+        _get_spans(structure)[1:], _get_node_keys(block_architecture)[1:]
+    ):
+        # Nodes with invalid shapes are never crossed over
+        if key is not None:
+            groups.setdefault(compatibility_key(key), []).append(span)
+
+    return groups
+
+
+def crossover(genome1, genome2, block_architectures=None):
+    """
+    Swaps a random sub-tree, other than the root, of each genome with that of the other genome. Only pairs of sub-trees
+    whose swap is shape-compatible, see TensorNAS.Core.Crossover.compatibility_key, and that differ in structure are
+    selected, each with equal probability. Care should be taken as the offspring can still be invalid architectures, eg. as the spatial
+    dimensions of a swapped sub-tree's output differ, which should be checked once they are decoded.
+
+    @param block_architectures The block architectures of the two genomes, from which the shapes of their nodes are
+    taken, the genomes are decoded if not given
+    @return The genomes of the two offspring, copies of the genomes if they have no compatible sub-trees that differ
+    """
+    import random
+
+    shape1, structure1, ids1 = _split(genome1)
+    shape2, structure2, ids2 = _split(genome2)
+
+    if block_architectures is None:
+        block_architectures = (decode(genome1), decode(genome2))
+
+    groups1 = _group_spans(structure1, block_architectures[0])
+    groups2 = _group_spans(structure2, block_architectures[1])
+
+    # Swapping identical sub-trees would only swap their layer IDs, leaving both architectures unchanged
+    pairs = [
+        (span1, span2)
+        for key in groups1
+        if key in groups2
+        for span1 in groups1[key]
+        for span2 in groups2[key]
+        if not np.array_equal(
+            structure1[span1[0] : span1[1]], structure2[span2[0] : span2[1]]
+        )
+    ]
+
+    if not pairs:
+        return genome1.copy(), genome2.copy()
+
+    span1, span2 = random.choice(pairs)
+
+    def _splice(shape, structure, ids, span, other_structure, other_ids, other_span):
+        start, end, layer_start, layer_end = span
+        o_start, o_end, o_layer_start, o_layer_end = other_span
+
+        new_structure = np.concatenate(
+            [structure[:start], other_structure[o_start:o_end], structure[end:]]
+        )
+        new_ids = np.concatenate(
+            [
+                ids[: layer_start * 4],
+                other_ids[o_layer_start * 4 : o_layer_end * 4],
+                ids[layer_end * 4 :],
+            ]
+        )
+
+        return np.concatenate(
+            [
+                np.array(
+                    [VERSION, len(new_structure), len(shape)] + list(shape),
+                    dtype=np.int32,
+                ),
+                new_structure,
+                new_ids,
+            ]
+        ).astype(np.int32)
+
+    return (
+        _splice(shape1, structure1, ids1, span1, structure2, ids2, span2),
+        _splice(shape2, structure2, ids2, span2, structure1, ids1, span1),
+    )
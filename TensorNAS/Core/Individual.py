@@ -36,6 +36,13 @@ class TensorNASIndividual:
         use_GPU=False,
         q_aware=False,
         logger=None,
+        train_fraction=1.0,
+        inherit_weights=False,
+        inherited_epoch_fraction=0.5,
+        use_tf_dataset=False,
+        jit_compile=False,
+        telemetry=None,
+        zero_cost_proxies=None,
     ):
         (param_count, accuracy,) = self.block_architecture.evaluate(
             train_data=train_data,
@@ -52,6 +59,13 @@ class TensorNASIndividual:
             use_GPU=use_GPU,
             q_aware=q_aware,
             logger=logger,
+            train_fraction=train_fraction,
+            inherit_weights=inherit_weights,
+            inherited_epoch_fraction=inherited_epoch_fraction,
+            use_tf_dataset=use_tf_dataset,
+            jit_compile=jit_compile,
+            telemetry=telemetry,
+            zero_cost_proxies=zero_cost_proxies,
         )
         return param_count, accuracy
 
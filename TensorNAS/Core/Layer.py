@@ -1,6 +1,27 @@
 import random
 import re
 from abc import ABC, abstractmethod
+from enum import Enum
+from numbers import Integral
+
+
+def canonical_value(value):
+    """
+    Converts a layer argument or shape into a JSON serializable value that is independent of how the value was
+    created, eg. enum members are replaced by their values and tuples by lists, such that architectures imported from
+    JSON compare equal to the originals.
+    """
+    if isinstance(value, Enum):
+        return canonical_value(value.value)
+    if isinstance(value, (list, tuple)):
+        return [canonical_value(v) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, Integral):
+        return int(value)
+    if isinstance(value, (float, str)):
+        return value
+    return type(value).__name__
 
 
 class LayerShape:
@@ -173,6 +194,43 @@ class NetworkLayer(ABC):
     def get_keras_layer(self, input_tensor):
         return NotImplementedError
 
+    def get_param_count(self):
+        """
+        Returns the number of trainable and non-trainable parameters of the keras layer, computed analytically from
+        the layer's arguments and input shape. Layers with weights must override this, by default layers have none.
+        """
+        return 0
+
+    def get_macs(self):
+        """
+        Returns the number of multiply-accumulate operations of the layer's forward pass for a single input sample,
+        computed analytically from the layer's arguments and I/O shapes. Layers that perform multiplications with
+        weights must override this, by default layers perform none.
+        """
+        return 0
+
+    def get_flops(self):
+        """
+        Returns the number of floating point operations of the layer's forward pass for a single input sample, by
+        default two per multiply-accumulate. Layers that perform other operations, eg. pooling, override this.
+        """
+        return 2 * self.get_macs()
+
+    def get_fingerprint(self):
+        """
+        Returns a canonical description of the layer, covering the layer type, its resolved arguments and its I/O
+        shapes. Layers with equal fingerprints produce identical keras layers.
+        """
+        return [
+            self.get_name(),
+            sorted(
+                [[name, canonical_value(value)] for name, value in self._args_to_JSON()],
+                key=lambda arg: arg[0],
+            ),
+            canonical_value(self.inputshape.dimensions),
+            canonical_value(self.get_output_shape()),
+        ]
+
     def _args_to_JSON(self):
 
         args = dict(self.args)
@@ -1,3 +1,5 @@
+import uuid
+
 from TensorNAS.Core.Block import Block
 
 # Do not remove this import
@@ -12,6 +14,10 @@ class Block(Block):
 
     To manage the keras layer the block contains a ModelLayer object which works to manage the properties of the
     TensorFlow/keras layer which can then be generated when required.
+
+    Layer blocks can carry the trained weights of their keras layer, along with the fingerprint of the layer they were
+    trained with, such that offspring can inherit them, see BlockArchitecture.evaluate. The layer ID is kept when the
+    block is copied and is used to match weights returned by evaluation workers.
     """
 
     MAX_SUB_BLOCKS = 0
@@ -25,6 +31,10 @@ class Block(Block):
         else:
             layer = eval("Layers." + layer_type + ".value.Layer")
         self.layer = layer(input_shape=input_shape, args=args)
+        self.layer_id = uuid.uuid4().hex
+        self.weights = None
+        self.weights_fingerprint = None
+        self.keras_layer_name = None
 
         super().__init__(
             input_shape=input_shape, parent_block=parent_block, layer_type=layer_type
@@ -40,7 +50,54 @@ class Block(Block):
         return self.layer.get_output_shape()
 
     def get_keras_layers(self, input_tensor):
-        return self.layer.get_keras_layer(input_tensor)
+        output = self.layer.get_keras_layer(input_tensor)
+
+        # The name of the keras layer that produced the output is kept such that its weights can be set or retrieved
+        try:
+            self.keras_layer_name = output._keras_history[0].name
+        except (AttributeError, IndexError):
+            self.keras_layer_name = None
+
+        return output
+
+    def set_weights(self, weights):
+        """
+        Stores trained weights of the block's keras layer, they are only inherited while the layer is unchanged.
+        """
+        if weights:
+            self.weights = weights
+            self.weights_fingerprint = self.get_fingerprint()
+        else:
+            self.weights = None
+            self.weights_fingerprint = None
+
+    def get_inheritable_weights(self):
+        """
+        @return The stored weights if they were trained with the block's current layer, otherwise None
+        """
+        if self.weights and self.weights_fingerprint == self.get_fingerprint():
+            return self.weights
+        return None
+
+    def get_fingerprint(self):
+        return self.layer.get_fingerprint()
+
+    def get_param_count(self):
+        return self.layer.get_param_count()
+
+    def get_macs(self):
+        return self.layer.get_macs()
+
+    def get_flops(self):
+        return self.layer.get_flops()
+
+    def get_peak_activations(self, live=0, keep_input=False):
+        from math import prod
+
+        return live + prod(self.get_input_shape()) + prod(self.get_output_shape())
+
+    def get_layer_blocks(self):
+        return [self]
 
     def print_self(self):
         self.layer.print()
@@ -58,5 +115,6 @@ class Block(Block):
 
         json_dict["layer"] = self.layer.toJSON()
         json_dict["args"] = json_dict["layer"]["args"]
+        json_dict["layer_id"] = self.layer_id
 
         return json_dict
@@ -1,3 +1,64 @@
+def shortcut_conv_args(input_shape, residual_shape):
+    """
+    Returns the kernel size and strides of the convolution used to project a shortcut's input onto the residual's
+    shape. Shapes are given without the batch dimension.
+    """
+    # Invalid architectures can reduce the residual's spatial dimensions to zero, these are treated as one such that
+    # the analytic estimates of such architectures do not raise
+    residual_height = max(residual_shape[0], 1)
+    residual_width = max(residual_shape[1], 1)
+
+    if (input_shape[0] % residual_height or input_shape[1] % residual_width) and (
+        input_shape[0] != residual_height and input_shape[1] != residual_width
+    ):
+        kernel_size = (
+            input_shape[0] - residual_height + 1,
+            input_shape[1] - residual_width + 1,
+        )
+        stride_width = 1
+        stride_height = 1
+    else:
+        kernel_size = (1, 1)
+        stride_width = int(round(input_shape[0] / residual_height))
+        stride_height = int(round(input_shape[1] / residual_width))
+
+    return kernel_size, (stride_width, stride_height)
+
+
+def shortcut_param_count(input_shape, residual_shape):
+    """
+    Returns the number of parameters added by the projection convolution of a shortcut, zero if the channel counts
+    match and no projection is required.
+    """
+    if input_shape[-1] == residual_shape[-1]:
+        return 0
+
+    kernel_size, _ = shortcut_conv_args(input_shape, residual_shape)
+    return (
+        kernel_size[0] * kernel_size[1] * input_shape[-1] * residual_shape[-1]
+        + residual_shape[-1]
+    )
+
+
+def shortcut_macs(input_shape, residual_shape):
+    """
+    Returns the number of multiply-accumulates of the projection convolution of a shortcut, zero if no projection is
+    required. The projection produces the residual's shape.
+    """
+    if input_shape[-1] == residual_shape[-1]:
+        return 0
+
+    kernel_size, _ = shortcut_conv_args(input_shape, residual_shape)
+    return (
+        residual_shape[0]
+        * residual_shape[1]
+        * residual_shape[2]
+        * kernel_size[0]
+        * kernel_size[1]
+        * input_shape[-1]
+    )
+
+
 def shortcut(input, residual):
     import tensorflow as tf
 
@@ -7,25 +68,13 @@ def shortcut(input, residual):
 
     shortcut = input
 
-    if (input_shape[1] % residual_shape[1] or input_shape[2] % residual_shape[2]) and (
-        input_shape[1] != residual_shape[1] and input_shape[2] != residual_shape[2]
-    ):
-        kernel_size = (
-            input_shape[1] - residual_shape[1] + 1,
-            input_shape[2] - residual_shape[2] + 1,
-        )
-        stride_width = 1
-        stride_height = 1
-    else:
-        kernel_size = (1, 1)
-        stride_width = int(round(input_shape[1] / residual_shape[1]))
-        stride_height = int(round(input_shape[2] / residual_shape[2]))
+    kernel_size, strides = shortcut_conv_args(input_shape[1:], residual_shape[1:])
 
     if not equal_channels:
         shortcut = tf.keras.layers.Conv2D(
             filters=residual_shape[3],
             kernel_size=kernel_size,
-            strides=(stride_width, stride_height),
+            strides=strides,
             padding="valid",
             kernel_initializer="he_normal",
             kernel_regularizer=tf.keras.regularizers.l2(0.0001),
@@ -17,6 +17,13 @@ def dimension_mag(dimension):
     return reduce((lambda x, y: x * y), dimension)
 
 
+def concatenate_shapes(shapes):
+    """
+    Returns the shape resulting from concatenating tensors of the given shapes along their last axis.
+    """
+    return tuple(shapes[0][:-1]) + (sum(shape[-1] for shape in shapes),)
+
+
 def _find_prime_factors(product):
     primeFactors = []
     while not product % 2:
@@ -158,6 +165,23 @@ def find_modules(pkg, dir):
     return modules
 
 
+def scan_modules(pkg):
+    """
+    Lists the modules of the package and of its sub-packages, in order of discovery, by scanning the filesystem. Used
+    to check the registries of layers and blocks, eg. TensorNAS.Layers.LAYER_MODULES, against the modules present.
+
+    @return The full names of the modules, sub-packages themselves are not included
+    """
+    from importlib import import_module
+    from pkgutil import walk_packages
+
+    return [
+        mod.name
+        for mod in walk_packages(import_module(pkg).__path__, pkg + ".")
+        if not mod.ispkg
+    ]
+
+
 def custom_sparse_categorical_accuracy(y_true, y_pred):
     from tensorflow.keras import backend as K
 
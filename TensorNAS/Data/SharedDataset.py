@@ -0,0 +1,167 @@
+from enum import Enum, auto
+
+
+class SharedDataBackend(Enum):
+    """
+    How the arrays of a shared dataset are published to other processes
+    """
+
+    SHARED_MEMORY = auto()  # A multiprocessing.shared_memory block per array
+    MEMMAP = auto()  # A .npy file per array that is memory-mapped by readers
+
+
+"""
+Arrays attached to by this process, keyed by the shared memory block name or file path, such that a worker that is
+handed the same dataset for every task only attaches to it once.
+"""
+_attached = {}
+
+
+def _attach_shared_memory(name):
+    from multiprocessing import shared_memory
+
+    try:
+        # Readers must not unlink the block when they exit, only the publisher owns it
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python versions < 3.13 do not support disabling tracking
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedArray:
+    """
+    A numpy array that is published once by the creating process and attached to by others as a read-only view.
+
+    Instances are cheap to pickle, only the name, shape and dtype of the array are sent such that they can be
+    passed along with every task given to a worker process.
+    """
+
+    def __init__(self, array, backend=SharedDataBackend.SHARED_MEMORY, directory=None):
+        import numpy as np
+
+        array = np.ascontiguousarray(array)
+
+        self.shape = array.shape
+        self.dtype = array.dtype.str
+        self.backend = backend
+        self._owner = True
+
+        if backend == SharedDataBackend.SHARED_MEMORY:
+            from multiprocessing import shared_memory
+
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=max(array.nbytes, 1)
+            )
+            self.name = self._shm.name
+            view = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+            view[...] = array
+        else:
+            import os
+            import tempfile
+
+            if directory is None:
+                directory = tempfile.mkdtemp(prefix="tensornas_data_")
+            self._shm = None
+            fd, self.name = tempfile.mkstemp(suffix=".npy", dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_shm"] = None
+        state["_owner"] = False
+        return state
+
+    def get(self):
+        """
+        Returns a read-only view of the array, attaching to it if it has not yet been attached to by this process.
+        """
+        import numpy as np
+
+        array = _attached.get(self.name)
+
+        if array is None:
+            if self.backend == SharedDataBackend.SHARED_MEMORY:
+                shm = self._shm if self._owner else _attach_shared_memory(self.name)
+                array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+                array.flags.writeable = False
+                _attached[self.name] = array
+                _attached[self.name + "_shm"] = shm
+            else:
+                array = np.load(self.name, mmap_mode="r")
+                _attached[self.name] = array
+
+        return array
+
+    def close(self):
+        """
+        Releases the array, the publishing process also destroys the shared memory block or file.
+        """
+        _attached.pop(self.name, None)
+        shm = _attached.pop(self.name + "_shm", None) or self._shm
+
+        if self.backend == SharedDataBackend.SHARED_MEMORY:
+            if shm:
+                try:
+                    shm.close()
+                except BufferError:
+                    # Views of the array are still referenced, the block is released once they are collected
+                    pass
+                if self._owner:
+                    shm.unlink()
+        elif self._owner:
+            import os
+
+            os.remove(self.name)
+
+
+class SharedDataset:
+    """
+    The training and test data of a test, published once such that worker processes read the same copy of the data
+    rather than each receiving their own pickled copy.
+
+    The dataset is passed to workers, eg. through the arguments of the evaluate function, and the workers retrieve
+    read-only views of the arrays using get_arrays. Only the publishing process should call close, once all workers
+    have finished.
+    """
+
+    ARRAY_NAMES = ("train_data", "train_labels", "test_data", "test_labels")
+
+    def __init__(
+        self,
+        train_data,
+        train_labels,
+        test_data,
+        test_labels,
+        backend=SharedDataBackend.SHARED_MEMORY,
+    ):
+        import tempfile
+
+        if backend == SharedDataBackend.MEMMAP:
+            self.directory = tempfile.mkdtemp(prefix="tensornas_data_")
+        else:
+            self.directory = None
+
+        self.input_shape = tuple(train_data.shape[1:])
+        self.arrays = {
+            name: SharedArray(array, backend=backend, directory=self.directory)
+            for name, array in zip(
+                self.ARRAY_NAMES, (train_data, train_labels, test_data, test_labels)
+            )
+        }
+
+    def get_arrays(self):
+        """
+        @return A dict of read-only views of the arrays, keyed by the name of the BlockArchitecture.evaluate argument
+        that they are to be passed as
+        """
+        return {name: array.get() for name, array in self.arrays.items()}
+
+    def close(self):
+        for array in self.arrays.values():
+            array.close()
+
+        if self.directory:
+            import shutil
+
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,459 @@
+"""
+A task queue broker through which evaluation workers on any number of nodes pull the genomes of block architectures
+to evaluate and push back their fitnesses.
+
+The broker is served by a multiprocessing manager over TCP, as such it requires no dependencies beyond the standard
+library. It is started by the BrokerEvaluator of the searching process, optionally along with local workers, and
+remote workers connect to it using run_worker, eg. through the demo's --worker argument.
+
+Workers send a heartbeat while they evaluate a task, the tasks of workers whose heartbeat stops, eg. as they crashed
+or lost their connection, are requeued for another worker, up to a maximum number of retries.
+
+The manager exchanges pickles, as such anyone who can connect to the broker with its authentication key can run code
+on it. A broker listening on an address other than a loopback address requires an explicit key, which should be kept
+secret and shared only with the workers' nodes.
+"""
+
+from multiprocessing.managers import BaseManager
+
+from TensorNAS.Evaluation.Executor import FAILURE_FITNESS, Evaluator
+
+# The broker instance served by the broker's process, created by _init_broker when the manager's server starts
+_broker = None
+
+
+class TaskBroker:
+    """
+    The state of the broker, pending tasks, tasks in flight along with the worker evaluating them and completed
+    results. Lives in the manager's server process, the evaluator and workers access it through proxies, each call
+    being served by its own thread.
+    """
+
+    def __init__(
+        self,
+        training_args,
+        heartbeat_timeout=60,
+        max_retries=3,
+        failure_fitness=FAILURE_FITNESS,
+    ):
+        import threading
+        from collections import deque
+
+        self.training_args = training_args
+        self.failure_fitness = tuple(failure_fitness)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_retries = max_retries
+        self.pending = deque()
+        # In flight tasks by task ID, as a tuple of the evaluating worker's ID and the task, and the number of times
+        # each task was handed to a worker
+        self.in_flight = {}
+        self.attempts = {}
+        self.heartbeats = {}
+        self.results = deque()
+        self.stopped = False
+        self.condition = threading.Condition()
+
+    def get_training_args(self):
+        return self.training_args
+
+    def get_failure_fitness(self):
+        return self.failure_fitness
+
+    def put_task(self, task_id, task):
+        with self.condition:
+            self.pending.append((task_id, task))
+            self.attempts[task_id] = 0
+            self.condition.notify_all()
+
+    def get_task(self, worker_id, timeout=None):
+        """
+        @return A tuple of the task ID and the task, None if no task became available before the timeout or if the
+        broker was stopped
+        """
+        import time
+
+        with self.condition:
+            self.heartbeats[worker_id] = time.time()
+            self.condition.wait_for(lambda: self.pending or self.stopped, timeout)
+
+            if self.stopped or not self.pending:
+                return None
+
+            task_id, task = self.pending.popleft()
+            self.attempts[task_id] += 1
+            self.in_flight[task_id] = (worker_id, task)
+            self.heartbeats[worker_id] = time.time()
+
+            return task_id, task
+
+    def heartbeat(self, worker_id):
+        """
+        @return If the worker should continue, False once the broker was stopped
+        """
+        import time
+
+        with self.condition:
+            self.heartbeats[worker_id] = time.time()
+            return not self.stopped
+
+    def put_result(self, worker_id, task_id, result):
+        """
+        Stores the result of the task, results of tasks that were requeued, as the worker was thought lost, and were
+        since completed by another worker are dropped.
+        """
+        import time
+
+        with self.condition:
+            self.heartbeats[worker_id] = time.time()
+
+            if self.in_flight.get(task_id, (None,))[0] != worker_id:
+                return
+
+            del self.in_flight[task_id]
+            del self.attempts[task_id]
+            self.results.append((task_id, result))
+            self.condition.notify_all()
+
+    def get_result(self, timeout=None):
+        """
+        Requeues the tasks of lost workers, a task that was lost more than the maximum number of retries is
+        completed with a None result.
+
+        @return A tuple of the task ID and the result, None if no result became available before the timeout
+        """
+        with self.condition:
+            self._requeue_lost()
+            self.condition.wait_for(lambda: self.results, timeout)
+
+            if not self.results:
+                return None
+
+            return self.results.popleft()
+
+    def _requeue_lost(self):
+        import time
+
+        now = time.time()
+
+        for task_id, (worker_id, task) in list(self.in_flight.items()):
+            if now - self.heartbeats[worker_id] <= self.heartbeat_timeout:
+                continue
+
+            del self.in_flight[task_id]
+
+            if self.attempts[task_id] > self.max_retries:
+                del self.attempts[task_id]
+                self.results.append((task_id, None))
+            else:
+                self.pending.append((task_id, task))
+
+        if self.pending:
+            self.condition.notify_all()
+
+    def get_worker_count(self):
+        """
+        @return The number of workers that sent a heartbeat within the heartbeat timeout
+        """
+        import time
+
+        now = time.time()
+
+        with self.condition:
+            return sum(
+                now - beat <= self.heartbeat_timeout
+                for beat in self.heartbeats.values()
+            )
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+
+def _init_broker(training_args, heartbeat_timeout, max_retries, failure_fitness):
+    global _broker
+
+    _broker = TaskBroker(
+        training_args,
+        heartbeat_timeout=heartbeat_timeout,
+        max_retries=max_retries,
+        failure_fitness=failure_fitness,
+    )
+
+
+def _get_broker():
+    return _broker
+
+
+class BrokerManager(BaseManager):
+    pass
+
+
+BrokerManager.register("get_broker", callable=_get_broker)
+
+
+def parse_address(address):
+    """
+    @param address The broker's address as "host:port"
+    @return The address as a (host, port) tuple
+    """
+    host, port = address.rsplit(":", 1)
+
+    return host, int(port)
+
+
+def is_loopback_address(address):
+    """
+    @param address An address as "host:port"
+    @return True if the host is a loopback address, ie. only reachable from this node
+    """
+    import ipaddress
+    import socket
+
+    host, _ = parse_address(address)
+
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def run_worker(address, authkey, dataset, heartbeat_interval=10, logger=None):
+    """
+    Connects to the broker and evaluates its tasks until the broker is stopped or can no longer be reached.
+
+    The models of the evaluated block architectures are saved to the worker's Output directory, as such workers on
+    other nodes should share the searching node's Output directory, eg. through a network file system, if models are
+    to be saved.
+
+    @param address The broker's address as "host:port"
+    @param authkey The broker's authentication key, as bytes
+    @param dataset The worker's dataset, eg. a SharedDataset, as each node loads the data itself
+    @param heartbeat_interval Seconds between heartbeats, must be well below the broker's heartbeat timeout
+    """
+    import os
+    import socket
+    import threading
+
+    if not authkey:
+        raise ValueError("The broker's authentication key is required to connect to it")
+
+    manager = BrokerManager(address=parse_address(address), authkey=authkey)
+    manager.connect()
+    broker = manager.get_broker()
+
+    training_args = broker.get_training_args()
+    failure_fitness = broker.get_failure_fitness()
+
+    if not training_args.get("use_GPU"):
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+
+    import tensorflow
+
+    from TensorNAS.Evaluation.Executor import evaluate_genome
+
+    data = dataset.get_arrays()
+    worker_id = "{}:{}".format(socket.gethostname(), os.getpid())
+    evaluating = threading.Event()
+    stopped = threading.Event()
+
+    def _heartbeat():
+        # Proxies open a connection per thread, as such the heartbeat does not wait on the worker's calls
+        while not stopped.wait(heartbeat_interval):
+            try:
+                if evaluating.is_set() and not broker.heartbeat(worker_id):
+                    break
+            except (EOFError, OSError):
+                break
+
+    threading.Thread(target=_heartbeat, daemon=True).start()
+
+    if logger:
+        logger.log("Evaluation worker {} connected to {}".format(worker_id, address))
+
+    try:
+        while True:
+            task = broker.get_task(worker_id, heartbeat_interval)
+
+            if task is None:
+                if broker.heartbeat(worker_id):
+                    continue
+                break
+
+            task_id, (genome, layer_weights, test_name, model_name, evaluate_args) = (
+                task
+            )
+
+            evaluating.set()
+            result = evaluate_genome(
+                genome,
+                layer_weights,
+                data,
+                training_args,
+                evaluate_args,
+                test_name=test_name,
+                model_name=model_name,
+                failure_fitness=failure_fitness,
+                logger=logger,
+            )
+            evaluating.clear()
+
+            broker.put_result(worker_id, task_id, result)
+    except (EOFError, OSError):
+        # The broker was shut down
+        pass
+    finally:
+        stopped.set()
+
+    if logger:
+        logger.log("Evaluation worker {} stopped".format(worker_id))
+
+
+class BrokerEvaluator(Evaluator):
+    """
+    Evaluates block architectures through a TaskBroker, such that a single search can be scaled across a cluster.
+
+    The broker is started in its own process, listening on the given address, and any number of workers, local or on
+    other nodes, pull tasks from it. Tasks are the same as those of an EvaluationPool, ie. the genome of the block
+    architecture, its layer weights if weights are inherited and where its model should be saved, as such the broker
+    can be used wherever an EvaluationPool is.
+
+    Tasks of workers that stop sending heartbeats are requeued, a task that is lost more than max_retries times is
+    assigned the failure fitness, the same as that of an architecture that raised an exception.
+    """
+
+    def __init__(
+        self,
+        training_args,
+        address="127.0.0.1:50000",
+        authkey=None,
+        dataset=None,
+        local_workers=0,
+        heartbeat_interval=10,
+        heartbeat_timeout=60,
+        max_retries=3,
+        failure_fitness=FAILURE_FITNESS,
+        logger=None,
+    ):
+        """
+        @param training_args The arguments of BlockArchitecture.evaluate, see EvaluationPool, sent to every worker
+        @param address The address, as "host:port", that the broker listens on
+        @param authkey The key, as bytes, that the broker and its workers authenticate each other with. Required if
+        the address is not a loopback address, otherwise a random key is generated if not given
+        @param dataset The dataset of the local workers, required if local workers are started
+        @param local_workers The number of workers started on this node
+        @param failure_fitness The fitness assigned to tasks that raised an exception or were lost more than
+        max_retries times
+        """
+        import multiprocessing
+        import secrets
+
+        if not authkey:
+            if not is_loopback_address(address):
+                raise ValueError(
+                    "An authentication key is required for a broker listening on {}, a non-loopback address".format(
+                        address
+                    )
+                )
+            authkey = secrets.token_hex(32).encode()
+
+        self.address = address
+        self.inherit_weights = training_args.get("inherit_weights", False)
+        self.task_count = 0
+        self.running = {}
+        self.model_names = {}
+        self.failure_fitness = tuple(failure_fitness)
+        self.telemetry = training_args.get("telemetry")
+        self.logger = logger
+
+        ctx = multiprocessing.get_context("spawn")
+
+        self.manager = BrokerManager(address=parse_address(address), authkey=authkey)
+        self.manager.start(
+            _init_broker,
+            (training_args, heartbeat_timeout, max_retries, self.failure_fitness),
+        )
+        self.broker = self.manager.get_broker()
+        self.heartbeat_interval = heartbeat_interval
+
+        self.workers = [
+            ctx.Process(
+                target=run_worker,
+                args=(address, authkey, dataset, heartbeat_interval, logger),
+                daemon=True,
+            )
+            for _ in range(local_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        if logger:
+            logger.log(
+                "Started evaluation broker on {} with {} local workers".format(
+                    address, local_workers
+                )
+            )
+
+    def __len__(self):
+        return max(1, len(self.workers), self.broker.get_worker_count())
+
+    def submit(
+        self, block_architecture, test_name=None, model_name=None, **evaluate_args
+    ):
+        from TensorNAS.Core.Genome import encode
+
+        task_id = self.task_count
+        self.task_count += 1
+        self.running[task_id] = block_architecture
+        self.model_names[task_id] = model_name
+
+        self.broker.put_task(
+            task_id,
+            (
+                encode(block_architecture),
+                (
+                    block_architecture.get_layer_weights()
+                    if self.inherit_weights
+                    else None
+                ),
+                test_name,
+                model_name,
+                evaluate_args,
+            ),
+        )
+
+        return task_id
+
+    def get_result(self):
+        result = None
+        while result is None:
+            result = self.broker.get_result(self.heartbeat_interval)
+
+        task_id, result = result
+        block_architecture = self.running.pop(task_id)
+        model_name = self.model_names.pop(task_id)
+
+        if result is None:
+            if self.logger:
+                self.logger.log(
+                    "Task {} was lost by its workers too many times".format(task_id)
+                )
+            if self.telemetry:
+                self.telemetry.record(
+                    status="failed: worker lost", model=model_name, task=task_id
+                )
+            return task_id, self.failure_fitness
+
+        fitness, weights = result
+        if weights:
+            block_architecture.set_layer_weights(weights)
+
+        return task_id, fitness
+
+    def close(self):
+        self.broker.stop()
+
+        for worker in self.workers:
+            worker.join()
+
+        self.manager.shutdown()
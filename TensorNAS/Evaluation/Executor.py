@@ -0,0 +1,209 @@
+from abc import ABC, abstractmethod
+
+# The raw fitness, ie. (param_count, accuracy), of block architectures whose evaluation failed
+FAILURE_FITNESS = (float("inf"), 0)
+
+
+def evaluate_genome(
+    genome,
+    layer_weights,
+    data,
+    training_args,
+    evaluate_args,
+    test_name=None,
+    model_name=None,
+    failure_fitness=FAILURE_FITNESS,
+    logger=None,
+):
+    """
+    Decodes and evaluates a block architecture, the common body of the evaluation workers of all executors.
+
+    @param genome The genome of the block architecture, see TensorNAS.Core.Genome
+    @param layer_weights The inherited layer weights of the block architecture, None if weights are not inherited
+    @param data The dict of training and test arrays, see SharedDataset.get_arrays
+    @param training_args The arguments of BlockArchitecture.evaluate shared by all tasks
+    @param evaluate_args The arguments overriding the training arguments for this task only
+    @param failure_fitness The fitness returned if the evaluation raises an exception
+    @return A tuple of the raw fitness, ie. (param_count, accuracy), and the trained layer weights if weights are
+    inherited, the failure fitness and None if the evaluation raised an exception
+    """
+    from TensorNAS.Core.Genome import decode
+
+    args = dict(training_args, **evaluate_args)
+
+    try:
+        ba = decode(genome)
+        if layer_weights:
+            ba.set_layer_weights(layer_weights)
+        fitness = ba.evaluate(
+            **data,
+            **args,
+            test_name=test_name,
+            model_name=model_name,
+            logger=logger,
+        )
+    except Exception as e:
+        print("Error evaluating block architecture, {}".format(e))
+        if args.get("telemetry"):
+            args["telemetry"].record(
+                status="failed: {}: {}".format(type(e).__name__, e), model=model_name
+            )
+        return tuple(failure_fitness), None
+
+    return tuple(fitness), (
+        ba.get_layer_weights() if args.get("inherit_weights") else None
+    )
+
+
+def evaluate_genomes(
+    tasks,
+    data,
+    training_args,
+    failure_fitness=FAILURE_FITNESS,
+    logger=None,
+):
+    """
+    Evaluates several block architectures, packed into a single keras model, see
+    TensorNAS.Evaluation.Packed.evaluate_packed. Packing is not supported for quantization aware training, in which
+    case each block architecture is evaluated on its own.
+
+    @param tasks A list of tuples of the genome, layer weights, test name, model name and evaluate arguments of each
+    block architecture, the test name and evaluate arguments must be the same for all tasks
+    @return A list of the fitness and trained layer weights of each block architecture, see evaluate_genome
+    """
+    from TensorNAS.Core.Genome import decode
+    from TensorNAS.Evaluation.Packed import evaluate_packed
+
+    _, _, test_name, _, evaluate_args = tasks[0]
+    args = dict(training_args, **evaluate_args)
+
+    if len(tasks) == 1 or args.get("q_aware"):
+        return [
+            evaluate_genome(
+                genome,
+                layer_weights,
+                data,
+                training_args,
+                evaluate_args,
+                test_name=test_name,
+                model_name=model_name,
+                failure_fitness=failure_fitness,
+                logger=logger,
+            )
+            for genome, layer_weights, test_name, model_name, evaluate_args in tasks
+        ]
+
+    results = [(tuple(failure_fitness), None)] * len(tasks)
+    decoded = []
+
+    for i, (genome, layer_weights, _, model_name, _) in enumerate(tasks):
+        try:
+            ba = decode(genome)
+            if layer_weights:
+                ba.set_layer_weights(layer_weights)
+            decoded.append((i, ba, model_name))
+        except Exception as e:
+            print("Error evaluating block architecture, {}".format(e))
+            if args.get("telemetry"):
+                args["telemetry"].record(
+                    status="failed: {}: {}".format(type(e).__name__, e),
+                    model=model_name,
+                )
+
+    if not decoded:
+        return results
+
+    try:
+        fitnesses = evaluate_packed(
+            [ba for _, ba, _ in decoded],
+            **data,
+            **args,
+            test_name=test_name,
+            model_names=[model_name for _, _, model_name in decoded],
+            failure_fitness=failure_fitness,
+            logger=logger,
+        )
+    except Exception as e:
+        print("Error evaluating packed block architectures, {}".format(e))
+        if args.get("telemetry"):
+            args["telemetry"].record(
+                status="failed: {}: {}".format(type(e).__name__, e),
+                model=[model_name for _, _, model_name in decoded],
+            )
+        return results
+
+    for (i, ba, _), fitness in zip(decoded, fitnesses):
+        results[i] = (
+            tuple(fitness),
+            ba.get_layer_weights() if args.get("inherit_weights") else None,
+        )
+
+    return results
+
+
+class Evaluator(ABC):
+    """
+    The interface of the executors that evaluate block architectures outside of the toolbox's map, eg. the
+    EvaluationPool's local worker processes or the BrokerEvaluator's workers on any number of nodes.
+
+    An executor evaluates individuals asynchronously, submit queues a block architecture and get_result returns the
+    results in order of completion, or synchronously through map. The evolutionary algorithms only use this
+    interface, as such the executor can be swapped without changing them.
+    """
+
+    @abstractmethod
+    def __len__(self):
+        """
+        @return The number of evaluations that can run concurrently
+        """
+        pass
+
+    @abstractmethod
+    def submit(
+        self, block_architecture, test_name=None, model_name=None, **evaluate_args
+    ):
+        """
+        Queues the block architecture for evaluation. Keyword arguments override the executor's training arguments
+        for this task only, eg. the epochs and train_fraction of a low fidelity evaluation.
+
+        @return The ID of the task, which is returned alongside the fitness by get_result
+        """
+        pass
+
+    @abstractmethod
+    def get_result(self):
+        """
+        Blocks until an evaluation completes, results are returned in order of completion.
+
+        @return A tuple of the task ID and the raw fitness, ie. (param_count, accuracy)
+        """
+        pass
+
+    def map(self, individuals, test_name=None, gen=None, **evaluate_args):
+        """
+        Evaluates the individuals, returning their raw fitnesses in the same order as the individuals. Models are
+        saved under their generation and index if a test name is given.
+        """
+        task_ids = [
+            self.submit(
+                ind.block_architecture,
+                test_name=test_name,
+                model_name="{}/{}".format(gen, ind.index) if test_name else None,
+                **evaluate_args,
+            )
+            for ind in individuals
+        ]
+
+        fitnesses = {}
+        while len(fitnesses) < len(task_ids):
+            task_id, fitness = self.get_result()
+            fitnesses[task_id] = fitness
+
+        return [fitnesses[task_id] for task_id in task_ids]
+
+    @abstractmethod
+    def close(self):
+        """
+        Stops the executor's workers, the dataset is not closed as it is owned by the caller.
+        """
+        pass
@@ -0,0 +1,275 @@
+from TensorNAS.Evaluation.Executor import FAILURE_FITNESS
+
+
+def evaluate_packed(
+    block_architectures,
+    train_data,
+    train_labels,
+    test_data,
+    test_labels,
+    epochs,
+    batch_size,
+    optimizer,
+    loss,
+    metrics,
+    test_name=None,
+    model_names=None,
+    use_GPU=True,
+    logger=None,
+    train_fraction=1.0,
+    inherit_weights=False,
+    inherited_epoch_fraction=0.5,
+    use_tf_dataset=False,
+    jit_compile=False,
+    telemetry=None,
+    zero_cost_proxies=None,
+    failure_fitness=FAILURE_FITNESS,
+    **kwargs,
+):
+    """
+    Trains and tests several block architectures at once. Their keras layers are built as independent heads of a
+    single keras model, sharing only its input, which is trained in one fit on the sum of the heads' losses.
+
+    As the heads share no weights the gradient of each head's weights is that of its own loss, as such with a
+    per-parameter optimizer, eg. Adam, each head is trained as it would be on its own, except that all heads see the
+    same batches. The data pipeline and the per-step overhead are however shared by all heads, which for small
+    models, eg. those of MNIST sized searches, multiplies the number of models trained per second.
+
+    Each head is then tested on its own, through a keras model of only its layers, such that the reported accuracy
+    and param count are those of the head's model. Each head is stopped early on its own validation accuracy, see
+    HeadEarlyStopping, under the same policy as BlockArchitecture.evaluate, such that a block architecture's fitness
+    does not depend on whether it was packed.
+
+    Block architectures whose layers can not be built are assigned the failure fitness, if the packed model fails to
+    train then each block architecture is evaluated on its own instead.
+
+    The arguments are those of BlockArchitecture.evaluate, zero cost proxies are not computed when packing and a
+    warning is issued if they are given, q_aware is ignored, as quantization aware models are never packed.
+
+    @param model_names The model name of each block architecture, under which its model is saved if a test name is
+    given
+    @return A list of the raw fitness, ie. (param_count, accuracy), of each block architecture
+    """
+    import time
+
+    import numpy as np
+
+    from TensorNAS.Tools.Telemetry import (
+        get_peak_rss_since_reset,
+        get_rss,
+        reset_peak_rss,
+    )
+
+    rss_before = get_rss() if telemetry else None
+    # The peak is that of the whole pack, recorded for each of its models
+    peak_rss_reset = telemetry and reset_peak_rss()
+
+    if model_names is None:
+        model_names = [None] * len(block_architectures)
+
+    if zero_cost_proxies:
+        import warnings
+
+        warnings.warn(
+            "Zero cost proxies are not computed for packed models, they are ignored"
+        )
+
+    if use_GPU:
+        from TensorNAS.Tools.TensorFlow import GPU as GPU
+
+        GPU.config_GPU()
+    else:
+        import os
+
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+
+    import tensorflow as tf
+
+    if train_fraction < 1:
+        sample_count = max(1, int(len(train_data) * train_fraction))
+        train_data = train_data[:sample_count]
+        train_labels = train_labels[:sample_count]
+
+    fitnesses = [tuple(failure_fitness)] * len(block_architectures)
+
+    start_time = time.perf_counter()
+    inp = tf.keras.Input(shape=block_architectures[0].input_shape)
+    heads = []
+
+    for i, ba in enumerate(block_architectures):
+        try:
+            out = ba.get_keras_layers(inp)
+            heads.append((i, tf.keras.Model(inp, out)))
+        except Exception as e:
+            print("Error getting keras model: {}".format(e))
+            if telemetry:
+                telemetry.record(
+                    status="build error: {}".format(e), model=model_names[i]
+                )
+
+    if not heads:
+        return fitnesses
+
+    model = tf.keras.Model(inp, [head.output for _, head in heads])
+    build_time = time.perf_counter() - start_time
+
+    head_epochs = [epochs] * len(heads)
+
+    if inherit_weights:
+        head_epochs = [
+            max(
+                1,
+                round(
+                    epochs
+                    * (
+                        1
+                        - block_architectures[i]._inherit_weights(head)
+                        * (1 - inherited_epoch_fraction)
+                    )
+                ),
+            )
+            for i, head in heads
+        ]
+
+    # As in BlockArchitecture.evaluate models are validated, and stopped early, unless trained on arrays without a
+    # batch size
+    validate = use_tf_dataset or batch_size > 0
+
+    model.compile(
+        optimizer=optimizer,
+        loss=[loss] * len(heads),
+        metrics=[metrics] * len(heads) if validate else None,
+        jit_compile=jit_compile,
+    )
+
+    from TensorNAS.Tools.TensorFlow.HeadEarlyStopping import HeadEarlyStopping
+
+    stopper = HeadEarlyStopping(
+        [head for _, head in heads],
+        head_epochs,
+        monitor="val_{}_accuracy" if validate else None,
+    )
+
+    start_time = time.perf_counter()
+
+    try:
+        if use_tf_dataset:
+            from TensorNAS.Tools.TensorFlow.Dataset import get_dataset
+
+            head_count = len(heads)
+            ds_batch_size = batch_size if batch_size > 0 else 32
+            dataset = get_dataset(
+                train_data, train_labels, ds_batch_size, shuffle=True
+            ).map(lambda x, y: (x, (y,) * head_count))
+            test_dataset = get_dataset(test_data, test_labels, ds_batch_size).map(
+                lambda x, y: (x, (y,) * head_count)
+            )
+            model.fit(
+                dataset,
+                validation_data=test_dataset,
+                epochs=max(head_epochs),
+                verbose=1,
+                callbacks=[stopper],
+            )
+        else:
+            model.fit(
+                x=train_data,
+                y=[train_labels] * len(heads),
+                validation_data=(
+                    (test_data, [test_labels] * len(heads)) if validate else None
+                ),
+                epochs=max(head_epochs),
+                batch_size=batch_size if batch_size > 0 else None,
+                verbose=1,
+                callbacks=[stopper],
+            )
+    except Exception as e:
+        print("Error fitting packed model, {}, evaluating models separately".format(e))
+        return [
+            ba.evaluate(
+                train_data,
+                train_labels,
+                test_data,
+                test_labels,
+                epochs=epochs,
+                batch_size=batch_size,
+                optimizer=optimizer,
+                loss=loss,
+                metrics=metrics,
+                test_name=test_name,
+                model_name=model_name,
+                use_GPU=use_GPU,
+                logger=logger,
+                inherit_weights=inherit_weights,
+                inherited_epoch_fraction=inherited_epoch_fraction,
+                use_tf_dataset=use_tf_dataset,
+                jit_compile=jit_compile,
+                telemetry=telemetry,
+            )
+            for ba, model_name in zip(block_architectures, model_names)
+        ]
+
+    fit_time = time.perf_counter() - start_time
+
+    for j, (i, head) in enumerate(heads):
+        ba = block_architectures[i]
+
+        if inherit_weights:
+            ba._store_weights(head)
+
+        try:
+            if test_name and model_names[i]:
+                from TensorNAS.Core.Util import save_model, save_block_architecture
+
+                save_model(head, test_name, model_names[i], logger)
+                save_block_architecture(ba, test_name, model_names[i], logger)
+        except Exception as e:
+            if logger:
+                logger.log(
+                    "Error running/saving model:{}, {}".format(model_names[i], e)
+                )
+
+        params = head.count_params()
+        if params == 0:
+            params = np.inf
+
+        try:
+            head.compile(loss=loss, metrics=metrics, jit_compile=jit_compile)
+            if use_tf_dataset:
+                from TensorNAS.Tools.TensorFlow.Dataset import get_dataset
+
+                accuracy = (
+                    head.evaluate(
+                        get_dataset(
+                            test_data, test_labels, batch_size if batch_size > 0 else 32
+                        )
+                    )[1]
+                    * 100
+                )
+            else:
+                accuracy = head.evaluate(test_data, test_labels)[1] * 100
+        except Exception as e:
+            accuracy = 0
+            print("Error evaluating model: {}".format(e))
+
+        fitnesses[i] = (params, accuracy)
+
+        if telemetry:
+            telemetry.record(
+                status="ok",
+                model=model_names[i],
+                block_architecture=ba.__module__.split(".")[-1],
+                hash=ba.get_hash(),
+                epochs=stopper.stopped_epochs[j],
+                train_fraction=train_fraction,
+                pack_size=len(heads),
+                build_time=build_time,
+                fit_time=fit_time,
+                params=params,
+                accuracy=accuracy,
+                rss_before=rss_before,
+                rss_after=get_rss(),
+                peak_rss=get_peak_rss_since_reset() if peak_rss_reset else None,
+            )
+
+    return fitnesses
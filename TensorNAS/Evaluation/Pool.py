@@ -0,0 +1,409 @@
+from TensorNAS.Evaluation.Executor import FAILURE_FITNESS, Evaluator
+
+
+def _worker(
+    conn,
+    dataset,
+    training_args,
+    max_tasks=0,
+    failure_fitness=FAILURE_FITNESS,
+    logger=None,
+):
+    """
+    The loop run by each persistent worker process. TensorFlow is imported and the shared dataset attached to once
+    when the worker starts, each task then only carries the genome of the block architecture to be evaluated.
+
+    Tasks are received from, and results sent back to, the pool through the worker's own pipe, such that a worker
+    being killed can not leave a queue shared with other workers locked. Tasks are received in packs, which are
+    trained as a single keras model, see evaluate_genomes. The worker exits once it evaluated max_tasks tasks, if
+    set, such that the memory TensorFlow accumulates is released.
+    """
+    import os
+
+    if not training_args.get("use_GPU"):
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+
+    import tensorflow
+
+    from TensorNAS.Evaluation.Executor import evaluate_genomes
+
+    data = dataset.get_arrays()
+
+    if logger:
+        logger.log("Evaluation worker {} started".format(os.getpid()))
+
+    task_count = 0
+
+    while not max_tasks or task_count < max_tasks:
+        try:
+            tasks = conn.recv()
+        except EOFError:
+            break
+
+        if tasks is None:
+            break
+
+        results = evaluate_genomes(
+            [task[1:] for task in tasks],
+            data,
+            training_args,
+            failure_fitness=failure_fitness,
+            logger=logger,
+        )
+
+        conn.send(
+            [
+                (task[0], fitness, weights)
+                for task, (fitness, weights) in zip(tasks, results)
+            ]
+        )
+        task_count += len(tasks)
+
+    conn.close()
+
+
+class _WorkerProcess:
+    """
+    A worker process of an EvaluationPool, along with the tasks it is evaluating.
+    """
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.task_ids = []
+        self.start_time = None
+        self.task_count = 0
+
+
+class EvaluationPool(Evaluator):
+    """
+    A pool of long-lived worker processes that evaluate block architectures.
+
+    Unlike a multiprocessing.Pool used through the toolbox's map, each worker imports TensorFlow and attaches to the
+    dataset only once, when the pool is created. The dataset is a SharedDataset which the workers read through
+    read-only views, such that it is never pickled per task or per generation. Tasks only carry the genome, see
+    TensorNAS.Core.Genome, of the block architecture to be evaluated along with where its model should be saved.
+
+    The training arguments are those of BlockArchitecture.evaluate, ie. epochs, batch_size, optimizer, loss,
+    metrics, use_GPU and q_aware, optionally train_fraction, inherit_weights and inherited_epoch_fraction.
+
+    If weights are inherited then the layer weights of submitted block architectures are sent alongside their genome
+    and the trained weights are stored back in the submitted block architecture once its result is retrieved.
+
+    The pool supervises its workers, a worker that crashes, eg. segfaults or is killed by the OOM killer, exceeds the
+    wall-clock time limit of an evaluation or the memory limit is replaced by a new worker. Its task is resubmitted
+    up to max_retries times, after which it is assigned the failure fitness. Failures are recorded, with their cause,
+    to the telemetry of the training arguments, if given.
+
+    If the pack size is above 1 then each worker is sent up to that many tasks at once, which it trains together as
+    the heads of a single keras model, see TensorNAS.Evaluation.Packed. Only tasks with the same test name and
+    evaluate arguments are packed, resubmitted tasks are evaluated on their own.
+    """
+
+    # Seconds between checks of the workers' liveness, run time and memory use while waiting for results
+    POLL_INTERVAL = 1
+
+    def __init__(
+        self,
+        dataset,
+        training_args,
+        process_count=0,
+        timeout=0,
+        memory_limit=0,
+        max_tasks_per_worker=0,
+        max_retries=3,
+        failure_fitness=FAILURE_FITNESS,
+        pack_size=1,
+        logger=None,
+    ):
+        """
+        @param timeout The wall-clock time limit of an evaluation in seconds, 0 for no limit, the limit of a pack of
+        evaluations is that many times the limit
+        @param memory_limit The limit of a worker's resident set size while evaluating, in bytes, 0 for no limit.
+        Only supported on Linux
+        @param max_tasks_per_worker The number of tasks after which a worker is replaced by a new worker, 0 for no
+        limit
+        @param max_retries The number of times the task of a failed worker is resubmitted
+        @param failure_fitness The fitness assigned to tasks that raised an exception or whose workers failed more
+        than max_retries times
+        @param pack_size The maximum number of tasks evaluated at once by a worker
+        """
+        import multiprocessing
+        import os
+        from collections import deque
+
+        if process_count <= 0:
+            process_count = os.cpu_count()
+
+        self.ctx = multiprocessing.get_context("spawn")
+        self.dataset = dataset
+        self.training_args = training_args
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_retries = max_retries
+        self.failure_fitness = tuple(failure_fitness)
+        self.pack_size = max(1, pack_size)
+        self.telemetry = training_args.get("telemetry")
+        self.logger = logger
+        self.task_count = 0
+        self.running = {}
+        self.tasks = {}
+        self.failures = {}
+        self.pending = deque()
+        self.completed = deque()
+        self.inherit_weights = training_args.get("inherit_weights", False)
+        self.workers = [self._start_worker() for _ in range(process_count)]
+
+        if logger:
+            logger.log("Started {} evaluation workers".format(process_count))
+
+    def __len__(self):
+        return len(self.workers) * self.pack_size
+
+    def _start_worker(self):
+        conn, worker_conn = self.ctx.Pipe()
+        process = self.ctx.Process(
+            target=_worker,
+            args=(
+                worker_conn,
+                self.dataset,
+                self.training_args,
+                self.max_tasks_per_worker,
+                self.failure_fitness,
+                self.logger,
+            ),
+            daemon=True,
+        )
+        process.start()
+        worker_conn.close()
+
+        return _WorkerProcess(process, conn)
+
+    def submit(
+        self, block_architecture, test_name=None, model_name=None, **evaluate_args
+    ):
+        """
+        Queues the block architecture for evaluation. Keyword arguments override the pool's training arguments for
+        this task only, eg. the epochs and train_fraction of a low fidelity evaluation.
+
+        @return The ID of the task, which is returned alongside the fitness by get_result
+        """
+        from TensorNAS.Core.Genome import encode
+
+        task_id = self.task_count
+        self.task_count += 1
+        self.running[task_id] = block_architecture
+
+        self.tasks[task_id] = (
+            task_id,
+            encode(block_architecture),
+            block_architecture.get_layer_weights() if self.inherit_weights else None,
+            test_name,
+            model_name,
+            evaluate_args,
+        )
+        self.failures[task_id] = 0
+        # Tasks are dispatched once results are waited for, such that the tasks submitted together can be packed
+        self.pending.append(task_id)
+
+        return task_id
+
+    def get_result(self):
+        """
+        Blocks until an evaluation completes, results are returned in order of completion.
+
+        @return A tuple of the task ID and the raw fitness, ie. (param_count, accuracy)
+        """
+        while not self.completed:
+            self._dispatch()
+            self._receive(self.POLL_INTERVAL)
+            self._check_workers()
+
+        task_id, fitness, weights = self.completed.popleft()
+
+        block_architecture = self.running.pop(task_id)
+        if weights:
+            block_architecture.set_layer_weights(weights)
+
+        return task_id, fitness
+
+    def _dispatch(self):
+        import math
+        import time
+
+        idle = [
+            w
+            for w in self.workers
+            if not w.task_ids
+            and not (
+                self.max_tasks_per_worker and w.task_count >= self.max_tasks_per_worker
+            )
+        ]
+
+        for i, worker in enumerate(idle):
+            if not self.pending:
+                break
+
+            # Pending tasks are spread evenly over the idle workers
+            pack_size = min(
+                self.pack_size, math.ceil(len(self.pending) / (len(idle) - i))
+            )
+            if self.max_tasks_per_worker:
+                pack_size = min(
+                    pack_size, self.max_tasks_per_worker - worker.task_count
+                )
+
+            task_ids = self._get_pack(pack_size)
+
+            try:
+                worker.conn.send([self.tasks[task_id] for task_id in task_ids])
+            except OSError:
+                # The worker died, it is replaced by _check_workers
+                self.pending.extendleft(reversed(task_ids))
+                continue
+
+            worker.task_ids = task_ids
+            worker.start_time = time.time()
+
+    def _get_pack(self, pack_size):
+        """
+        Removes up to pack_size tasks that can be evaluated together from the pending tasks.
+
+        @return The IDs of the tasks
+        """
+        task_ids = [self.pending.popleft()]
+
+        # Resubmitted tasks are evaluated on their own, such that a task that crashes its worker fails no others
+        if pack_size == 1 or self.failures[task_ids[0]]:
+            return task_ids
+
+        first = self.tasks[task_ids[0]]
+
+        for task_id in list(self.pending):
+            if len(task_ids) == pack_size:
+                break
+
+            task = self.tasks[task_id]
+            if not self.failures[task_id] and (task[3], task[5]) == (
+                first[3],
+                first[5],
+            ):
+                task_ids.append(task_id)
+                self.pending.remove(task_id)
+
+        return task_ids
+
+    def _receive(self, timeout):
+        from multiprocessing.connection import wait
+
+        busy = {w.conn: w for w in self.workers if w.task_ids}
+
+        if not busy:
+            return
+
+        for conn in wait(list(busy), timeout):
+            self._receive_from(busy[conn])
+
+    def _receive_from(self, worker):
+        try:
+            results = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died, its tasks are resubmitted by _check_workers
+            return
+
+        worker.task_ids = []
+        worker.task_count += len(results)
+
+        for task_id, fitness, weights in results:
+            del self.tasks[task_id]
+            del self.failures[task_id]
+            self.completed.append((task_id, fitness, weights))
+
+    def _check_workers(self):
+        import time
+
+        from TensorNAS.Tools.Telemetry import get_rss
+
+        for i, worker in enumerate(self.workers):
+            cause = None
+
+            if not worker.process.is_alive():
+                # A result sent just before the worker exited, eg. once it reached its task limit, is still received
+                if worker.task_ids and worker.conn.poll():
+                    self._receive_from(worker)
+                if worker.task_ids:
+                    cause = "crashed, exit code {}".format(worker.process.exitcode)
+            elif worker.task_ids:
+                if (
+                    self.timeout
+                    and time.time() - worker.start_time
+                    > self.timeout * len(worker.task_ids)
+                ):
+                    cause = "timeout"
+                elif self.memory_limit:
+                    rss = get_rss(worker.process.pid)
+                    if rss and rss > self.memory_limit:
+                        cause = "memory limit, {} bytes".format(rss)
+
+            if worker.process.is_alive() and not cause:
+                continue
+
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.process.join()
+            worker.conn.close()
+
+            if cause:
+                # Resubmitted tasks are put back at the front of the pending tasks, in order
+                for task_id in reversed(worker.task_ids):
+                    self._fail(task_id, cause, worker.process.pid)
+
+            self.workers[i] = self._start_worker()
+
+    def _fail(self, task_id, cause, pid):
+        """
+        Resubmits the failed task or, once it failed more than max_retries times, completes it with the failure
+        fitness.
+        """
+        self.failures[task_id] += 1
+        retry = self.failures[task_id] <= self.max_retries
+        model_name = self.tasks[task_id][4]
+
+        if self.logger:
+            self.logger.log(
+                "Evaluation of task {} failed, {}, {}".format(
+                    task_id, cause, "resubmitting" if retry else "giving up"
+                )
+            )
+
+        if self.telemetry:
+            self.telemetry.record(
+                status="failed: {}".format(cause),
+                model=model_name,
+                task=task_id,
+                worker_pid=pid,
+                failures=self.failures[task_id],
+                resubmitted=retry,
+            )
+
+        if retry:
+            self.pending.appendleft(task_id)
+        else:
+            del self.tasks[task_id]
+            del self.failures[task_id]
+            self.completed.append((task_id, self.failure_fitness, None))
+
+    def close(self):
+        """
+        Stops the workers, the dataset is not closed as it is owned by the caller.
+        """
+        for worker in self.workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+
+        for worker in self.workers:
+            worker.process.join()
+            worker.conn.close()
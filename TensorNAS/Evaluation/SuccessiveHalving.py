@@ -0,0 +1,107 @@
+from TensorNAS.Evaluation.Executor import Evaluator
+
+
+def _pareto_ranks(fitnesses):
+    """
+    Returns the index of the non-dominated front, starting at 0, that each raw fitness, ie. (param_count, accuracy),
+    belongs to. The param count is minimized and the accuracy maximized.
+    """
+    from TensorNAS.Tools.Pareto import non_dominated_sort
+
+    return non_dominated_sort(
+        [tuple(fitness)[:2] for fitness in fitnesses], weights=(-1, 1)
+    ).tolist()
+
+
+class SuccessiveHalvingEvaluator(Evaluator):
+    """
+    Wraps an evaluator, eg. an EvaluationPool or a BrokerEvaluator, such that individuals are evaluated using successive halving.
+
+    All individuals are first trained on the lowest fidelity rung, ie. for a fraction of the epochs on a fraction of
+    the training data. The best 1/eta of them are then promoted and re-trained on the next rung, until the last rung,
+    which is the full training budget. Individuals are ranked by their non-dominated front and then their accuracy.
+
+    With eta = 3 and 3 rungs the rungs use 1/9, 1/3 and all of both the epochs and the training data.
+
+    Each individual's fitness is that of the highest rung it reached, the fraction of the full budget used for it is
+    stored as the individual's fidelity, 1.0 being a full evaluation. Only full fidelity fitnesses should be cached.
+    """
+
+    def __init__(self, evaluator, epochs, rungs=3, eta=3, logger=None):
+        self.evaluator = evaluator
+        self.epochs = epochs
+        self.rungs = rungs
+        self.eta = eta
+        self.logger = logger
+
+    def __len__(self):
+        return len(self.evaluator)
+
+    def submit(
+        self, block_architecture, test_name=None, model_name=None, **evaluate_args
+    ):
+        """
+        A single block architecture can not be halved, as such it is evaluated by the wrapped evaluator with the full
+        training budget.
+        """
+        return self.evaluator.submit(
+            block_architecture,
+            test_name=test_name,
+            model_name=model_name,
+            **evaluate_args,
+        )
+
+    def get_result(self):
+        return self.evaluator.get_result()
+
+    def get_rung_args(self, rung):
+        """
+        @return The evaluate arguments and fidelity of the rung, the last rung being rungs - 1
+        """
+        fidelity = 1 / (self.eta ** (self.rungs - 1 - rung))
+
+        return {
+            "epochs": max(1, round(self.epochs * fidelity)),
+            "train_fraction": fidelity,
+        }, fidelity
+
+    def map(self, individuals, test_name=None, gen=None):
+        fitnesses = [None] * len(individuals)
+        promoted = list(range(len(individuals)))
+
+        for rung in range(self.rungs):
+            evaluate_args, fidelity = self.get_rung_args(rung)
+
+            results = self.evaluator.map(
+                [individuals[i] for i in promoted], test_name, gen, **evaluate_args
+            )
+
+            for i, fit in zip(promoted, results):
+                fitnesses[i] = fit
+                individuals[i].fidelity = fidelity
+
+            if self.logger:
+                self.logger.log(
+                    "Successive halving rung {}, {} individuals evaluated with {} epochs on {:.3f} of the data".format(
+                        rung,
+                        len(promoted),
+                        evaluate_args["epochs"],
+                        evaluate_args["train_fraction"],
+                    )
+                )
+
+            if rung == self.rungs - 1:
+                break
+
+            ranks = _pareto_ranks([fitnesses[i] for i in promoted])
+            order = sorted(
+                range(len(promoted)),
+                key=lambda x: (ranks[x], -fitnesses[promoted[x]][-1]),
+            )
+            promote_count = max(1, len(promoted) // self.eta)
+            promoted = [promoted[x] for x in order[:promote_count]]
+
+        return fitnesses
+
+    def close(self):
+        self.evaluator.close()
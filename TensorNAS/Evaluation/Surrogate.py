@@ -0,0 +1,170 @@
+def get_features(block_architecture):
+    """
+    Returns a fixed length feature vector describing the block architecture, used as the input of the surrogate.
+
+    The vector holds the count of each of the supported layer types, the total layer count, the number of top level
+    blocks and the log scaled param count, MAC count and peak activation count, all of which are computed analytically
+    from the block tree.
+    """
+    import math
+
+    from TensorNAS.Layers import LayerNames
+
+    layer_blocks = block_architecture.get_layer_blocks()
+    names = [lb.layer.get_name() for lb in layer_blocks]
+
+    features = [names.count(name) for name in LayerNames]
+    features += [
+        len(layer_blocks),
+        len(block_architecture.middle_blocks),
+        math.log1p(max(0, block_architecture.get_param_count())),
+        math.log1p(max(0, block_architecture.get_macs())),
+        math.log1p(max(0, block_architecture.get_peak_activations())),
+    ]
+
+    return features
+
+
+class _RidgeRegressor:
+    """
+    Ridge regression on standardized features, the fallback used if scikit-learn is not installed.
+    """
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    def fit(self, x, y):
+        import numpy as np
+
+        self.mean = x.mean(axis=0)
+        self.std = x.std(axis=0)
+        self.std[self.std == 0] = 1
+        self.offset = y.mean()
+
+        xs = (x - self.mean) / self.std
+        self.coef = np.linalg.solve(
+            xs.T @ xs + self.alpha * np.eye(xs.shape[1]), xs.T @ (y - self.offset)
+        )
+        return self
+
+    def predict(self, x):
+        return ((x - self.mean) / self.std) @ self.coef + self.offset
+
+
+class SurrogateModel:
+    """
+    Learns to predict the accuracy of block architectures from every architecture trained during a test, such that
+    a large pool of candidate offspring can be ranked and only the most promising are trained.
+
+    A gradient boosted regressor is used if scikit-learn is installed, otherwise ridge regression. Candidates are
+    ranked by their non-dominated front, computed from their analytical param count and predicted accuracy, and then
+    by their predicted accuracy.
+    """
+
+    def __init__(self, pool_factor=4, min_samples=20, logger=None):
+        """
+        @param pool_factor The size of the candidate pool as a multiple of the number of individuals to be selected
+        @param min_samples The number of trained architectures required before the surrogate is used
+        """
+        self.pool_factor = pool_factor
+        self.min_samples = min_samples
+        self.logger = logger
+        self.features = []
+        self.accuracies = []
+        self.model = None
+        self.trained_on = 0
+
+    def __len__(self):
+        return len(self.accuracies)
+
+    def __getstate__(self):
+        # The logger is not stored in checkpoints, it is reassigned when a test is resumed
+        state = self.__dict__.copy()
+        state["logger"] = None
+        return state
+
+    def add(self, block_architecture, accuracy):
+        self.features.append(get_features(block_architecture))
+        self.accuracies.append(accuracy)
+
+    def add_individuals(self, individuals):
+        """
+        Adds the individuals' architectures and accuracies, skipping those that were not fully trained, ie. failed,
+        were rejected by the constraints or were only evaluated at a low fidelity.
+        """
+        for ind in individuals:
+            ba = ind.block_architecture
+            if ba.param_count == float("inf") or getattr(ind, "fidelity", 1.0) < 1.0:
+                continue
+            self.add(ba, ba.accuracy)
+
+    def is_ready(self):
+        return len(self) >= self.min_samples
+
+    def fit(self):
+        """
+        Fits the regressor to all samples, if enough are available and any were added since it was last fit.
+        """
+        if not self.is_ready() or self.trained_on == len(self):
+            return
+
+        import numpy as np
+
+        x = np.array(self.features, dtype=float)
+        y = np.array(self.accuracies, dtype=float)
+
+        try:
+            from sklearn.ensemble import GradientBoostingRegressor
+
+            self.model = GradientBoostingRegressor().fit(x, y)
+        except ImportError:
+            self.model = _RidgeRegressor().fit(x, y)
+
+        self.trained_on = len(self)
+
+        if self.logger:
+            self.logger.log(
+                "Surrogate {} fit on {} architectures".format(
+                    type(self.model).__name__, self.trained_on
+                )
+            )
+
+    def predict(self, block_architectures):
+        import numpy as np
+
+        self.fit()
+
+        return self.model.predict(
+            np.array([get_features(ba) for ba in block_architectures], dtype=float)
+        )
+
+    def screen(self, candidates, count):
+        """
+        @param candidates Individuals that have not been evaluated
+        @return The count candidates predicted to be best
+        """
+        if len(candidates) <= count:
+            return list(candidates)
+
+        from TensorNAS.Evaluation.SuccessiveHalving import _pareto_ranks
+
+        accuracies = self.predict([ind.block_architecture for ind in candidates])
+        fitnesses = [
+            (ind.block_architecture.get_param_count(), acc)
+            for ind, acc in zip(candidates, accuracies)
+        ]
+        ranks = _pareto_ranks(fitnesses)
+        order = sorted(
+            range(len(candidates)), key=lambda i: (ranks[i], -fitnesses[i][1])
+        )
+
+        if self.logger:
+            self.logger.log(
+                "Surrogate selected {} of {} candidates, predicted acc: {}".format(
+                    count,
+                    len(candidates),
+                    [round(float(fitnesses[i][1]), 2) for i in order[:count]],
+                )
+            )
+
+        return [candidates[i] for i in order[:count]]
@@ -1,14 +1,34 @@
 def MinMaxArray(fitnesses, vectors):
 
-    ret = []
+    return MinMaxArrayBatch([fitnesses], vectors)[0]
+
+
+def MinMaxArrayBatch(fitnesses, vectors):
+    """
+    The batched equivalent of MinMaxArray, the achievement scalarisation of a whole population's raw fitnesses, ie.
+    (param_count, accuracy), for each of the goal and normalization vectors is computed at once.
+
+    @return A list of each individual's tuple of MinMax values
+    """
+    import numpy as np
 
     goal_vectors, normalization_vectors = vectors
 
-    for nv, gv in zip(normalization_vectors, goal_vectors):
-        ret.append(MinMax(fitnesses, nv, gv))
+    f = np.asarray(fitnesses, dtype=float)[:, None, :2]
+    gv = np.asarray(goal_vectors, dtype=float)[None, :, :]
+    nv = np.asarray(normalization_vectors, dtype=float)[None, :, :]
 
-    ret = tuple(ret)
-    return ret
+    ret = np.maximum(
+        (f[..., 0] - gv[..., 0]) / nv[..., 0],
+        (gv[..., 1] - f[..., 1]) / nv[..., 1],
+    )
+
+    return [tuple(values) for values in ret.tolist()]
+
+
+# Filter functions can provide a batched equivalent, applied to all of a generation's raw fitnesses at once, see
+# TensorNAS.Algorithms.Common.filter_fitnesses
+MinMaxArray.batched = MinMaxArrayBatch
 
 
 def MinMax(fitnesses, normalization_vector, goal_vector):
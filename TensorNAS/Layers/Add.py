@@ -15,6 +15,11 @@ class Layer(NetworkLayer):
     def get_output_shape(self):
         return self.inputshape.get()
 
+    def get_flops(self):
+        from math import prod
+
+        return prod(self.get_output_shape())
+
     def get_keras_layer(self, input_tensor):
         import tensorflow as tf
 
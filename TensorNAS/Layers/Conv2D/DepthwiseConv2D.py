@@ -14,6 +14,36 @@ Given a 4D input tensor ('NHWC' or 'NCHW' data formats) and a filter
 
 
 class Layer(Layer):
+    def get_output_shape(self):
+        """
+        With a depth multiplier of one the output channel count is equal to the input channel count.
+        """
+        return Layer.conv2Doutputshape(
+            input_size=self.inputshape.get(),
+            stride=self.args[self.get_args_enum().STRIDES],
+            kernel_size=self.args[self.get_args_enum().KERNEL_SIZE],
+            filter_count=self.inputshape.get()[-1],
+            padding=self.args[self.get_args_enum().PADDING],
+        )
+
+    def get_param_count(self):
+        kernel_size = self.args[self.get_args_enum().KERNEL_SIZE]
+        input_channels = self.inputshape.get()[-1]
+
+        return kernel_size[0] * kernel_size[1] * input_channels + input_channels
+
+    def get_macs(self):
+        kernel_size = self.args[self.get_args_enum().KERNEL_SIZE]
+        output_shape = self.get_output_shape()
+
+        return (
+            output_shape[0]
+            * output_shape[1]
+            * output_shape[2]
+            * kernel_size[0]
+            * kernel_size[1]
+        )
+
     def get_keras_layer(self, input_tensor):
         import tensorflow as tf
 
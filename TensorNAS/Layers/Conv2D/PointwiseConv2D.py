@@ -6,14 +6,29 @@ from TensorNAS.Core.Util import MutationOperators
 class Layer(Layer):
     def _gen_args(self, input_shape, args=None):
         filter_count = input_shape[-1]
+        padding = la.gen_padding()
+        dilation_rate = la.gen_2d_dilation()
+        activation = la.gen_activation()
+
+        if args:
+            if self.get_args_enum().FILTERS in args:
+                filter_count = args.get(self.get_args_enum().FILTERS)
+            if self.get_args_enum().PADDING in args:
+                padding = la.ArgPadding(args.get(self.get_args_enum().PADDING))
+            if self.get_args_enum().DILATION_RATE in args:
+                dilation_rate = args.get(self.get_args_enum().DILATION_RATE)
+            if self.get_args_enum().ACTIVATION in args:
+                activation = la.ArgActivations(
+                    args.get(self.get_args_enum().ACTIVATION)
+                )
 
         return {
             self.get_args_enum().FILTERS: filter_count,
             self.get_args_enum().KERNEL_SIZE: (1, 1),
             self.get_args_enum().STRIDES: (1, 1),
-            self.get_args_enum().PADDING: la.gen_padding(),
-            self.get_args_enum().DILATION_RATE: la.gen_2d_dilation(),
-            self.get_args_enum().ACTIVATION: la.gen_activation(),
+            self.get_args_enum().PADDING: padding,
+            self.get_args_enum().DILATION_RATE: dilation_rate,
+            self.get_args_enum().ACTIVATION: activation,
         }
 
     def _mutate_kernel_size(self, operator=MutationOperators.SYNC_STEP):
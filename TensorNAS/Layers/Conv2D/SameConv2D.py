@@ -7,15 +7,30 @@ from TensorNAS.Core.Util import MutationOperators
 
 class Layer(Layer):
     def _gen_args(self, input_shape, args):
+        filter_count = random.randint(1, self.MAX_FILTER_COUNT)
+        kernel_size = la.gen_2d_kernel_size(self.MAX_KERNEL_DIMENSION)
+        dilation_rate = la.gen_2d_dilation()
+        activation = la.gen_activation()
+
+        if args:
+            if self.get_args_enum().FILTERS in args:
+                filter_count = args.get(self.get_args_enum().FILTERS)
+            if self.get_args_enum().KERNEL_SIZE in args:
+                kernel_size = args.get(self.get_args_enum().KERNEL_SIZE)
+            if self.get_args_enum().DILATION_RATE in args:
+                dilation_rate = args.get(self.get_args_enum().DILATION_RATE)
+            if self.get_args_enum().ACTIVATION in args:
+                activation = la.ArgActivations(
+                    args.get(self.get_args_enum().ACTIVATION)
+                )
+
         return {
-            self.get_args_enum().FILTERS: random.randint(1, self.MAX_FILTER_COUNT),
-            self.get_args_enum().KERNEL_SIZE: la.gen_2d_kernel_size(
-                self.MAX_KERNEL_DIMENSION
-            ),
+            self.get_args_enum().FILTERS: filter_count,
+            self.get_args_enum().KERNEL_SIZE: kernel_size,
             self.get_args_enum().STRIDES: (1, 1),
             self.get_args_enum().PADDING: la.ArgPadding.SAME,
-            self.get_args_enum().DILATION_RATE: la.gen_2d_dilation(),
-            self.get_args_enum().ACTIVATION: la.gen_activation(),
+            self.get_args_enum().DILATION_RATE: dilation_rate,
+            self.get_args_enum().ACTIVATION: activation,
         }
 
     def _mutate_strides(self, operator=MutationOperators.SYNC_STEP):
@@ -2,6 +2,36 @@ from TensorNAS.Layers.Conv2D import Layer
 
 
 class Layer(Layer):
+    def get_param_count(self):
+        """
+        A depthwise convolution, with a depth multiplier of one, followed by a biased pointwise convolution.
+        """
+        kernel_size = self.args[self.get_args_enum().KERNEL_SIZE]
+        filter_count = self.args[self.get_args_enum().FILTERS]
+        input_channels = self.inputshape.get()[-1]
+
+        return (
+            kernel_size[0] * kernel_size[1] * input_channels
+            + input_channels * filter_count
+            + filter_count
+        )
+
+    def get_macs(self):
+        """
+        The depthwise convolution produces the strided spatial output for each input channel, which the pointwise
+        convolution then maps to the filters.
+        """
+        kernel_size = self.args[self.get_args_enum().KERNEL_SIZE]
+        input_channels = self.inputshape.get()[-1]
+        output_shape = self.get_output_shape()
+        positions = output_shape[0] * output_shape[1]
+
+        return (
+            positions
+            * input_channels
+            * (kernel_size[0] * kernel_size[1] + output_shape[2])
+        )
+
     def get_keras_layer(self, input_tensor):
         import tensorflow as tf
 
@@ -135,6 +135,32 @@ class Layer(NetworkLayer):
         else:
             raise Exception("Invalid Conv2D padding for calculating output shape")
 
+    def get_param_count(self):
+        kernel_size = self.args[self.get_args_enum().KERNEL_SIZE]
+        filter_count = self.args[self.get_args_enum().FILTERS]
+        groups = self.args.get(self.get_args_enum().GROUPS) or 1
+        input_channels = self.inputshape.get()[-1]
+
+        return (
+            kernel_size[0] * kernel_size[1] * (input_channels // groups) * filter_count
+            + filter_count
+        )
+
+    def get_macs(self):
+        kernel_size = self.args[self.get_args_enum().KERNEL_SIZE]
+        groups = self.args.get(self.get_args_enum().GROUPS) or 1
+        input_channels = self.inputshape.get()[-1]
+        output_shape = self.get_output_shape()
+
+        return (
+            output_shape[0]
+            * output_shape[1]
+            * output_shape[2]
+            * kernel_size[0]
+            * kernel_size[1]
+            * (input_channels // groups)
+        )
+
     def get_output_shape(self):
         return Layer.conv2Doutputshape(
             input_size=self.inputshape.get(),
@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 from TensorNAS.Core.Layer import NetworkLayer
 
 
@@ -15,7 +13,24 @@ class Layer(NetworkLayer):
     def get_output_shape(self):
         return (1, self.args.get(self.get_args_enum().UNITS))
 
+    def get_param_count(self):
+        units = self.args.get(self.get_args_enum().UNITS)
+        return self.inputshape.get()[-1] * units + units
+
+    def get_macs(self):
+        """
+        A dense layer is applied along the last axis of its input, thus once per position of any leading axes.
+        """
+        from math import prod
+
+        input_shape = self.inputshape.get()
+        units = self.args.get(self.get_args_enum().UNITS)
+
+        return prod(input_shape[:-1]) * input_shape[-1] * units
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Dense(
             units=self.args.get(self.get_args_enum().UNITS),
             activation=self.args.get(self.get_args_enum().ACTIVATION).value,
@@ -4,7 +4,16 @@ from TensorNAS.Layers.MaxPool import Layer
 class Layer(Layer):
     def get_output_shape(self):
         inp = self.inputshape.get()
-        return inp[-1]
+        return (1, inp[-1])
+
+    def get_flops(self):
+        """
+        Every input element is summed and the sum of each channel divided once.
+        """
+        from math import prod
+
+        inp = self.inputshape.get()
+        return prod(inp) + inp[-1]
 
     def get_keras_layer(self, input_tensor):
         import tensorflow as tf
@@ -10,9 +10,10 @@ def valid_pad_output_shape(input, pool, stride):
 
 
 def same_pad_output_shape(input, pool, stride):
-    return valid_pad_output_shape(input, pool, stride) + (
-        1 if ((input - pool) % stride) else 0
-    )
+    """
+    With same padding the input is padded such that the pool size does not affect the output shape.
+    """
+    return ((input - 1) // stride) + 1
 
 
 class Args(Enum):
@@ -46,3 +47,15 @@ class Layer(NetworkLayer):
         self.args[self.get_args_enum().PADDING] = mutate_enum(
             self.args[self.get_args_enum().PADDING], la.ArgPadding
         )
+
+    def get_flops(self):
+        """
+        Each output element is the result of a comparison over each element of its pooling window.
+        """
+        from math import prod
+
+        pool_size = self.args[self.get_args_enum().POOL_SIZE]
+        if isinstance(pool_size, int):
+            pool_size = (pool_size,)
+
+        return prod(self.get_output_shape()) * prod(pool_size)
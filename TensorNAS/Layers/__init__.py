@@ -1,26 +1,36 @@
 #!/usr/bin/env python
 from enum import Enum
-
-from setuptools import find_packages
-
-from TensorNAS.Core.Util import find_modules
+from importlib import import_module
+
+# The registry of the layer modules, listed rather than found by scanning the package such that importing TensorNAS is
+# fast and does not touch the filesystem, see TensorNAS.Core.Util.scan_modules to check it against the modules
+# present. Layers are encoded in genomes by their index, see TensorNAS.Core.Genome, as such new layers must be appended
+LAYER_MODULES = (
+    "TensorNAS.Layers.Add",
+    "TensorNAS.Layers.Concatenate",
+    "TensorNAS.Layers.Dropout",
+    "TensorNAS.Layers.Flatten",
+    "TensorNAS.Layers.Reshape",
+    "TensorNAS.Layers.Shuffle",
+    "TensorNAS.Layers.MaxPool.GlobalAveragePool2D",
+    "TensorNAS.Layers.MaxPool.MaxPool1D",
+    "TensorNAS.Layers.MaxPool.MaxPool2D",
+    "TensorNAS.Layers.MaxPool.MaxPool3D",
+    "TensorNAS.Layers.MaxPool.SameMaxPool2D",
+    "TensorNAS.Layers.Conv2D.Conv2D",
+    "TensorNAS.Layers.Conv2D.DepthwiseConv2D",
+    "TensorNAS.Layers.Conv2D.GroupedConv2D",
+    "TensorNAS.Layers.Conv2D.GroupedPointwiseConv2D",
+    "TensorNAS.Layers.Conv2D.PointwiseConv2D",
+    "TensorNAS.Layers.Conv2D.SameConv2D",
+    "TensorNAS.Layers.Conv2D.SeparableConv2D",
+    "TensorNAS.Layers.Dense.HiddenDense",
+    "TensorNAS.Layers.Dense.OutputDense",
+)
 
 
 def find_layer_modules():
-    from TensorNAS import Layers as Layers
-    import itertools
-    import os
-
-    modules = []
-    layer_pkg = Layers.__name__
-    layer_dir = os.path.dirname(Layers.__file__)
-    modules.append(find_modules(layer_pkg, layer_dir))
-
-    for pkg in find_packages(layer_dir):
-        pkg_path = layer_dir + "/" + pkg.replace(".", "/")
-        modules.append(find_modules(layer_pkg + "." + pkg, pkg_path))
-
-    return list(itertools.chain(*modules))
+    return [import_module(name) for name in LAYER_MODULES]
 
 
 LayerModules = find_layer_modules()
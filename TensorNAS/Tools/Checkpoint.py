@@ -0,0 +1,82 @@
+"""
+Checkpoints of the complete state of an evolutionary test, ie. the evaluated population, hall of fame, logbook,
+individual record and random number generator states, such that an interrupted test can be resumed without any
+individual being retrained.
+"""
+
+
+def get_checkpoint_path(test_name, filename="checkpoint.pkl"):
+
+    return "Output/{}/Checkpoint/{}".format(test_name, filename)
+
+
+def save_checkpoint(test_name, **state):
+    """
+    Pickles the given state, along with the states of Python's and numpy's random number generators, to the test's
+    checkpoint file.
+
+    The checkpoint is written to a temporary file that is synced to disk before it is renamed over the previous
+    checkpoint, as such the checkpoint file is always complete, even if the process is killed while writing it.
+    """
+    import os
+    import pickle
+    import random
+
+    import numpy as np
+
+    path = get_checkpoint_path(test_name)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    state["random_state"] = random.getstate()
+    state["np_random_state"] = np.random.get_state()
+
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+    # Sync the directory such that the rename itself is persisted
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def load_checkpoint(test_name):
+    """
+    Loads the test's checkpoint, the DEAP creator classes of the individuals must have been created beforehand.
+
+    @return The checkpointed state, None if the test has no checkpoint
+    """
+    import os
+    import pickle
+
+    path = get_checkpoint_path(test_name)
+
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def restore_random_state(state):
+    """
+    Restores the random number generator states stored in a checkpoint, such that the resumed test continues with
+    the same random sequence as the interrupted test would have.
+    """
+    import random
+
+    import numpy as np
+
+    random.setstate(state["random_state"])
+    np.random.set_state(state["np_random_state"])
@@ -97,6 +97,63 @@ def GetLog(config):
     return _GetGeneral(config).getboolean("Log")
 
 
+def GetFitnessCache(config):
+
+    return _GetGeneral(config).getboolean("FitnessCache", fallback=False)
+
+
+def GetPersistentWorkers(config):
+
+    return _GetGeneral(config).getboolean("PersistentWorkers", fallback=False)
+
+
+def GetExecutor(config):
+
+    return _GetGeneral(config).get("Executor", fallback="Pool")
+
+
+def GetBrokerAddress(config):
+
+    return _GetGeneral(config).get("BrokerAddress", fallback="127.0.0.1:50000")
+
+
+def GetBrokerAuthKey(config):
+
+    authkey = _GetGeneral(config).get("BrokerAuthKey", fallback=None)
+
+    return authkey.encode() if authkey else None
+
+
+def GetBrokerLocalWorkers(config):
+
+    return int(_GetGeneral(config).get("BrokerLocalWorkers", fallback=1))
+
+
+def GetHeartbeatTimeout(config):
+
+    return float(_GetGeneral(config).get("HeartbeatTimeout", fallback=60))
+
+
+def GetTaskRetries(config):
+
+    return int(_GetGeneral(config).get("TaskRetries", fallback=3))
+
+
+def GetEvaluationTimeout(config):
+
+    return float(_GetGeneral(config).get("EvaluationTimeout", fallback=0))
+
+
+def GetEvaluationMemoryLimit(config):
+
+    return int(_GetGeneral(config).get("EvaluationMemoryLimit", fallback=0)) * 2 ** 20
+
+
+def GetWorkerMaxTasks(config):
+
+    return int(_GetGeneral(config).get("WorkerMaxTasks", fallback=0))
+
+
 def _GetEvolution(config):
 
     return config["evolution"]
@@ -122,6 +179,54 @@ def GetGenerationCount(config):
     return int(_GetEvolution(config)["GenerationCount"])
 
 
+def GetAlgorithm(config):
+
+    algorithm = _GetEvolution(config).get("Algorithm", fallback="EASimple")
+
+    # Without an evaluator steady state evaluates its individuals one at a time in the main process
+    if algorithm == "SteadyState" and not GetPersistentWorkers(config):
+        raise ValueError("The SteadyState algorithm requires PersistentWorkers")
+
+    return algorithm
+
+
+def GetEvaluationsInFlight(config):
+
+    return int(_GetEvolution(config).get("EvaluationsInFlight", fallback=0))
+
+
+def GetOffspringSize(config):
+
+    return int(_GetEvolution(config).get("OffspringSize", fallback=0))
+
+
+def GetReferencePointDivisions(config):
+
+    return int(_GetEvolution(config).get("ReferencePointDivisions", fallback=4))
+
+
+def GetCrossover(config):
+
+    return _GetEvolution(config).get("Crossover", fallback="SinglePoint")
+
+
+def GetSurrogate(config):
+    """
+    @return A SurrogateModel if surrogate screening of offspring is enabled, otherwise None
+    """
+    evolution = _GetEvolution(config)
+
+    if not evolution.getboolean("Surrogate", fallback=False):
+        return None
+
+    from TensorNAS.Evaluation.Surrogate import SurrogateModel
+
+    return SurrogateModel(
+        pool_factor=int(evolution.get("SurrogatePoolFactor", fallback=4)),
+        min_samples=int(evolution.get("SurrogateMinSamples", fallback=20)),
+    )
+
+
 def _GetOutput(config):
 
     return config["output"]
@@ -162,6 +267,28 @@ def GetOutputPrefix(config):
     return _GetOutput(config)["OutputPrefix"]
 
 
+def GetTelemetry(config):
+
+    return _GetOutput(config).getboolean("Telemetry", fallback=False)
+
+
+def GetCheckpoint(config):
+
+    return _GetOutput(config).getboolean("Checkpoint", fallback=False)
+
+
+def GetZeroCostProxies(config):
+
+    proxies = _GetOutput(config).get("ZeroCostProxies", fallback="")
+    proxies = [p.strip() for p in proxies.split(",") if p.strip()]
+
+    # The proxies' scores are only recorded to the telemetry
+    if proxies and not GetTelemetry(config):
+        raise ValueError("ZeroCostProxies requires Telemetry to be enabled")
+
+    return proxies
+
+
 def _GetGoals(config):
 
     return config["goals"]
@@ -235,6 +362,43 @@ def _GetFilterFunctionModule(config):
     return _GetFilters(config)["FilterFunctionModule"]
 
 
+def GetConstraints(config):
+    from TensorNAS.Core.Constraints import ArchitectureConstraints, ConstraintAction
+
+    filters = _GetFilters(config)
+
+    return ArchitectureConstraints(
+        max_params=int(filters.get("MaxParameters", fallback=0)),
+        max_macs=int(filters.get("MaxMACs", fallback=0)),
+        max_peak_memory=int(filters.get("MaxPeakMemory", fallback=0)),
+        peak_memory_dtype=filters.get("PeakMemoryDataType", fallback="float32"),
+        validate_model=filters.getboolean("ValidateModel", fallback=False),
+        action=ConstraintAction[filters.get("ConstraintAction", fallback="PENALTY")],
+        retries=int(filters.get("ConstraintRetries", fallback=5)),
+    )
+
+
+def GetExtraObjectives(config):
+    """
+    @return The names of the analytical objectives, eg. MACS, FLOPS or PEAK_MEMORY, that are appended to the filtered fitness
+    """
+    from TensorNAS.Core.BlockArchitecture import BlockArchitecture
+
+    objectives = _GetGoals(config).get("ExtraObjectives", fallback="")
+    objectives = [o.strip().upper() for o in objectives.split(",") if o.strip()]
+
+    # Unknown objectives would otherwise only fail once the first individuals are trained
+    for o in objectives:
+        if o not in BlockArchitecture.OBJECTIVES:
+            raise ValueError(
+                "Unknown extra objective {}, expected one of {}".format(
+                    o, ", ".join(BlockArchitecture.OBJECTIVES)
+                )
+            )
+
+    return objectives
+
+
 def GetWeights(config):
 
     config_arg = _GetFilters(config)["Weights"]
@@ -244,14 +408,21 @@ def GetWeights(config):
     else:
         w_len = _GetNormalizationVectorSteps(config)
 
+    # Extra objectives are costs of the architecture and are always minimized
+    extra = [-1] * len(GetExtraObjectives(config))
+
     if config_arg == "minimize":
-        return [-1] * w_len
+        return [-1] * w_len + extra
     elif config_arg == "maximize":
-        return [1] * w_len
+        return [1] * w_len + extra
     else:
         import ast
 
-        return [n.strip() for n in ast.literal_eval(config_arg)]
+        weights = ast.literal_eval(config_arg)
+        if not isinstance(weights, (list, tuple)):
+            weights = [weights]
+
+        return list(weights) + extra
 
 
 def _GenVectorsVaribleGoal(g_start, g_stop, g_step, n1, n2):
@@ -339,3 +510,43 @@ def GetTFEpochs(config):
 
 def GetQuantizationAware(config):
     return _GetTensorflow(config).getboolean("QuantizationAware")
+
+
+def GetSharedDataBackend(config):
+    from TensorNAS.Data.SharedDataset import SharedDataBackend
+
+    return SharedDataBackend[
+        _GetTensorflow(config).get("SharedDataBackend", fallback="SHARED_MEMORY")
+    ]
+
+
+def GetSuccessiveHalving(config):
+    return _GetTensorflow(config).getboolean("SuccessiveHalving", fallback=False)
+
+
+def GetSuccessiveHalvingRungs(config):
+    return int(_GetTensorflow(config).get("SuccessiveHalvingRungs", fallback=3))
+
+
+def GetSuccessiveHalvingEta(config):
+    return int(_GetTensorflow(config).get("SuccessiveHalvingEta", fallback=3))
+
+
+def GetWeightInheritance(config):
+    return _GetTensorflow(config).getboolean("WeightInheritance", fallback=False)
+
+
+def GetInheritedEpochFraction(config):
+    return float(_GetTensorflow(config).get("InheritedEpochFraction", fallback=0.5))
+
+
+def GetTFDataset(config):
+    return _GetTensorflow(config).getboolean("TFDataset", fallback=False)
+
+
+def GetJITCompile(config):
+    return _GetTensorflow(config).getboolean("JITCompile", fallback=False)
+
+
+def GetPackSize(config):
+    return int(_GetTensorflow(config).get("PackSize", fallback=1))
@@ -7,21 +7,32 @@ import numpy as np
 from TensorNAS.Core.Individual import TensorNASIndividual
 
 
-def setup_DEAP(creator, toolbox, objective_weights, multithreaded, thread_count=0):
+def setup_DEAP(
+    creator,
+    toolbox,
+    objective_weights,
+    multithreaded,
+    thread_count=0,
+    max_tasks_per_child=None,
+):
     creator.create("FitnessMulti", base.Fitness, weights=objective_weights)
     creator.create("Individual", TensorNASIndividual, fitness=creator.FitnessMulti)
 
     if multithreaded:
         if thread_count > 0:
-            pool = multiprocessing.Pool(processes=thread_count)
+            pool = multiprocessing.Pool(
+                processes=thread_count, maxtasksperchild=max_tasks_per_child
+            )
             print("Running using {} threads".format(thread_count))
         elif thread_count == -1:
             import os
 
-            pool = multiprocessing.Pool(processes=os.cpu_count())
+            pool = multiprocessing.Pool(
+                processes=os.cpu_count(), maxtasksperchild=max_tasks_per_child
+            )
             print("Running using {} threads".format(os.cpu_count()))
         else:
-            pool = multiprocessing.Pool()
+            pool = multiprocessing.Pool(maxtasksperchild=max_tasks_per_child)
             print("Running using no thread count limit")
         toolbox.register("map", pool.starmap)
 
@@ -0,0 +1,82 @@
+class FitnessCache:
+    """
+    Stores the raw fitness, ie. (param_count, accuracy), of evaluated block architectures keyed by their structural
+    hash, such that duplicate individuals produced by crossover or small step mutations are never retrained.
+
+    Entries are kept in memory and, if a test name is given, appended to a JSON lines file in the test's output
+    folder so that resumed tests can reuse the evaluations of earlier runs.
+    """
+
+    def __init__(self, test_name=None, filename="fitness_cache.jsonl"):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+        if test_name:
+            self.path = "Output/{}/Cache/{}".format(test_name, filename)
+            self._load()
+        else:
+            self.path = None
+
+    def _load(self):
+        import json
+        import os
+
+        if not os.path.isfile(self.path):
+            return
+
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A partially written line from an interrupted test
+                    continue
+                self.entries[entry["hash"]] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        """
+        Returns the cache entry for the given architecture hash, the entry is a dict storing the raw 'fitness' and the
+        'model' name under which the trained model was saved, None if the model was not saved.
+        """
+        entry = self.entries.get(key)
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def add(self, key, fitness, model_name=None):
+        """
+        Failed evaluations, signified by an infinite param count, are not cached as they might be caused by transient
+        errors.
+        """
+        import json
+        import math
+        from numbers import Integral
+
+        if any(math.isinf(f) or math.isnan(f) for f in fitness):
+            return
+
+        entry = {
+            "hash": key,
+            "fitness": [
+                int(f) if isinstance(f, Integral) else float(f) for f in fitness
+            ],
+            "model": model_name,
+        }
+        self.entries[key] = entry
+
+        if self.path:
+            from pathlib import Path
+            import os
+
+            Path(os.path.dirname(self.path)).mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
@@ -46,17 +46,19 @@ def ImportGeneration(gen_folder):
 
 
 def GetBlockMod(blk_name):
+    """
+    @param blk_name The name of a block's module, eg. ClassificationBlockArchitecture, or its full name
+    @return The imported module, looked up in the registry of TensorNAS.BlockTemplates
+    """
+    import importlib
 
-    import TensorNAS, os, glob
-
-    framework_path = os.path.dirname(os.path.dirname(TensorNAS.__file__))
-    mod_name = glob.glob(
-        "{}/**/{}.py".format(framework_path, blk_name),
-        recursive=True,
-    )[0][len(framework_path + "/") : -3].replace("/", ".")
+    from TensorNAS.BlockTemplates import get_block_module_name
 
-    import importlib
+    mod_name = get_block_module_name(blk_name)
 
-    mod = importlib.import_module(mod_name)
+    if mod_name is None:
+        if "." not in blk_name:
+            raise ValueError("Block '{}' is not registered".format(blk_name))
+        mod_name = blk_name
 
-    return mod
+    return importlib.import_module(mod_name)
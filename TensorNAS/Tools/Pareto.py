@@ -0,0 +1,154 @@
+"""
+Vectorised non-dominated sorting of a population's, or an archive's, fitness values.
+
+The values are given as an (individuals, objectives) array, eg. rows of (param_count, accuracy, ...), along with
+the objectives' weights as used by DEAP, negative weights being minimized and positive weights being maximized.
+"""
+
+import numpy as np
+
+
+def _to_minimization(values, weights):
+    values = np.asarray(values, dtype=float)
+
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+
+    if weights is None:
+        weights = (-1.0,) + (1.0,) * (values.shape[1] - 1)
+
+    signs = -np.sign(np.asarray(weights, dtype=float))
+
+    return values * signs
+
+
+def _unique_rows(values):
+    """
+    A faster equivalent of np.unique(values, axis=0, return_inverse=True), for float values.
+
+    @return The unique rows, sorted lexicographically, and the index of each value's row
+    """
+    order = np.lexsort(values.T[::-1])
+    sorted_values = values[order]
+
+    new = np.ones(len(values), dtype=bool)
+    new[1:] = (sorted_values[1:] != sorted_values[:-1]).any(axis=1)
+
+    inverse = np.empty(len(values), dtype=int)
+    inverse[order] = np.cumsum(new) - 1
+
+    return sorted_values[new], inverse
+
+
+def _dominated(candidates, values, chunk_size):
+    """
+    @return A boolean mask of which candidates are dominated by any of the values, all objectives being minimized
+    """
+    dominated = np.zeros(len(candidates), dtype=bool)
+
+    for start in range(0, len(candidates), chunk_size):
+        chunk = candidates[start : start + chunk_size]
+        le = (values[:, None, :] <= chunk[None, :, :]).all(axis=2)
+        lt = (values[:, None, :] < chunk[None, :, :]).any(axis=2)
+        dominated[start : start + chunk_size] = (le & lt).any(axis=0)
+
+    return dominated
+
+
+def _chunk_size(count, objectives, max_elements=2**24):
+    return max(1, max_elements // max(1, count * objectives))
+
+
+def _front(values, chunk_size=1024):
+    """
+    @param values Unique values, all objectives being minimized, sorted lexicographically
+    @return A boolean mask of the non-dominated values
+
+    As the values are sorted, a value can only be dominated by preceding values, and if it is then it is also dominated
+    by a preceding non-dominated value. As such the values are compared, in chunks, only against the front found so
+    far and the other values of their chunk.
+    """
+    front = np.zeros(len(values), dtype=bool)
+    front_values = values[:0]
+
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start : start + chunk_size]
+        mask = ~_dominated(
+            chunk, front_values, _chunk_size(len(front_values), chunk.shape[1])
+        )
+        mask[mask] = ~_dominated(chunk[mask], chunk[mask], chunk_size)
+        front[start : start + chunk_size] = mask
+        front_values = np.concatenate((front_values, chunk[mask]))
+
+    return front
+
+
+def pareto_front(values, weights=None):
+    """
+    @param values An (individuals, objectives) array of fitness values
+    @param weights The objectives' weights, by default the first objective, the param count, is minimized and the
+    others are maximized
+    @return The indices of the non-dominated individuals, identical individuals are all non-dominated
+    """
+    values = _to_minimization(values, weights)
+
+    if not len(values):
+        return np.zeros(0, dtype=int)
+
+    unique, inverse = _unique_rows(values)
+
+    if unique.shape[1] == 1:
+        front = unique[:, 0] == unique[0, 0]
+    elif unique.shape[1] == 2:
+        # The unique values are sorted by the first objective, then the second, as such a value is non-dominated if
+        # its second objective is strictly better than that of all preceding values. The first value is always
+        # non-dominated, even if its second objective is infinite, eg. that of a failed evaluation
+        front = np.ones(len(unique), dtype=bool)
+        front[1:] = unique[1:, 1] < np.minimum.accumulate(unique[:-1, 1])
+    else:
+        front = _front(unique)
+
+    return np.flatnonzero(front[inverse])
+
+
+def non_dominated_sort(values, weights=None):
+    """
+    @param values An (individuals, objectives) array of fitness values
+    @param weights The objectives' weights, see pareto_front
+    @return An array of the index of the non-dominated front, starting at 0, that each individual belongs to
+    """
+    values = _to_minimization(values, weights)
+
+    if not len(values):
+        return np.zeros(0, dtype=int)
+
+    unique, inverse = _unique_rows(values)
+    ranks = np.zeros(len(unique), dtype=int)
+
+    if unique.shape[1] == 1:
+        ranks = np.unique(unique[:, 0], return_inverse=True)[1].reshape(-1)
+    elif unique.shape[1] == 2:
+        # Sorted by the first objective, a value is dominated by a front if the front's best second objective so far
+        # is not worse than its own, as the fronts' best values only ever increase each value's front is found by
+        # bisection, see "A Fast Approach to Multiobjective Sorting" (Jensen)
+        from bisect import bisect_right
+
+        tails = []
+        for i, value in enumerate(unique[:, 1].tolist()):
+            rank = bisect_right(tails, value)
+            if rank == len(tails):
+                tails.append(value)
+            else:
+                tails[rank] = value
+            ranks[i] = rank
+    else:
+        # The fronts are peeled off one at a time, the remaining values stay sorted
+        remaining = np.arange(len(unique))
+        rank = 0
+        while len(remaining):
+            front = _front(unique[remaining])
+            ranks[remaining[front]] = rank
+            remaining = remaining[~front]
+            rank += 1
+
+    return ranks[inverse]
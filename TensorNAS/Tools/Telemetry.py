@@ -0,0 +1,131 @@
+# The lifetime peak resident set size of the process before reset_peak_rss last reset the kernel's peak
+_peak_rss_before_reset = 0
+
+
+def get_peak_rss():
+    """
+    @return The peak resident set size of the current process over its lifetime in bytes, None if it can not be
+    determined. For a persistent worker this is the peak of the largest model it evaluated so far, see
+    reset_peak_rss for the peak of a single evaluation
+    """
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes while macOS reports bytes
+    peak = peak if sys.platform == "darwin" else peak * 1024
+
+    return max(peak, _peak_rss_before_reset)
+
+
+def reset_peak_rss():
+    """
+    Resets the peak resident set size the kernel tracks for the current process to its current resident set size,
+    such that get_peak_rss_since_reset returns the peak of what ran since, eg. a single evaluation. get_peak_rss
+    continues to return the lifetime peak. Only supported on Linux.
+
+    @return True if the peak was reset
+    """
+    global _peak_rss_before_reset
+
+    peak = get_peak_rss()
+
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+
+    if peak:
+        _peak_rss_before_reset = peak
+
+    return True
+
+
+def get_peak_rss_since_reset():
+    """
+    @return The peak resident set size of the current process in bytes since reset_peak_rss was last called, None if
+    it can not be determined, only supported on Linux
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return None
+
+
+def get_rss(pid=None):
+    """
+    @param pid The ID of the process, by default the current process
+    @return The current resident set size of the process in bytes, None if it can not be determined, only supported
+    on Linux
+    """
+    import os
+
+    try:
+        with open("/proc/{}/statm".format(pid or os.getpid()), "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Telemetry:
+    """
+    Records structured per-individual evaluation telemetry, eg. build, compile, per epoch fit and evaluate times,
+    as JSON lines under Output/<test>/Telemetry.
+
+    Each process appends to its own file, telemetry_<pid>.jsonl, such that evaluation workers do not need to
+    coordinate their writes. Instances can thus be passed to worker processes, eg. as a training argument of an
+    EvaluationPool. Every record is stamped with the time, the process ID and the lifetime peak RSS of the process,
+    process_peak_rss, which is not that of the recorded evaluation, evaluations record their RSS before and after
+    along with their own peak RSS, peak_rss, instead.
+    """
+
+    def __init__(self, test_name):
+        self.test_name = test_name
+        self.directory = "Output/{}/Telemetry".format(test_name)
+
+    def record(self, **fields):
+        import json
+        import os
+        import time
+        from pathlib import Path
+
+        entry = {
+            "time": time.time(),
+            "pid": os.getpid(),
+            "process_peak_rss": get_peak_rss(),
+        }
+        entry.update(fields)
+
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        with open(
+            "{}/telemetry_{}.jsonl".format(self.directory, os.getpid()), "a"
+        ) as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+    def load(self):
+        """
+        @return All records written by all processes of the test
+        """
+        import glob
+        import json
+
+        records = []
+        for filename in glob.glob("{}/telemetry_*.jsonl".format(self.directory)):
+            with open(filename, "r") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+
+        return sorted(records, key=lambda r: r["time"])
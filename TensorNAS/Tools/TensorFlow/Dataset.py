@@ -0,0 +1,60 @@
+"""
+tf.data datasets built in this process, keyed by the memory address, shape, strides and type of the arrays they were
+built from along with the batch size, such that a worker evaluating many models builds each dataset only once. The
+arrays are kept alongside their dataset, such that their memory can not be freed and reused by other arrays, which
+would then be given the dataset of the freed arrays.
+"""
+
+_datasets = {}
+
+
+def _array_key(array):
+    return (
+        array.__array_interface__["data"][0],
+        array.shape,
+        array.strides,
+        array.dtype.str,
+    )
+
+
+def get_dataset(data, labels, batch_size, shuffle=False):
+    """
+    Returns a prefetched tf.data.Dataset of the data and labels, batched with the given batch size.
+
+    The dataset only holds the indices of the samples, each batch is gathered from the given arrays as it is read,
+    such that processes training on the read-only views of a SharedDataset do not each hold a private copy of the
+    data, neither as a constant of the dataset's graph nor in a shuffle buffer. The dataset is reused by every model
+    trained by the process on the same arrays.
+
+    @param shuffle Shuffle the samples each epoch, used for training data
+    """
+    import tensorflow as tf
+
+    key = (_array_key(data), _array_key(labels), batch_size, shuffle)
+
+    entry = _datasets.get(key)
+
+    if entry is None:
+        dataset = tf.data.Dataset.range(len(data))
+        if shuffle:
+            dataset = dataset.shuffle(len(data), reshuffle_each_iteration=True)
+
+        def _gather(indices):
+            batch_data, batch_labels = tf.numpy_function(
+                lambda i: (data[i], labels[i]),
+                [indices],
+                (tf.as_dtype(data.dtype), tf.as_dtype(labels.dtype)),
+            )
+            batch_data.set_shape((None,) + data.shape[1:])
+            batch_labels.set_shape((None,) + labels.shape[1:])
+            return batch_data, batch_labels
+
+        dataset = dataset.batch(batch_size).map(_gather).prefetch(tf.data.AUTOTUNE)
+        entry = (dataset, data, labels)
+        _datasets[key] = entry
+
+    return entry[0]
+
+
+def clear_datasets():
+    _datasets.clear()
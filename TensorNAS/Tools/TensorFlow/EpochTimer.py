@@ -0,0 +1,20 @@
+import time
+
+import tensorflow as tf
+
+
+class EpochTimer(tf.keras.callbacks.Callback):
+    """
+    Records the wall time of each training epoch, including validation, in seconds.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.times = []
+        self._start_time = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start_time = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.times.append(time.perf_counter() - self._start_time)
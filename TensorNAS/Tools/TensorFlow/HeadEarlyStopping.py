@@ -0,0 +1,61 @@
+import numpy as np
+import tensorflow as tf
+
+
+class HeadEarlyStopping(tf.keras.callbacks.Callback):
+    """
+    Stops training each head of a packed model, see TensorNAS.Evaluation.Packed, on its own, as the EarlyStopping of
+    BlockArchitecture.evaluate would if the head were trained alone, ie. once its validation accuracy did not improve
+    for patience epochs or it was trained for its own number of epochs.
+
+    As the heads share no weights a stopped head is trained on along with the others, its weights being stored when it
+    stops and restored once training ends. Training ends once every head has stopped.
+    """
+
+    def __init__(self, heads, epochs, monitor="val_{}_accuracy", patience=1):
+        """
+        @param heads The keras models of the heads, whose outputs are the packed model's outputs in the same order
+        @param epochs The maximum number of epochs of each head
+        @param monitor The format of the logged metric monitored for each head, formatted with the head's output
+        name, None to only stop each head after its number of epochs
+        """
+        super().__init__()
+        self.heads = heads
+        self.epochs = epochs
+        self.monitor = monitor
+        self.patience = patience
+        self.best = [-np.inf] * len(heads)
+        self.wait = [0] * len(heads)
+        self.weights = [None] * len(heads)
+        # The number of epochs each head was trained for
+        self.stopped_epochs = [None] * len(heads)
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+
+        for i, (head, name) in enumerate(zip(self.heads, self.model.output_names)):
+            if self.weights[i] is not None:
+                continue
+
+            stop = epoch + 1 >= self.epochs[i]
+
+            value = logs.get(self.monitor.format(name)) if self.monitor else None
+            if value is not None and not stop:
+                if value > self.best[i]:
+                    self.best[i] = value
+                    self.wait[i] = 0
+                else:
+                    self.wait[i] += 1
+                    stop = self.wait[i] >= self.patience
+
+            if stop:
+                self.weights[i] = head.get_weights()
+                self.stopped_epochs[i] = epoch + 1
+
+        if all(w is not None for w in self.weights):
+            self.model.stop_training = True
+
+    def on_train_end(self, logs=None):
+        for head, weights in zip(self.heads, self.weights):
+            if weights is not None:
+                head.set_weights(weights)
@@ -0,0 +1,127 @@
+"""
+Training-free proxies of a model's trainability, computed at initialization from a single mini-batch. See
+"Zero-Cost Proxies for Lightweight NAS" (Abdelfattah et al.) and "Neural Architecture Search without Training"
+(Mellor et al.).
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+import tensorflow as tf
+
+
+@contextmanager
+def _logits(model):
+    """
+    Replaces the softmax activations of the model's layers with linear activations while in the context, as the sum
+    of a softmax's outputs is constant and therefore has no gradient.
+    """
+    layers = [
+        layer
+        for layer in model.layers
+        if getattr(getattr(layer, "activation", None), "__name__", None) == "softmax"
+    ]
+    activations = [layer.activation for layer in layers]
+
+    try:
+        for layer in layers:
+            layer.activation = tf.keras.activations.linear
+        yield model
+    finally:
+        for layer, activation in zip(layers, activations):
+            layer.activation = activation
+
+
+def grad_norm(model, data, labels, loss):
+    """
+    The sum of the L2 norms of the gradients of the loss with respect to each of the model's weights.
+    """
+    loss_fn = tf.keras.losses.get(loss)
+
+    with tf.GradientTape() as tape:
+        value = loss_fn(labels, model(data, training=True))
+
+    grads = tape.gradient(value, model.trainable_weights)
+
+    return float(sum(tf.norm(g) for g in grads if g is not None))
+
+
+def synflow(model, data):
+    """
+    The sum of the synaptic saliency, |weight * gradient|, of the model's weights, where the gradients are those of
+    the sum of the model's logits for an input of ones, the weights having been replaced by their absolute values.
+    The proxy does not depend on the data, only its shape is used.
+    """
+    weights = model.trainable_weights
+    values = [w.numpy() for w in weights]
+
+    try:
+        for w, v in zip(weights, values):
+            w.assign(np.abs(v))
+
+        ones = tf.ones((1,) + tuple(data.shape[1:]), dtype=tf.float32)
+
+        with _logits(model), tf.GradientTape() as tape:
+            value = tf.reduce_sum(model(ones, training=False))
+
+        grads = tape.gradient(value, weights)
+
+        score = float(
+            sum(
+                tf.reduce_sum(tf.abs(w * g))
+                for w, g in zip(weights, grads)
+                if g is not None
+            )
+        )
+    finally:
+        for w, v in zip(weights, values):
+            w.assign(v)
+
+    return score
+
+
+def jacob_cov(model, data, k=1e-5):
+    """
+    Scores the correlation of the Jacobians of the model's logits with respect to each of the inputs of the batch,
+    models whose Jacobians are less correlated between inputs, ie. that better distinguish the inputs, score higher.
+    """
+    data = tf.convert_to_tensor(data, dtype=tf.float32)
+
+    with _logits(model), tf.GradientTape() as tape:
+        tape.watch(data)
+        value = tf.reduce_sum(model(data, training=False))
+
+    jacobs = tf.reshape(tape.gradient(value, data), (data.shape[0], -1)).numpy()
+
+    corrs = np.nan_to_num(np.corrcoef(jacobs))
+    eigenvalues = np.linalg.eigvalsh(corrs)
+
+    return float(-np.sum(np.log(eigenvalues + k) + 1.0 / (eigenvalues + k)))
+
+
+PROXIES = {
+    "grad_norm": lambda model, data, labels, loss: grad_norm(model, data, labels, loss),
+    "synflow": lambda model, data, labels, loss: synflow(model, data),
+    "jacob_cov": lambda model, data, labels, loss: jacob_cov(model, data),
+}
+
+
+def get_zero_cost_scores(model, data, labels, loss, proxies=None, logger=None):
+    """
+    @param model An untrained keras model
+    @param data A single mini-batch of the training data
+    @param proxies Names of the proxies in PROXIES to compute, all if not given
+    @param logger The logger to which proxies that could not be computed are logged
+    @return A dict of each proxy's score, None for proxies that could not be computed for the model
+    """
+    scores = {}
+
+    for name in proxies or PROXIES:
+        try:
+            scores[name] = PROXIES[name](model, data, labels, loss)
+        except Exception as e:
+            if logger:
+                logger.log("Error computing zero cost proxy {}: {}".format(name, e))
+            scores[name] = None
+
+    return scores
@@ -43,38 +43,25 @@ class IndividualRecord:
         fig.savefig("Output/{}/Figures/{}".format(test_name, title))
 
     def pareto(self, test_name):
-        individuals = [list(ind) for ind in self.gens[-1]]
-        best_models = [
-            [param_count, 0]
-            for param_count in list(set([ind[0] for ind in individuals]))
-        ]
-        best_models.sort(key=lambda x: x[0])
-
-        for ind in individuals:
-            bm_index = [pcount for (pcount, acc) in best_models].index(ind[0])
-            if ind[1] > best_models[bm_index][1]:
-                best_models[bm_index][1] = ind[1]
-
-        pareto_inds = [best_models[0]]
-
-        for ind in best_models[1:]:
+        import numpy as np
 
-            is_dominated = False
+        from TensorNAS.Tools.Pareto import pareto_front
 
-            for s_ind in pareto_inds:
-
-                if a_dominates_b(s_ind, ind, [0], [1]):
-
-                    is_dominated = True
-                    break
+        individuals = [list(ind) for ind in self.gens[-1]]
 
-                elif a_dominates_b(ind, s_ind, [0], [1]):
-                    pareto_inds.remove(s_ind)
+        # The best accuracy for each param count, sorted by param count
+        values = np.array(individuals, dtype=float).reshape(-1, 2)
+        param_counts, inverse = np.unique(values[:, 0], return_inverse=True)
+        accuracies = np.full(len(param_counts), -np.inf)
+        np.maximum.at(accuracies, inverse.reshape(-1), values[:, 1])
+        best_models = [
+            [p, a] for p, a in zip(param_counts.tolist(), accuracies.tolist())
+        ]
 
-            if is_dominated:
-                continue
-            else:
-                pareto_inds.append(ind)
+        pareto_inds = [
+            best_models[i]
+            for i in sorted(pareto_front(best_models, weights=(-1, 1)).tolist())
+        ]
 
         x = [ind[0] for ind in pareto_inds]
         y = [ind[1] for ind in pareto_inds]
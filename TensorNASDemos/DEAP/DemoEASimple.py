@@ -7,7 +7,16 @@ parser.add_argument(
     help="Absolute path to folder where interrupted test's output is stored",
     default=None,
 )
-parser.add_argument("--gen", help="Generation from which the test should resume", type=int)
+parser.add_argument(
+    "--gen",
+    help="Generation from which the test should resume, if not given a checkpointed test resumes from its checkpoint",
+    type=int,
+)
+parser.add_argument(
+    "--worker",
+    help="Address, host:port, of a search's evaluation broker, the process then only evaluates the broker's tasks",
+    default=None,
+)
 
 args = parser.parse_args()
 
@@ -18,14 +27,11 @@ def _gen_ba():
     return ba_mod.Block(input_tensor_shape, class_count)
 
 
-def _evaluate_individual(individual, test_name, gen, logger):
-    global epochs, batch_size, optimizer, loss, metrics, images_train, images_test, labels_train, labels_test, save_individuals, use_gpu, q_aware
+def _evaluate_individual(individual, test_name, gen, logger, dataset):
+    global epochs, batch_size, optimizer, loss, metrics, save_individuals, use_gpu, q_aware, inherit_weights, inherited_epoch_fraction, use_tf_dataset, jit_compile, telemetry, zero_cost_proxies
 
     param_count, accuracy = individual.evaluate(
-        train_data=images_train,
-        train_labels=labels_train,
-        test_data=images_test,
-        test_labels=labels_test,
+        **dataset.get_arrays(),
         epochs=epochs,
         batch_size=batch_size,
         optimizer=optimizer,
@@ -36,6 +42,12 @@ def _evaluate_individual(individual, test_name, gen, logger):
         use_GPU=use_gpu,
         q_aware=q_aware,
         logger=logger,
+        inherit_weights=inherit_weights,
+        inherited_epoch_fraction=inherited_epoch_fraction,
+        use_tf_dataset=use_tf_dataset,
+        jit_compile=jit_compile,
+        telemetry=telemetry,
+        zero_cost_proxies=zero_cost_proxies,
     )
 
     return param_count, accuracy
@@ -53,14 +65,31 @@ if __name__ == "__main__":
 
     if args.folder:
         test_folder = args.folder
-        start_gen = args.gen
-        existing_generation = test_folder + "/Models/{}".format(start_gen)
+        if args.gen is not None:
+            start_gen = args.gen
+            existing_generation = test_folder + "/Models/{}".format(start_gen)
 
         config = LoadConfig(GetConfigFile(directory=test_folder))
     else:
         config_filename = "example"
         config = LoadConfig(GetConfigFile(config_filename=config_filename))
 
+    if args.worker:
+        import sys
+
+        from TensorNAS.Evaluation.Broker import run_worker
+        from TensorNASDemos.Datasets.MNIST import GetSharedData
+
+        # Each node loads the dataset itself, the training arguments are sent by the broker
+        dataset = GetSharedData(
+            training_sample_size=GetTrainingSampleSize(config),
+            test_sample_size=GetTestSampleSize(config),
+            backend=GetSharedDataBackend(config),
+        )
+        run_worker(args.worker, GetBrokerAuthKey(config), dataset)
+        dataset.close()
+        sys.exit(0)
+
     ba_name = GetBlockArchitecture(config)
     globals()["class_count"] = GetClassCount(config)
     from TensorNAS.Tools.JSONImportExport import GetBlockMod
@@ -90,8 +119,21 @@ if __name__ == "__main__":
     globals()["loss"] = GetTFLoss(config)
     globals()["metrics"] = GetTFMetrics(config)
     globals()["q_aware"] = GetQuantizationAware(config)
+    globals()["inherit_weights"] = GetWeightInheritance(config)
+    globals()["inherited_epoch_fraction"] = GetInheritedEpochFraction(config)
+    globals()["use_tf_dataset"] = GetTFDataset(config)
+    globals()["jit_compile"] = GetJITCompile(config)
+
+    if GetTelemetry(config):
+        from TensorNAS.Tools.Telemetry import Telemetry
+
+        globals()["telemetry"] = Telemetry(test_name)
+    else:
+        globals()["telemetry"] = None
+    globals()["zero_cost_proxies"] = GetZeroCostProxies(config)
 
     pop_size = GetPopulationSize(config)
+    algorithm = GetAlgorithm(config)
     gen_count = GetGenerationCount(config)
     cxpb = GetCrossoverProbability(config)
     mutpb = GetMutationProbability(config)
@@ -100,32 +142,43 @@ if __name__ == "__main__":
 
     thread_count = GetThreadCount(config)
     log = GetLog(config)
+    fitness_cache = GetFitnessCache(config)
+    persistent_workers = GetPersistentWorkers(config)
 
     globals()["use_gpu"] = GetGPU(config)
     globals()["save_individuals"] = GetSaveIndividual(config)
     generation_gap = GetGenerationGap(config)
     generation_save_interval = GetGenerationSaveInterval(config)
 
-    from TensorNASDemos.Datasets.MNIST import GetData
+    from TensorNASDemos.Datasets.MNIST import GetSharedData
 
-    images_test, images_train, labels_test, labels_train, input_tensor_shape = GetData()
-    images_train = images_train[:training_sample_size]
-    labels_train = labels_train[:training_sample_size]
-    images_test = images_test[:test_sample_size]
-    labels_test = labels_test[:test_sample_size]
-    globals()["images_test"] = images_test
-    globals()["images_train"] = images_train
-    globals()["labels_test"] = labels_test
-    globals()["labels_train"] = labels_train
-    globals()["input_tensor_shape"] = input_tensor_shape
+    # The dataset is published once and only a handle to it is passed to the evaluating processes
+    dataset = GetSharedData(
+        training_sample_size=training_sample_size,
+        test_sample_size=test_sample_size,
+        backend=GetSharedDataBackend(config),
+    )
+    globals()["input_tensor_shape"] = dataset.input_shape
 
     filter_function = GetFilterFunction(config)
     filter_function_args = GetFilterFunctionArgs(config)
+    constraints = GetConstraints(config)
+    objectives = GetExtraObjectives(config)
+    surrogate = GetSurrogate(config)
     weights = GetWeights(config)
     comments = GetFigureTitle(config)
 
+    from functools import partial
     from TensorNAS.Algorithms.EASimple import TestEASimple
-    from TensorNAS.Core.Crossover import crossover_individuals_sp
+    from TensorNAS.Core.Crossover import (
+        crossover_individuals_sp,
+        crossover_individuals_genome,
+    )
+
+    if GetCrossover(config) == "Genome":
+        crossover_individual = crossover_individuals_genome
+    else:
+        crossover_individual = crossover_individuals_sp
 
     from importlib import import_module
 
@@ -138,35 +191,176 @@ if __name__ == "__main__":
         creator=creator,
         toolbox=toolbox,
         objective_weights=weights,
-        multithreaded=multithreaded,
+        multithreaded=multithreaded and not persistent_workers,
         thread_count=thread_count,
+        max_tasks_per_child=GetWorkerMaxTasks(config) or None,
     )
 
+    if persistent_workers:
+        training_args = {
+            "epochs": epochs,
+            "batch_size": batch_size,
+            "optimizer": optimizer,
+            "loss": loss,
+            "metrics": metrics,
+            "use_GPU": use_gpu,
+            "q_aware": q_aware,
+            "inherit_weights": inherit_weights,
+            "inherited_epoch_fraction": inherited_epoch_fraction,
+            "use_tf_dataset": use_tf_dataset,
+            "jit_compile": jit_compile,
+            "telemetry": telemetry,
+            "zero_cost_proxies": zero_cost_proxies,
+        }
+
+        if GetExecutor(config) == "Broker":
+            from TensorNAS.Evaluation.Broker import BrokerEvaluator
+
+            evaluator = BrokerEvaluator(
+                training_args,
+                address=GetBrokerAddress(config),
+                authkey=GetBrokerAuthKey(config),
+                dataset=dataset,
+                local_workers=GetBrokerLocalWorkers(config),
+                heartbeat_timeout=GetHeartbeatTimeout(config),
+                max_retries=GetTaskRetries(config),
+            )
+        else:
+            from TensorNAS.Evaluation.Pool import EvaluationPool
+
+            evaluator = EvaluationPool(
+                dataset=dataset,
+                training_args=training_args,
+                process_count=thread_count,
+                timeout=GetEvaluationTimeout(config),
+                memory_limit=GetEvaluationMemoryLimit(config),
+                max_tasks_per_worker=GetWorkerMaxTasks(config),
+                max_retries=GetTaskRetries(config),
+                pack_size=GetPackSize(config),
+            )
+
+        # Steady state evaluations are submitted individually, thus can not be halved
+        if GetSuccessiveHalving(config) and algorithm != "SteadyState":
+            from TensorNAS.Evaluation.SuccessiveHalving import (
+                SuccessiveHalvingEvaluator,
+            )
+
+            if log:
+                from TensorNAS.Tools.Logging import Logger
+
+                # The algorithms create their own logger, as such the rungs are logged to a separate log
+                halving_logger = Logger(test_name, subdir="SuccessiveHalving")
+            else:
+                halving_logger = None
+
+            evaluator = SuccessiveHalvingEvaluator(
+                evaluator,
+                epochs=epochs,
+                rungs=GetSuccessiveHalvingRungs(config),
+                eta=GetSuccessiveHalvingEta(config),
+                logger=halving_logger,
+            )
+    else:
+        evaluator = None
+
     register_DEAP_individual_gen_func(
         creator=creator, toolbox=toolbox, ind_gen_func=_gen_ba
     )
 
-    pop, logbook, test = TestEASimple(
-        cxpb=cxpb,
-        mutpb=mutpb,
-        pop_size=pop_size,
-        gen_count=gen_count,
-        evaluate_individual=_evaluate_individual,
-        crossover_individual=crossover_individuals_sp,
-        mutate_individual=_mutate_individual,
-        toolbox=toolbox,
-        test_name=test_name,
-        verbose=verbose,
-        filter_function=filter_function,
-        filter_function_args=filter_function_args,
-        save_individuals=save_individuals,
-        generation_gap=generation_gap,
-        generation_save=generation_save_interval,
-        comment=comments,
-        multithreaded=multithreaded,
-        log=log,
-        existing_generation=existing_generation,
-        start_gen=start_gen
-    )
+    if algorithm == "SteadyState":
+        from TensorNAS.Algorithms.SteadyState import TestSteadyState
+
+        pop, logbook, test = TestSteadyState(
+            cxpb=cxpb,
+            mutpb=mutpb,
+            pop_size=pop_size,
+            gen_count=gen_count,
+            evaluate_individual=partial(_evaluate_individual, dataset=dataset),
+            crossover_individual=crossover_individual,
+            mutate_individual=_mutate_individual,
+            toolbox=toolbox,
+            test_name=test_name,
+            verbose=verbose,
+            filter_function=filter_function,
+            filter_function_args=filter_function_args,
+            save_individuals=save_individuals,
+            generation_gap=generation_gap,
+            comment=comments,
+            log=log,
+            existing_generation=existing_generation,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+            in_flight=GetEvaluationsInFlight(config),
+            objectives=objectives,
+            surrogate=surrogate,
+        )
+    elif algorithm in ("NSGA2", "NSGA3"):
+        from TensorNAS.Algorithms.NSGA import TestNSGA
+
+        pop, logbook, test = TestNSGA(
+            cxpb=cxpb,
+            mutpb=mutpb,
+            pop_size=pop_size,
+            gen_count=gen_count,
+            evaluate_individual=partial(_evaluate_individual, dataset=dataset),
+            crossover_individual=crossover_individual,
+            mutate_individual=_mutate_individual,
+            toolbox=toolbox,
+            test_name=test_name,
+            verbose=verbose,
+            filter_function=filter_function,
+            filter_function_args=filter_function_args,
+            save_individuals=save_individuals,
+            generation_gap=generation_gap,
+            generation_save=generation_save_interval,
+            comment=comments,
+            multithreaded=multithreaded,
+            log=log,
+            existing_generation=existing_generation,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+            objectives=objectives,
+            surrogate=surrogate,
+            checkpoint=GetCheckpoint(config),
+            variant=algorithm,
+            offspring_size=GetOffspringSize(config),
+            ref_point_divisions=GetReferencePointDivisions(config),
+        )
+    else:
+        pop, logbook, test = TestEASimple(
+            cxpb=cxpb,
+            mutpb=mutpb,
+            pop_size=pop_size,
+            gen_count=gen_count,
+            evaluate_individual=partial(_evaluate_individual, dataset=dataset),
+            crossover_individual=crossover_individual,
+            mutate_individual=_mutate_individual,
+            toolbox=toolbox,
+            test_name=test_name,
+            verbose=verbose,
+            filter_function=filter_function,
+            filter_function_args=filter_function_args,
+            save_individuals=save_individuals,
+            generation_gap=generation_gap,
+            generation_save=generation_save_interval,
+            comment=comments,
+            multithreaded=multithreaded,
+            log=log,
+            existing_generation=existing_generation,
+            start_gen=start_gen,
+            fitness_cache=fitness_cache,
+            constraints=constraints,
+            evaluator=evaluator,
+            objectives=objectives,
+            surrogate=surrogate,
+            checkpoint=GetCheckpoint(config),
+        )
+
+    if evaluator:
+        evaluator.close()
+
+    dataset.close()
 
     print("Done")
@@ -19,3 +19,21 @@ def GetData():
     images_test /= 255
 
     return images_train, images_test, labels_train, labels_test, input_tensor_shape
+
+
+def GetSharedData(training_sample_size=None, test_sample_size=None, backend=None):
+    """
+    Returns the MNIST data published as a SharedDataset, such that it can be read by worker processes without each
+    receiving a copy.
+    """
+    from TensorNAS.Data.SharedDataset import SharedDataset, SharedDataBackend
+
+    images_train, images_test, labels_train, labels_test, _ = GetData()
+
+    return SharedDataset(
+        train_data=images_train[:training_sample_size],
+        train_labels=labels_train[:training_sample_size],
+        test_data=images_test[:test_sample_size],
+        test_labels=labels_test[:test_sample_size],
+        backend=backend or SharedDataBackend.SHARED_MEMORY,
+    )
@@ -0,0 +1,149 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from TensorNAS.Evaluation.Broker import BrokerEvaluator, TaskBroker
+
+
+def _free_address():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return "127.0.0.1:{}".format(s.getsockname()[1])
+
+
+def _lose_heartbeat(broker):
+    time.sleep(broker.heartbeat_timeout * 2)
+
+
+def test_task_requeued_when_worker_silent():
+    broker = TaskBroker({}, heartbeat_timeout=0.05)
+    broker.put_task(0, "task")
+
+    assert broker.get_task("w1", 0) == (0, "task")
+    assert broker.get_task("w2", 0) is None
+
+    _lose_heartbeat(broker)
+    assert broker.get_result(0) is None
+
+    assert broker.get_task("w2", 0) == (0, "task")
+
+
+def test_heartbeat_keeps_task_in_flight():
+    broker = TaskBroker({}, heartbeat_timeout=0.2)
+    broker.put_task(0, "task")
+    broker.get_task("w1", 0)
+
+    for _ in range(3):
+        time.sleep(0.1)
+        broker.heartbeat("w1")
+        assert broker.get_result(0) is None
+
+    assert broker.get_task("w2", 0) is None
+
+
+def test_retries_exhausted_gives_none_result():
+    broker = TaskBroker({}, heartbeat_timeout=0.05, max_retries=1)
+    broker.put_task(0, "task")
+
+    broker.get_task("w1", 0)
+    _lose_heartbeat(broker)
+    assert broker.get_result(0) is None
+
+    broker.get_task("w2", 0)
+    _lose_heartbeat(broker)
+    assert broker.get_result(0) == (0, None)
+
+    assert broker.get_task("w3", 0) is None
+
+
+def test_late_result_dropped():
+    broker = TaskBroker({}, heartbeat_timeout=0.05)
+    broker.put_task(0, "task")
+
+    broker.get_task("w1", 0)
+    _lose_heartbeat(broker)
+    broker.get_result(0)
+    broker.get_task("w2", 0)
+
+    broker.put_result("w1", 0, "late")
+    broker.put_result("w2", 0, "result")
+    broker.put_result("w2", 0, "duplicate")
+
+    assert broker.get_result(0) == (0, "result")
+    assert broker.get_result(0) is None
+
+
+def test_stop_releases_waiting_workers():
+    broker = TaskBroker({})
+    threading.Timer(0.05, broker.stop).start()
+
+    assert broker.get_task("w1", 5) is None
+    assert not broker.heartbeat("w1")
+
+
+def _block_architecture():
+    from TensorNAS.BlockTemplates.BlockArchitectures.ClassificationBlockArchitecture import (
+        Block,
+    )
+
+    np.random.seed(0)
+    return Block((28, 28, 1), 10)
+
+
+@pytest.fixture
+def evaluator_factory():
+    evaluators = []
+
+    def factory(**kwargs):
+        evaluator = BrokerEvaluator(
+            {}, address=_free_address(), heartbeat_interval=0.1, **kwargs
+        )
+        evaluators.append(evaluator)
+        return evaluator
+
+    yield factory
+
+    for evaluator in evaluators:
+        evaluator.close()
+
+
+def test_evaluator_round_trip(evaluator_factory):
+    evaluator = evaluator_factory()
+    ba = _block_architecture()
+
+    def _worker():
+        # Proxies open a connection per thread, as such the evaluator's proxy can be used by a fake worker
+        task = None
+        while task is None:
+            task = evaluator.broker.get_task("fake", 1)
+        task_id, (genome, layer_weights, test_name, model_name, evaluate_args) = task
+        assert model_name == "0/0"
+        assert evaluate_args == {"epochs": 1}
+        evaluator.broker.put_result("fake", task_id, ((42.0, 99.0), None))
+
+    worker = threading.Thread(target=_worker)
+    worker.start()
+
+    task_id = evaluator.submit(ba, model_name="0/0", epochs=1)
+    assert evaluator.get_result() == (task_id, (42.0, 99.0))
+
+    worker.join()
+
+
+def test_evaluator_lost_task_gets_failure_fitness(evaluator_factory):
+    evaluator = evaluator_factory(
+        heartbeat_timeout=0.1, max_retries=0, failure_fitness=(np.inf, -1)
+    )
+
+    task_id = evaluator.submit(_block_architecture())
+    assert evaluator.broker.get_task("fake", 1)[0] == task_id
+
+    assert evaluator.get_result() == (task_id, (np.inf, -1))
+
+
+def test_evaluator_requires_key_for_remote_address():
+    with pytest.raises(ValueError):
+        BrokerEvaluator({}, address="203.0.113.1:50000")
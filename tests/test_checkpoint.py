@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+
+from TensorNAS.Tools.Checkpoint import (
+    load_checkpoint,
+    restore_random_state,
+    save_checkpoint,
+)
+
+
+def test_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert load_checkpoint("test") is None
+
+    random.seed(0)
+    np.random.seed(0)
+    save_checkpoint("test", gen=3, population=[1, 2, 3])
+    expected = (random.random(), np.random.rand())
+
+    random.seed(1)
+    np.random.seed(1)
+    state = load_checkpoint("test")
+    restore_random_state(state)
+
+    assert state["gen"] == 3
+    assert state["population"] == [1, 2, 3]
+    assert (random.random(), np.random.rand()) == expected
+
+
+def test_overwrites_previous_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    save_checkpoint("test", gen=1)
+    save_checkpoint("test", gen=2)
+
+    assert load_checkpoint("test")["gen"] == 2
+    assert not (tmp_path / "Output/test/Checkpoint/checkpoint.pkl.tmp").exists()
@@ -0,0 +1,66 @@
+import configparser
+
+import pytest
+
+from TensorNAS.Tools.ConfigParse import GetAlgorithm, GetExtraObjectives, GetWeights
+
+
+def _config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+def test_steady_state_requires_persistent_workers():
+    config = _config(
+        "[general]\nPersistentWorkers = False\n[evolution]\nAlgorithm = SteadyState\n"
+    )
+
+    with pytest.raises(ValueError):
+        GetAlgorithm(config)
+
+
+def test_steady_state_with_persistent_workers():
+    config = _config(
+        "[general]\nPersistentWorkers = True\n[evolution]\nAlgorithm = SteadyState\n"
+    )
+
+    assert GetAlgorithm(config) == "SteadyState"
+
+
+def test_default_algorithm():
+    assert GetAlgorithm(_config("[general]\n[evolution]\n")) == "EASimple"
+
+
+def _goals_config(weights, objectives=""):
+    return _config(
+        "[goals]\nVariableGoal = False\nNormalizationVectorSteps = 2\n"
+        "ExtraObjectives = {}\n[filter]\nWeights = {}\n".format(objectives, weights)
+    )
+
+
+@pytest.mark.parametrize(
+    "weights, expected",
+    [
+        ("minimize", [-1, -1, -1, -1]),
+        ("maximize", [1, 1, -1, -1]),
+        ("-1, 1", [-1, 1, -1, -1]),
+        ("[1, -1]", [1, -1, -1, -1]),
+        ("1", [1, -1, -1]),
+    ],
+)
+def test_weights_append_extra_objectives(weights, expected):
+    assert GetWeights(_goals_config(weights, "macs, peak_memory")) == expected
+
+
+def test_extra_objectives():
+    assert GetExtraObjectives(_goals_config("minimize", " macs,flops ")) == [
+        "MACS",
+        "FLOPS",
+    ]
+    assert GetExtraObjectives(_goals_config("minimize")) == []
+
+
+def test_unknown_extra_objective():
+    with pytest.raises(ValueError):
+        GetExtraObjectives(_goals_config("minimize", "MACS, LATENCY"))
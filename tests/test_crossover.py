@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from TensorNAS.Core import Genome
+from TensorNAS.Core.Crossover import (
+    _is_valid_architecture,
+    crossover_individuals_genome,
+    crossover_individuals_sp,
+)
+
+ARCHITECTURES = (
+    "ClassificationBlockArchitecture",
+    "EffNetBlockArchitecture",
+    "MobileNetBlockArchitecture",
+    "ResNetBlockArchitecture",
+)
+
+
+class _Individual:
+    def __init__(self, block_architecture):
+        self.block_architecture = block_architecture
+        self.index = 0
+
+
+def _random_block_architecture():
+    import importlib
+
+    module = importlib.import_module(
+        "TensorNAS.BlockTemplates.BlockArchitectures." + random.choice(ARCHITECTURES)
+    )
+
+    return module.Block((28, 28, 1), 10)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_genome_crossover_offspring_are_valid(seed):
+    random.seed(seed)
+    ba1 = _random_block_architecture()
+    ba2 = _random_block_architecture()
+
+    genome3, genome4 = Genome.crossover(Genome.encode(ba1), Genome.encode(ba2))
+
+    assert _is_valid_architecture(Genome.decode(genome3), ba1.get_output_shape())
+    assert _is_valid_architecture(Genome.decode(genome4), ba2.get_output_shape())
+
+
+@pytest.mark.parametrize(
+    "crossover", [crossover_individuals_genome, crossover_individuals_sp]
+)
+@pytest.mark.parametrize("seed", range(20))
+def test_crossover_individuals_are_valid(crossover, seed):
+    random.seed(seed)
+    ind1 = _Individual(_random_block_architecture())
+    ind2 = _Individual(_random_block_architecture())
+    output_shape_1 = ind1.block_architecture.get_output_shape()
+    output_shape_2 = ind2.block_architecture.get_output_shape()
+
+    crossover(ind1, ind2)
+
+    assert _is_valid_architecture(ind1.block_architecture, output_shape_1)
+    assert _is_valid_architecture(ind2.block_architecture, output_shape_2)
+    assert ind1.index is None and ind2.index is None
+
+
+def test_crossover_individuals_genome_keeps_parents_without_valid_offspring():
+    random.seed(0)
+    ind1 = _Individual(_random_block_architecture())
+    ind2 = _Individual(_random_block_architecture())
+    ba1, ba2 = ind1.block_architecture, ind2.block_architecture
+
+    crossover_individuals_genome(ind1, ind2, max_retries=0)
+
+    assert ind1.block_architecture is ba1
+    assert ind2.block_architecture is ba2
+
+
+def test_genome_crossover_carries_layer_ids():
+    random.seed(1)
+    ba1 = _random_block_architecture()
+    ba2 = _random_block_architecture()
+    parent_ids = {lb.layer_id for lb in ba1.get_layer_blocks() + ba2.get_layer_blocks()}
+
+    for genome in Genome.crossover(Genome.encode(ba1), Genome.encode(ba2)):
+        ba = Genome.decode(genome)
+        assert {lb.layer_id for lb in ba.get_layer_blocks()} <= parent_ids
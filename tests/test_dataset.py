@@ -0,0 +1,48 @@
+import numpy as np
+
+from TensorNAS.Tools.TensorFlow.Dataset import clear_datasets, get_dataset
+
+
+def _epoch(dataset):
+    data, labels = zip(*((d.numpy(), l.numpy()) for d, l in dataset))
+    return np.concatenate(data), np.concatenate(labels)
+
+
+def test_dataset_order_and_shapes():
+    data = np.arange(50, dtype=np.float32).reshape(10, 5, 1)
+    labels = np.arange(10, dtype=np.int64)
+
+    dataset = get_dataset(data, labels, 4)
+    batch_data, batch_labels = _epoch(dataset)
+
+    assert dataset.element_spec[0].shape.as_list() == [None, 5, 1]
+    np.testing.assert_array_equal(batch_data, data)
+    np.testing.assert_array_equal(batch_labels, labels)
+
+    clear_datasets()
+
+
+def test_shuffled_dataset_visits_every_sample():
+    data = np.arange(100, dtype=np.float32).reshape(100, 1)
+    labels = np.arange(100, dtype=np.int64)
+
+    dataset = get_dataset(data, labels, 16, shuffle=True)
+    epochs = [_epoch(dataset) for _ in range(2)]
+
+    for batch_data, batch_labels in epochs:
+        np.testing.assert_array_equal(batch_data[:, 0], batch_labels)
+        np.testing.assert_array_equal(np.sort(batch_labels), labels)
+
+    assert not np.array_equal(epochs[0][1], epochs[1][1])
+
+    clear_datasets()
+
+
+def test_dataset_reused_for_same_arrays():
+    data = np.zeros((8, 2), dtype=np.float32)
+    labels = np.zeros(8, dtype=np.int64)
+
+    assert get_dataset(data, labels, 4) is get_dataset(data, labels, 4)
+    assert get_dataset(data, labels, 4) is not get_dataset(data, labels, 2)
+
+    clear_datasets()
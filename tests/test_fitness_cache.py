@@ -0,0 +1,38 @@
+import math
+
+from TensorNAS.Tools.FitnessCache import FitnessCache
+
+
+def test_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    cache = FitnessCache("test")
+    cache.add("a", (1000, 95.5), "0/1")
+    cache.add("b", (2000, 90.0))
+
+    reloaded = FitnessCache("test")
+
+    assert len(reloaded) == 2
+    assert reloaded.get("a") == {"hash": "a", "fitness": [1000, 95.5], "model": "0/1"}
+    assert reloaded.get("b")["model"] is None
+    assert reloaded.get("c") is None
+    assert (reloaded.hits, reloaded.misses) == (2, 1)
+
+
+def test_failed_evaluations_are_not_cached():
+    cache = FitnessCache()
+    cache.add("a", (math.inf, 0))
+    cache.add("b", (1000, math.nan))
+
+    assert "a" not in cache
+    assert "b" not in cache
+
+
+def test_partially_written_lines_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    FitnessCache("test").add("a", (1000, 95.5))
+    with open("Output/test/Cache/fitness_cache.jsonl", "a") as f:
+        f.write('{"hash": "b", "fitn')
+
+    assert list(FitnessCache("test").entries) == ["a"]
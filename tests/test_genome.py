@@ -0,0 +1,147 @@
+import random
+
+import numpy as np
+import pytest
+
+from TensorNAS.BlockTemplates import BLOCK_ARCHITECTURE_MODULES
+from TensorNAS.Core import Genome
+
+
+def _block_architecture(name, seed):
+    import importlib
+
+    random.seed(seed)
+    module = importlib.import_module(
+        "TensorNAS.BlockTemplates.BlockArchitectures." + name
+    )
+
+    return module.Block((28, 28, 1), 10)
+
+
+@pytest.mark.parametrize("name", BLOCK_ARCHITECTURE_MODULES)
+@pytest.mark.parametrize("seed", range(3))
+def test_encode_decode_round_trip(name, seed):
+    ba = _block_architecture(name, seed)
+
+    genome = Genome.encode(ba)
+    decoded = Genome.decode(genome)
+
+    np.testing.assert_array_equal(Genome.encode(decoded), genome)
+    assert decoded.get_hash() == ba.get_hash()
+    assert tuple(decoded.get_output_shape()) == tuple(ba.get_output_shape())
+    assert [lb.layer_id for lb in decoded.get_layer_blocks()] == [
+        lb.layer_id for lb in ba.get_layer_blocks()
+    ]
+
+
+def test_decode_restores_layer_state():
+    ba = _block_architecture("ClassificationBlockArchitecture", 0)
+    layer_id = ba.get_layer_blocks()[0].layer_id
+
+    decoded = Genome.decode(Genome.encode(ba), {layer_id: ("weights", "fingerprint")})
+
+    assert decoded.get_layer_blocks()[0].weights == "weights"
+    assert decoded.get_layer_blocks()[0].weights_fingerprint == "fingerprint"
+
+
+def test_hash_ignores_layer_ids():
+    ba = _block_architecture("ClassificationBlockArchitecture", 0)
+    genome = Genome.encode(ba)
+
+    other = Genome.decode(genome)
+    for lb in other.get_layer_blocks():
+        lb.layer_id = "00" * 16
+
+    assert Genome.get_hash(Genome.encode(other)) == Genome.get_hash(genome)
+
+
+def test_block_class_ids_are_stable():
+    # Block class IDs are stored in genomes, registering a block must append it rather than renumber others
+    assert Genome._get_block_modules()[:21] == [
+        "TensorNAS.Core.LayerBlock",
+        "TensorNAS.BlockTemplates.BlockArchitectures.ClassificationBlockArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.EffNetBlockArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.GhostNetBlockArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.InceptionNetArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.MobileNetBlockArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.ResNetBlockArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.ShuffleNetBlockArchitecture",
+        "TensorNAS.BlockTemplates.BlockArchitectures.SqueezeNetBlockArchitecture",
+        "TensorNAS.BlockTemplates.SubBlocks.EffNetBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.ExpandBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.FeatureExtractionBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.FilterBankBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.FireBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.GhostBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.InceptionBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.MobilNetBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.ResidualBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.ShuffleNetBlock",
+        "TensorNAS.BlockTemplates.SubBlocks.SqueezeExpansionBLock",
+        "TensorNAS.BlockTemplates.SubBlocks.TwoDClassificationBlock",
+    ]
+
+
+def test_decode_rejects_other_versions():
+    genome = Genome.encode(_block_architecture("ClassificationBlockArchitecture", 0))
+    genome[0] = Genome.VERSION + 1
+
+    with pytest.raises(ValueError):
+        Genome.decode(genome)
+
+
+@pytest.mark.parametrize("value", [(3, 3), [1, 2, 3], ()])
+def test_encode_integer_sequences(value):
+    words = Genome._encode_value(value)
+
+    decoded, pos = Genome._decode_value(words, 0)
+
+    assert decoded == value
+    assert pos == len(words)
+
+
+@pytest.mark.parametrize("value", [(0.5, 1), [1, 2.0], (True, 1)])
+def test_encode_rejects_non_integer_sequences(value):
+    with pytest.raises(ValueError):
+        Genome._encode_value(value)
+
+
+@pytest.mark.parametrize("value", [0.25, -3, None, True])
+def test_encode_scalars(value):
+    decoded, _ = Genome._decode_value(Genome._encode_value(value), 0)
+
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+@pytest.mark.parametrize(
+    "name", ["ResNetBlockArchitecture", "MobileNetBlockArchitecture"]
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_crossover_swaps_differing_sub_trees(name, seed):
+    ba1 = _block_architecture(name, seed)
+    ba2 = _block_architecture(name, seed + 100)
+    genome1, genome2 = Genome.encode(ba1), Genome.encode(ba2)
+
+    for _ in range(5):
+        genome3, genome4 = Genome.crossover(genome1, genome2, (ba1, ba2))
+
+        if np.array_equal(genome3, genome1):
+            np.testing.assert_array_equal(genome4, genome2)
+            continue
+
+        assert not np.array_equal(Genome._split(genome3)[1], Genome._split(genome1)[1])
+        assert not np.array_equal(Genome._split(genome4)[1], Genome._split(genome2)[1])
+
+
+def test_crossover_with_itself():
+    ba = _block_architecture("ClassificationBlockArchitecture", 0)
+    genome = Genome.encode(ba)
+    structure = Genome._split(genome)[1]
+
+    for _ in range(5):
+        genome3, genome4 = Genome.crossover(genome, genome, (ba, ba))
+
+        assert np.array_equal(genome3, genome) or not np.array_equal(
+            Genome._split(genome3)[1], structure
+        )
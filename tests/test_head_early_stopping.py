@@ -0,0 +1,77 @@
+from TensorNAS.Tools.TensorFlow.HeadEarlyStopping import HeadEarlyStopping
+
+
+class _Head:
+    def __init__(self):
+        self.weights = 0
+
+    def get_weights(self):
+        return self.weights
+
+    def set_weights(self, weights):
+        self.weights = weights
+
+
+class _Model:
+    def __init__(self, output_names):
+        self.output_names = output_names
+        self.stop_training = False
+
+
+def _train(stopper, heads, accuracies):
+    """
+    Runs the epochs, each head's weights are the number of epochs it was trained for
+    """
+    for epoch, epoch_accuracies in enumerate(accuracies):
+        for head in heads:
+            head.weights += 1
+        stopper.on_epoch_end(
+            epoch,
+            {
+                "val_{}_accuracy".format(name): accuracy
+                for name, accuracy in zip(stopper.model.output_names, epoch_accuracies)
+            },
+        )
+        if stopper.model.stop_training:
+            break
+    stopper.on_train_end()
+
+    return epoch + 1
+
+
+def test_heads_stop_independently():
+    heads = [_Head(), _Head()]
+    stopper = HeadEarlyStopping(heads, [5, 5])
+    stopper.set_model(_Model(["a", "b"]))
+
+    epochs = _train(
+        stopper, heads, [(0.1, 0.1), (0.2, 0.1), (0.3, 0.2), (0.4, 0.3), (0.5, 0.4)]
+    )
+
+    assert epochs == 5
+    assert stopper.stopped_epochs == [5, 2]
+    assert [head.weights for head in heads] == [5, 2]
+
+
+def test_training_stops_once_all_heads_stopped():
+    heads = [_Head(), _Head()]
+    stopper = HeadEarlyStopping(heads, [10, 10])
+    stopper.set_model(_Model(["a", "b"]))
+
+    epochs = _train(stopper, heads, [(0.5, 0.5), (0.4, 0.6), (0.4, 0.6)] + [(1, 1)] * 7)
+
+    assert epochs == 3
+    assert stopper.stopped_epochs == [2, 3]
+    assert [head.weights for head in heads] == [2, 3]
+
+
+def test_heads_stop_after_own_epochs_without_monitor():
+    heads = [_Head(), _Head(), _Head()]
+    stopper = HeadEarlyStopping(heads, [1, 3, 2], monitor=None)
+    stopper.set_model(_Model(["a", "b", "c"]))
+
+    epochs = _train(stopper, heads, [(0.1, 0.1, 0.1)] * 3)
+
+    assert epochs == 3
+    assert stopper.stopped_epochs == [1, 3, 2]
+    assert [head.weights for head in heads] == [1, 3, 2]
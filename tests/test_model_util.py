@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from TensorNAS.Core.ModelUtil import shortcut_conv_args
+
+
+def test_shortcut_conv_args_zero_residual_dims():
+    kernel_size, strides = shortcut_conv_args((4, 4, 1), (0, 0, 8))
+
+    assert kernel_size == (1, 1)
+    assert strides == (4, 4)
+
+
+def test_shortcut_conv_args_matching_dims():
+    assert shortcut_conv_args((8, 8, 1), (4, 4, 8)) == ((1, 1), (2, 2))
+    assert shortcut_conv_args((7, 7, 1), (5, 5, 8)) == ((3, 3), (1, 1))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_small_resnet_analytic_estimates(seed):
+    from TensorNAS.BlockTemplates.BlockArchitectures.ResNetBlockArchitecture import (
+        Block,
+    )
+
+    np.random.seed(seed)
+    ba = Block((4, 4, 1), 10)
+
+    assert ba.get_macs() >= 0
+    assert ba.get_flops() >= 0
+    assert ba.get_peak_memory() >= 0
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from TensorNAS.Tools.Pareto import non_dominated_sort, pareto_front
+
+
+def _dominates(a, b, signs):
+    a, b = a * signs, b * signs
+    return bool(np.all(a <= b) and np.any(a < b))
+
+
+def _brute_force_ranks(values, weights):
+    signs = -np.sign(np.asarray(weights, dtype=float))
+    remaining = list(range(len(values)))
+    ranks = np.zeros(len(values), dtype=int)
+    rank = 0
+
+    while remaining:
+        front = [
+            i
+            for i in remaining
+            if not any(_dominates(values[j], values[i], signs) for j in remaining)
+        ]
+        for i in front:
+            ranks[i] = rank
+        remaining = [i for i in remaining if i not in front]
+        rank += 1
+
+    return ranks
+
+
+def _random_values(rng, count, objectives):
+    # Few distinct values, such that duplicates and ties are common, with infinite values as given by failed
+    # evaluations
+    values = rng.integers(0, 5, size=(count, objectives)).astype(float)
+    values[rng.random(values.shape) < 0.1] = np.inf
+    return values
+
+
+@pytest.mark.parametrize("objectives", [1, 2, 3])
+@pytest.mark.parametrize("seed", range(20))
+def test_pareto_front_matches_brute_force(objectives, seed):
+    rng = np.random.default_rng(seed)
+    values = _random_values(rng, 30, objectives)
+    weights = tuple(rng.choice([-1.0, 1.0], size=objectives))
+
+    expected = np.flatnonzero(_brute_force_ranks(values, weights) == 0)
+
+    np.testing.assert_array_equal(pareto_front(values, weights), expected)
+
+
+@pytest.mark.parametrize("objectives", [1, 2, 3])
+@pytest.mark.parametrize("seed", range(20))
+def test_non_dominated_sort_matches_brute_force(objectives, seed):
+    rng = np.random.default_rng(seed)
+    values = _random_values(rng, 30, objectives)
+    weights = tuple(rng.choice([-1.0, 1.0], size=objectives))
+
+    np.testing.assert_array_equal(
+        non_dominated_sort(values, weights), _brute_force_ranks(values, weights)
+    )
+
+
+def test_pareto_front_keeps_infinite_first_value():
+    inf = np.inf
+    values = [[2, 2], [inf, inf], [2, 2], [0, 0]]
+
+    np.testing.assert_array_equal(pareto_front(values, (1, -1)), [0, 1, 2, 3])
+
+
+def test_pareto_front_of_failed_population():
+    values = [(np.inf, 0)] * 4
+
+    np.testing.assert_array_equal(pareto_front(values), [0, 1, 2, 3])
+
+
+def test_empty_values():
+    assert len(pareto_front(np.zeros((0, 2)))) == 0
+    assert len(non_dominated_sort(np.zeros((0, 2)))) == 0
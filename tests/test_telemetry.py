@@ -0,0 +1,30 @@
+import sys
+
+import numpy as np
+import pytest
+
+from TensorNAS.Tools.Telemetry import (
+    get_peak_rss,
+    get_peak_rss_since_reset,
+    reset_peak_rss,
+)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test_peak_rss_reset():
+    size = 200 * 1024 * 1024
+    data = np.ones(size // 8)
+    del data
+
+    lifetime_peak = get_peak_rss()
+    assert reset_peak_rss()
+
+    assert get_peak_rss_since_reset() < lifetime_peak - size // 2
+    # The lifetime peak is kept across resets
+    assert get_peak_rss() >= lifetime_peak
+
+    data = np.ones(size // 8)
+    peak = get_peak_rss_since_reset()
+    del data
+
+    assert peak >= size